@@ -22,7 +22,8 @@ import sonic_yang
 from jsonpatch import JsonPatchConflict
 from jsonpointer import JsonPointerException
 from collections import OrderedDict
-from generic_config_updater.generic_updater import GenericUpdater, ConfigFormat, extract_scope
+from generic_config_updater.generic_updater import GenericUpdater, ConfigFormat, extract_scope, SORT_ALGORITHMS
+from generic_config_updater.patch_sorter import Algorithm
 from generic_config_updater.gu_common import HOST_NAMESPACE, GenericConfigUpdaterError
 from minigraph import parse_device_desc_xml, minigraph_encoder
 from natsort import natsorted
@@ -34,11 +35,14 @@ from sonic_py_common.interface import get_interface_table_name, get_port_table_n
 from sonic_yang_cfg_generator import SonicYangCfgDbGenerator
 from utilities_common import util_base
 from swsscommon import swsscommon
-from swsscommon.swsscommon import SonicV2Connector, ConfigDBConnector, ConfigDBPipeConnector, \
+from swsscommon.swsscommon import SonicV2Connector, ConfigDBConnector, \
                                 isInterfaceNameValid, IFACE_NAME_MAX_LEN
 from utilities_common.db import Db
 from utilities_common.intf_filter import parse_interface_in_filter
 from utilities_common import bgp_util
+from utilities_common import config_db_saver
+from utilities_common import config_db_writer
+from utilities_common import counter_snapshot
 import utilities_common.cli as clicommon
 from utilities_common.helper import get_port_pbh_binding, get_port_acl_binding, update_config
 from utilities_common.general import load_db_config, load_module_from_source
@@ -1327,7 +1331,9 @@ def apply_patch_wrapper(args):
 
 
 # Function to apply patch for a single ASIC.
-def apply_patch_for_scope(scope_changes, results, config_format, verbose, dry_run, ignore_non_yang_tables, ignore_path):
+def apply_patch_for_scope(scope_changes, results, config_format, verbose, dry_run, ignore_non_yang_tables, ignore_path,
+                          profile=False, batch_writes=False, sort_algorithm=Algorithm.DFS,
+                          incremental_validation=False):
     scope, changes = scope_changes
     # Replace localhost to DEFAULT_NAMESPACE which is db definition of Host
     if scope.lower() == HOST_NAMESPACE or scope == "":
@@ -1339,12 +1345,14 @@ def apply_patch_for_scope(scope_changes, results, config_format, verbose, dry_ru
 
     try:
         # Call apply_patch with the ASIC-specific changes and predefined parameters
-        GenericUpdater(scope=scope).apply_patch(jsonpatch.JsonPatch(changes),
-                                                config_format,
-                                                verbose,
-                                                dry_run,
-                                                ignore_non_yang_tables,
-                                                ignore_path)
+        generic_updater = GenericUpdater(scope=scope, profile=profile, batch_writes=batch_writes,
+                                         sort_algorithm=sort_algorithm, incremental_validation=incremental_validation)
+        generic_updater.apply_patch(jsonpatch.JsonPatch(changes),
+                                    config_format,
+                                    verbose,
+                                    dry_run,
+                                    ignore_non_yang_tables,
+                                    ignore_path)
         results[scope_for_log] = {"success": True, "message": "Success"}
         log.log_notice(f"'apply-patch' executed successfully for {scope_for_log} by {changes} in thread:{thread_id}")
     except Exception as e:
@@ -1408,7 +1416,36 @@ def load_sysinfo_if_missing(asic_config):
         return False
 
 
-def flush_configdb(namespace=DEFAULT_NAMESPACE):
+def get_cfg_hwsku(file, file_input=None):
+    """
+    Returns the HWSKU of the config file, from its parsed content file_input if given.
+    Exits if the config has no HWSKU.
+    """
+    if file_input is not None:
+        cfg_hwsku = file_input.get("DEVICE_METADATA", {}).get("localhost", {}).get("hwsku")
+    else:
+        try:
+            command = [SONIC_CFGGEN_PATH, "-j", file, '-v', "DEVICE_METADATA.localhost.hwsku"]
+            proc = subprocess.Popen(command, text=True, stdout=subprocess.PIPE)
+            output, err = proc.communicate()
+
+        except FileNotFoundError as e:
+            click.echo("{}".format(str(e)), err=True)
+            raise click.Abort()
+        except Exception as e:
+            click.echo("{}\n{}".format(type(e), str(e)), err=True)
+            raise click.Abort()
+
+        cfg_hwsku = output.strip()
+
+    if not cfg_hwsku:
+        click.secho("Could not get the HWSKU from config file,  Exiting!!!", fg='magenta')
+        sys.exit(1)
+
+    return str(cfg_hwsku)
+
+
+def connect_configdb(namespace=DEFAULT_NAMESPACE):
     if namespace is DEFAULT_NAMESPACE:
         config_db = ConfigDBConnector()
     else:
@@ -1416,10 +1453,27 @@ def flush_configdb(namespace=DEFAULT_NAMESPACE):
 
     config_db.connect()
     client = config_db.get_redis_client(config_db.CONFIG_DB)
+    return client, config_db
+
+
+def flush_configdb(namespace=DEFAULT_NAMESPACE):
+    client, config_db = connect_configdb(namespace)
     client.flushdb()
     return client, config_db
 
 
+def write_config_to_db(load, config_db, config, filename, diff=False, merge=False):
+    """
+    Writes config, parsed from filename, to the CONFIG_DB of the namespace of load in process rather
+    than with sonic-cfggen --write-to-db. With diff only the entries which changed are written, and
+    unless merge is set the ones which are not in config are removed, so CONFIG_DB needs no flush.
+    """
+    client = counter_snapshot.get_pipeline_client(config_db, config_db.CONFIG_DB, load.namespace)
+    written, removed = config_db_writer.load_config(client, config, diff=diff, merge=merge)
+    load.output.append("Loaded {} into CONFIG_DB{} (written: {}, removed: {})".format(
+        filename, '' if load.namespace is DEFAULT_NAMESPACE else ' of ' + load.namespace, written, removed))
+
+
 def delete_transceiver_tables():
     tables = ["TRANSCEIVER_INFO", "TRANSCEIVER_STATUS", "TRANSCEIVER_PM",
               "TRANSCEIVER_FIRMWARE_INFO", "TRANSCEIVER_DOM_SENSOR", "TRANSCEIVER_DOM_THRESHOLD"]
@@ -1432,19 +1486,88 @@ def delete_transceiver_tables():
         state_db.delete_all_by_pattern(state_db.STATE_DB, table + state_db_del_pattern)
 
 
+def get_db_migrator_command(namespace=DEFAULT_NAMESPACE):
+    db_migrator = '/usr/local/bin/db_migrator.py'
+    if not (os.path.isfile(db_migrator) and os.access(db_migrator, os.X_OK)):
+        return None
+    if namespace is DEFAULT_NAMESPACE:
+        return [db_migrator, '-o', 'migrate']
+    return [db_migrator, '-o', 'migrate', '-n', namespace]
+
+
 def migrate_db_to_lastest(namespace=DEFAULT_NAMESPACE):
     # Migrate DB contents to latest version
-    db_migrator = '/usr/local/bin/db_migrator.py'
-    if os.path.isfile(db_migrator) and os.access(db_migrator, os.X_OK):
-        if namespace is DEFAULT_NAMESPACE:
-            command = [db_migrator, '-o', 'migrate']
-        else:
-            command = [db_migrator, '-o', 'migrate', '-n', namespace]
+    command = get_db_migrator_command(namespace)
+    if command:
         clicommon.run_command(command, display_cmd=True)
 
 
-def multiasic_write_to_db(filename, load_sysinfo):
+class NamespaceTask(object):
+    """
+    The part of a command which handles the config of one namespace, e.g. the load of its config,
+    run in parallel with the tasks of the other namespaces. The output of the commands it runs is
+    kept, to be shown in the order of the namespaces rather than interleaved with the output of
+    the other tasks.
+    """
+
+    def __init__(self, namespace, **kwargs):
+        self.namespace = namespace
+        self.output = []
+        self.elapsed = None
+        self.__dict__.update(kwargs)
+
+    @property
+    def name(self):
+        return HOST_NAMESPACE if self.namespace is DEFAULT_NAMESPACE else self.namespace
+
+    def run_command(self, command):
+        """
+        Runs command as clicommon.run_command(command, display_cmd=True) would, keeping its output.
+        The output is kept as is, also in alias mode.
+        Raises SystemExit with the return code of command if it fails.
+        """
+        self.output.append(click.style("Running command: ", fg='cyan') +
+                           click.style(' '.join(command), fg='green'))
+        out, returncode = clicommon.run_command(command, return_cmd=True)
+        if out:
+            self.output.append(out.rstrip('\n'))
+        if returncode != 0:
+            sys.exit(returncode)
+
+
+def run_namespace_tasks(cmd_name, tasks, run_task):
+    """
+    Runs run_task(task) for each NamespaceTask of tasks in parallel, as the DBs of the namespaces
+    are independent of each other. The output of each task is shown in the order of tasks, and the
+    time it took is logged. Exits as clicommon.run_command does if any task fails, once all of them
+    are done.
+    """
+    def timed_task(task):
+        start = time.monotonic()
+        try:
+            run_task(task)
+        finally:
+            task.elapsed = time.monotonic() - start
+
+    failure = None
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max(len(tasks), 1)) as executor:
+        futures = [executor.submit(timed_task, task) for task in tasks]
+        for task, future in zip(tasks, futures):
+            concurrent.futures.wait([future])
+            for line in task.output:
+                click.echo(line)
+            if future.exception() is None:
+                log.log_notice("'{}' done for {} in {:.2f}s".format(cmd_name, task.name, task.elapsed))
+            else:
+                log.log_error("'{}' failed for {} after {:.2f}s".format(cmd_name, task.name, task.elapsed))
+                failure = failure or future.exception()
+    if failure is not None:
+        raise failure
+
+
+def multiasic_write_to_db(filename, load_sysinfo, diff=False):
     file_input = read_json_file(filename)
+    loads = []
     for ns in [DEFAULT_NAMESPACE, *multi_asic.get_namespace_list()]:
         asic_name = HOST_NAMESPACE if ns == DEFAULT_NAMESPACE else ns
         asic_config = file_input[asic_name]
@@ -1453,6 +1576,7 @@ def multiasic_write_to_db(filename, load_sysinfo):
         if not asic_load_sysinfo:
             asic_load_sysinfo = load_sysinfo_if_missing(asic_config)
 
+        cfg_hwsku = None
         if asic_load_sysinfo:
             cfg_hwsku = asic_config.get("DEVICE_METADATA", {}).\
                 get("localhost", {}).get("hwsku")
@@ -1460,27 +1584,32 @@ def multiasic_write_to_db(filename, load_sysinfo):
                 click.secho("Could not get the HWSKU from config file,  Exiting!", fg='magenta')
                 sys.exit(1)
 
-        client, _ = flush_configdb(ns)
+        loads.append(NamespaceTask(ns, asic_config=asic_config, cfg_hwsku=cfg_hwsku))
 
-        if asic_load_sysinfo:
+    def write_namespace(load):
+        ns = load.namespace
+        # The system info written by sonic-cfggen is not in the file, a diff would remove it
+        diff_only = diff and not load.cfg_hwsku
+        if diff_only:
+            client, config_db = connect_configdb(ns)
+        else:
+            client, config_db = flush_configdb(ns)
+
+        if load.cfg_hwsku:
             if ns is DEFAULT_NAMESPACE:
-                command = [str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '--write-to-db']
+                command = [str(SONIC_CFGGEN_PATH), '-H', '-k', str(load.cfg_hwsku), '--write-to-db']
             else:
-                command = [str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '-n', str(ns), '--write-to-db']
-            clicommon.run_command(command, display_cmd=True)
+                command = [str(SONIC_CFGGEN_PATH), '-H', '-k', str(load.cfg_hwsku), '-n', str(ns), '--write-to-db']
+            load.run_command(command)
 
-        if ns is DEFAULT_NAMESPACE:
-            config_db = ConfigDBPipeConnector(use_unix_socket_path=True)
-        else:
-            config_db = ConfigDBPipeConnector(use_unix_socket_path=True, namespace=ns)
-
-        config_db.connect(False)
-        sonic_cfggen.FormatConverter.to_deserialized(asic_config)
-        data = sonic_cfggen.FormatConverter.output_to_db(asic_config)
-        config_db.mod_config(sonic_cfggen.FormatConverter.output_to_db(data))
+        write_config_to_db(load, config_db, load.asic_config, filename, diff_only)
         client.set(config_db.INIT_INDICATOR, 1)
 
-        migrate_db_to_lastest(ns)
+        command = get_db_migrator_command(ns)
+        if command:
+            load.run_command(command)
+
+    run_namespace_tasks('reload', loads, write_namespace)
 
 
 def config_file_yang_validation(filename):
@@ -1612,10 +1741,11 @@ def save(db, filename):
 
     # In case of multi-asic mode we have additional config_db{NS}.json files for
     # various namespaces created per ASIC. {NS} is the namespace index.
+    tasks = []
     for inst in range(-1, num_cfg_file-1):
         #inst = -1, refers to the linux host where there is no namespace.
         if inst == -1:
-            namespace = None
+            namespace = DEFAULT_NAMESPACE
         else:
             namespace = "{}{}".format(NAMESPACE_PREFIX, inst)
 
@@ -1623,27 +1753,29 @@ def save(db, filename):
         if cfg_files:
             file = cfg_files[inst+1]
         else:
-            if namespace is None:
+            if namespace is DEFAULT_NAMESPACE:
                 file = DEFAULT_CONFIG_DB_FILE
             else:
                 file = "/etc/sonic/config_db{}.json".format(inst)
 
-        if namespace is None:
-            command = "{} -d --print-data > {}".format(SONIC_CFGGEN_PATH, file)
-        else:
-            command = "{} -n {} -d --print-data > {}".format(SONIC_CFGGEN_PATH, namespace, file)
+        tasks.append(NamespaceTask(namespace, file=file))
 
-        log.log_info("'save' executing...")
-        clicommon.run_command(command, display_cmd=True, shell=True)
+    def save_namespace(task):
+        # Saved in process and renamed over the file once complete
+        _, config_db = connect_configdb(task.namespace)
+        client = counter_snapshot.get_pipeline_client(config_db, config_db.CONFIG_DB, task.namespace)
+        config_db_saver.save_config(client, task.file)
+        task.output.append("Saved CONFIG_DB{} to {}".format(
+            '' if task.namespace is DEFAULT_NAMESPACE else ' of ' + task.namespace, task.file))
 
-        config_db = sort_dict(read_json_file(file))
-        with open(file, 'w') as config_db_file:
-            json.dump(config_db, config_db_file, indent=4)
+    log.log_info("'save' executing...")
+    run_namespace_tasks('save', tasks, save_namespace)
 
 @config.command()
 @click.option('-y', '--yes', is_flag=True)
+@click.option('--diff', default=False, is_flag=True, help='Write only the entries which changed')
 @click.argument('filename', required=False)
-def load(filename, yes):
+def load(filename, yes, diff):
     """Import a previous saved config DB dump file.
        <filename> : Names of configuration file(s) to load, separated by comma with no spaces in between
     """
@@ -1672,10 +1804,11 @@ def load(filename, yes):
 
     # In case of multi-asic mode we have additional config_db{NS}.json files for
     # various namespaces created per ASIC. {NS} is the namespace index.
+    loads = []
     for inst in range(-1, num_cfg_file-1):
         #inst = -1, refers to the linux host where there is no namespace.
         if inst == -1:
-            namespace = None
+            namespace = DEFAULT_NAMESPACE
         else:
             namespace = "{}{}".format(NAMESPACE_PREFIX, inst)
 
@@ -1683,7 +1816,7 @@ def load(filename, yes):
         if cfg_files:
             file = cfg_files[inst+1]
         else:
-            if namespace is None:
+            if namespace is DEFAULT_NAMESPACE:
                 file = DEFAULT_CONFIG_DB_FILE
             else:
                 file = "/etc/sonic/config_db{}.json".format(inst)
@@ -1693,13 +1826,15 @@ def load(filename, yes):
             click.echo("The config_db file {} doesn't exist".format(file))
             return
 
-        if namespace is None:
-            command = [str(SONIC_CFGGEN_PATH), '-j', file, '--write-to-db']
-        else:
-            command = [str(SONIC_CFGGEN_PATH), '-n', str(namespace), '-j', file, '--write-to-db']
+        loads.append(NamespaceTask(namespace, file=file, file_input=read_json_file(file)))
 
-        log.log_info("'load' executing...")
-        clicommon.run_command(command, display_cmd=True)
+    def load_namespace(load):
+        # The config is merged with the one in CONFIG_DB, as sonic-cfggen --write-to-db does
+        _, config_db = connect_configdb(load.namespace)
+        write_config_to_db(load, config_db, load.file_input, load.file, diff, merge=True)
+
+    log.log_info("'load' executing...")
+    run_namespace_tasks('load', loads, load_namespace)
 
 def print_dry_run_message(dry_run):
     if dry_run:
@@ -1716,8 +1851,20 @@ def print_dry_run_message(dry_run):
 @click.option('-n', '--ignore-non-yang-tables', is_flag=True, default=False, help='ignore validation for tables without YANG models', hidden=True)
 @click.option('-i', '--ignore-path', multiple=True, help='ignore validation for config specified by given path which is a JsonPointer', hidden=True)
 @click.option('-v', '--verbose', is_flag=True, default=False, help='print additional details of what the operation is doing')
-@click.pass_context
-def apply_patch(ctx, patch_file_path, format, dry_run, parallel, ignore_non_yang_tables, ignore_path, verbose):
+@click.option('--profile', is_flag=True, default=False,
+              help='print a machine-readable JSON timing breakdown of the operation')
+@click.option('--batch-writes', is_flag=True, default=False,
+              help='keep the running config in memory and write the keys of each change in a single redis pipeline')
+@click.option('--sort-algorithm', type=click.Choice([algorithm.name for algorithm in SORT_ALGORITHMS]),
+              default=Algorithm.DFS.name, show_default=True,
+              help='algorithm ordering the changes, DFS_IN_PLACE searches on a single copy of the config, '
+                   'TOPOLOGICAL orders the changed keys by their dependencies')
+@click.option('--incremental-validation', is_flag=True, default=False,
+              help='validate the configs tried while ordering the changes by only updating the changed keys '
+                   'of a single YANG data tree')
+@click.pass_context
+def apply_patch(ctx, patch_file_path, format, dry_run, parallel, ignore_non_yang_tables, ignore_path, verbose, profile,
+                batch_writes, sort_algorithm, incremental_validation):
     """Apply given patch of updates to Config. A patch is a JsonPatch which follows rfc6902.
        This command can be used do partial updates to the config with minimum disruption to running processes.
        It allows addition as well as deletion of configs. The patch file represents a diff of ConfigDb(ABNF)
@@ -1737,6 +1884,7 @@ def apply_patch(ctx, patch_file_path, format, dry_run, parallel, ignore_non_yang
 
         results = {}
         config_format = ConfigFormat[format.upper()]
+        sort_algorithm = Algorithm[sort_algorithm]
         # Initialize a dictionary to hold changes categorized by scope
         changes_by_scope = {}
 
@@ -1767,7 +1915,8 @@ def apply_patch(ctx, patch_file_path, format, dry_run, parallel, ignore_non_yang
             with concurrent.futures.ThreadPoolExecutor() as executor:
                 # Prepare the argument tuples
                 arguments = [(scope_changes, results, config_format,
-                              verbose, dry_run, ignore_non_yang_tables, ignore_path)
+                              verbose, dry_run, ignore_non_yang_tables, ignore_path, profile, batch_writes,
+                              sort_algorithm, incremental_validation)
                              for scope_changes in changes_by_scope.items()]
 
                 # Submit all tasks and wait for them to complete
@@ -1782,7 +1931,11 @@ def apply_patch(ctx, patch_file_path, format, dry_run, parallel, ignore_non_yang
                                       config_format,
                                       verbose, dry_run,
                                       ignore_non_yang_tables,
-                                      ignore_path)
+                                      ignore_path,
+                                      profile,
+                                      batch_writes,
+                                      sort_algorithm,
+                                      incremental_validation)
 
         # Check if any updates failed
         failures = [scope for scope, result in results.items() if not result['success']]
@@ -1807,8 +1960,20 @@ def apply_patch(ctx, patch_file_path, format, dry_run, parallel, ignore_non_yang
 @click.option('-n', '--ignore-non-yang-tables', is_flag=True, default=False, help='ignore validation for tables without YANG models', hidden=True)
 @click.option('-i', '--ignore-path', multiple=True, help='ignore validation for config specified by given path which is a JsonPointer', hidden=True)
 @click.option('-v', '--verbose', is_flag=True, default=False, help='print additional details of what the operation is doing')
-@click.pass_context
-def replace(ctx, target_file_path, format, dry_run, ignore_non_yang_tables, ignore_path, verbose):
+@click.option('--profile', is_flag=True, default=False,
+              help='print a machine-readable JSON timing breakdown of the operation')
+@click.option('--batch-writes', is_flag=True, default=False,
+              help='keep the running config in memory and write the keys of each change in a single redis pipeline')
+@click.option('--sort-algorithm', type=click.Choice([algorithm.name for algorithm in SORT_ALGORITHMS]),
+              default=Algorithm.DFS.name, show_default=True,
+              help='algorithm ordering the changes, DFS_IN_PLACE searches on a single copy of the config, '
+                   'TOPOLOGICAL orders the changed keys by their dependencies')
+@click.option('--incremental-validation', is_flag=True, default=False,
+              help='validate the configs tried while ordering the changes by only updating the changed keys '
+                   'of a single YANG data tree')
+@click.pass_context
+def replace(ctx, target_file_path, format, dry_run, ignore_non_yang_tables, ignore_path, verbose, profile,
+            batch_writes, sort_algorithm, incremental_validation):
     """Replace the whole config with the specified config. The config is replaced with minimum disruption e.g.
        if ACL config is different between current and target config only ACL config is updated, and other config/services
        such as DHCP will not be affected.
@@ -1825,7 +1990,10 @@ def replace(ctx, target_file_path, format, dry_run, ignore_non_yang_tables, igno
 
         config_format = ConfigFormat[format.upper()]
 
-        GenericUpdater().replace(target_config, config_format, verbose, dry_run, ignore_non_yang_tables, ignore_path)
+        generic_updater = GenericUpdater(profile=profile, batch_writes=batch_writes,
+                                         sort_algorithm=Algorithm[sort_algorithm],
+                                         incremental_validation=incremental_validation)
+        generic_updater.replace(target_config, config_format, verbose, dry_run, ignore_non_yang_tables, ignore_path)
 
         click.secho("Config replaced successfully.", fg="cyan", underline=True)
     except Exception as ex:
@@ -1838,8 +2006,20 @@ def replace(ctx, target_file_path, format, dry_run, ignore_non_yang_tables, igno
 @click.option('-n', '--ignore-non-yang-tables', is_flag=True, default=False, help='ignore validation for tables without YANG models', hidden=True)
 @click.option('-i', '--ignore-path', multiple=True, help='ignore validation for config specified by given path which is a JsonPointer', hidden=True)
 @click.option('-v', '--verbose', is_flag=True, default=False, help='print additional details of what the operation is doing')
-@click.pass_context
-def rollback(ctx, checkpoint_name, dry_run, ignore_non_yang_tables, ignore_path, verbose):
+@click.option('--profile', is_flag=True, default=False,
+              help='print a machine-readable JSON timing breakdown of the operation')
+@click.option('--batch-writes', is_flag=True, default=False,
+              help='keep the running config in memory and write the keys of each change in a single redis pipeline')
+@click.option('--sort-algorithm', type=click.Choice([algorithm.name for algorithm in SORT_ALGORITHMS]),
+              default=Algorithm.DFS.name, show_default=True,
+              help='algorithm ordering the changes, DFS_IN_PLACE searches on a single copy of the config, '
+                   'TOPOLOGICAL orders the changed keys by their dependencies')
+@click.option('--incremental-validation', is_flag=True, default=False,
+              help='validate the configs tried while ordering the changes by only updating the changed keys '
+                   'of a single YANG data tree')
+@click.pass_context
+def rollback(ctx, checkpoint_name, dry_run, ignore_non_yang_tables, ignore_path, verbose, profile, batch_writes,
+             sort_algorithm, incremental_validation):
     """Rollback the whole config to the specified checkpoint. The config is rolled back with minimum disruption e.g.
        if ACL config is different between current and checkpoint config only ACL config is updated, and other config/services
        such as DHCP will not be affected.
@@ -1848,7 +2028,10 @@ def rollback(ctx, checkpoint_name, dry_run, ignore_non_yang_tables, ignore_path,
     try:
         print_dry_run_message(dry_run)
 
-        GenericUpdater().rollback(checkpoint_name, verbose, dry_run, ignore_non_yang_tables, ignore_path)
+        generic_updater = GenericUpdater(profile=profile, batch_writes=batch_writes,
+                                         sort_algorithm=Algorithm[sort_algorithm],
+                                         incremental_validation=incremental_validation)
+        generic_updater.rollback(checkpoint_name, verbose, dry_run, ignore_non_yang_tables, ignore_path)
 
         click.secho("Config rolled back successfully.", fg="cyan", underline=True)
     except Exception as ex:
@@ -1909,10 +2092,12 @@ def list_checkpoints(ctx, time, verbose):
 @click.option('-f', '--force', default=False, is_flag=True, help='Force config reload without system checks')
 @click.option('-t', '--file_format', default='config_db',type=click.Choice(['config_yang', 'config_db']),show_default=True,help='specify the file format')
 @click.option('-b', '--bypass-lock', default=False, is_flag=True, help='Do reload without acquiring lock')
+@click.option('--diff', default=False, is_flag=True,
+              help='Write only the entries which changed instead of flushing CONFIG_DB (config_db format only)')
 @click.argument('filename', required=False)
 @clicommon.pass_db
 @try_lock(SYSTEM_RELOAD_LOCK, timeout=0)
-def reload(db, filename, yes, load_sysinfo, no_service_restart, force, file_format, bypass_lock):
+def reload(db, filename, yes, load_sysinfo, no_service_restart, force, file_format, bypass_lock, diff):
     """Clear current configuration and import a previous saved config DB dump file.
        <filename> : Names of configuration file(s) to load, separated by comma with no spaces in between
     """
@@ -1972,12 +2157,13 @@ def reload(db, filename, yes, load_sysinfo, no_service_restart, force, file_form
         _stop_services()
 
     if multiasic_single_file_mode:
-        multiasic_write_to_db(cfg_files[0], load_sysinfo)
+        multiasic_write_to_db(cfg_files[0], load_sysinfo, diff)
     else:
         # In Single ASIC platforms we have single DB service. In multi-ASIC platforms we have a global DB
         # service running in the host + DB services running in each ASIC namespace created per ASIC.
         # In the below logic, we get all namespaces in this platform and add an empty namespace ''
         # denoting the current namespace which we are in ( the linux host )
+        loads = []
         for inst in range(-1, num_cfg_file-1):
             # Get the namespace name, for linux host it is DEFAULT_NAMESPACE
             if inst == -1:
@@ -1985,6 +2171,7 @@ def reload(db, filename, yes, load_sysinfo, no_service_restart, force, file_form
             else:
                 namespace = "{}{}".format(NAMESPACE_PREFIX, inst)
 
+            file_input = None
             # Get the file from user input, else take the default file /etc/sonic/config_db{NS_id}.json
             if cfg_files:
                 file = cfg_files[inst+1]
@@ -2009,72 +2196,83 @@ def reload(db, filename, yes, load_sysinfo, no_service_restart, force, file_form
                 continue
 
             if file_format == 'config_db':
-                file_input = read_json_file(file)
+                # Parse each file once, the HWSKU is taken from the parsed config
+                if file_input is None:
+                    file_input = read_json_file(file)
                 if not load_sysinfo:
                     load_sysinfo = load_sysinfo_if_missing(file_input)
 
+            cfg_hwsku = None
             if load_sysinfo:
-                try:
-                    command = [SONIC_CFGGEN_PATH, "-j", file, '-v', "DEVICE_METADATA.localhost.hwsku"]
-                    proc = subprocess.Popen(command, text=True, stdout=subprocess.PIPE)
-                    output, err = proc.communicate()
-
-                except FileNotFoundError as e:
-                    click.echo("{}".format(str(e)), err=True)
-                    raise click.Abort()
-                except Exception as e:
-                    click.echo("{}\n{}".format(type(e), str(e)), err=True)
-                    raise click.Abort()
-
-                if not output:
-                    click.secho("Could not get the HWSKU from config file,  Exiting!!!", fg='magenta')
-                    sys.exit(1)
+                cfg_hwsku = get_cfg_hwsku(file, file_input)
+
+            loads.append(NamespaceTask(namespace, file=file, file_input=file_input, cfg_hwsku=cfg_hwsku))
 
-                cfg_hwsku = output.strip()
+        init_cfg = {}
+        if file_format == 'config_db' and os.path.isfile(INIT_CFG_FILE):
+            init_cfg = read_json_file(INIT_CFG_FILE)
 
-            client, config_db = flush_configdb(namespace)
+        # The TRANSCEIVER tables are in the STATE_DB of the host, whichever namespaces are reloaded
+        if loads:
             delete_transceiver_tables()
 
-            if load_sysinfo:
+        def reload_namespace(load):
+            namespace = load.namespace
+            # The system info written by sonic-cfggen is not in the file, a diff would remove it
+            diff_only = diff and file_format == 'config_db' and not load.cfg_hwsku
+            if diff_only:
+                client, config_db = connect_configdb(namespace)
+            else:
+                client, config_db = flush_configdb(namespace)
+
+            if load.cfg_hwsku:
                 if namespace is DEFAULT_NAMESPACE:
                     command = [
-                        str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '--write-to-db']
+                        str(SONIC_CFGGEN_PATH), '-H', '-k', str(load.cfg_hwsku), '--write-to-db']
                 else:
                     command = [
-                        str(SONIC_CFGGEN_PATH), '-H', '-k', str(cfg_hwsku), '-n', str(namespace), '--write-to-db']
-                clicommon.run_command(command, display_cmd=True)
+                        str(SONIC_CFGGEN_PATH), '-H', '-k', str(load.cfg_hwsku), '-n', str(namespace), '--write-to-db']
+                load.run_command(command)
 
             # For the database service running in linux host we use the file user gives as input
             # or by default DEFAULT_CONFIG_DB_FILE. In the case of database service running in namespace,
             # the default config_db<namespaceID>.json format is used.
 
-            config_gen_opts = []
-
-            if os.path.isfile(INIT_CFG_FILE):
-                config_gen_opts += ['-j', str(INIT_CFG_FILE)]
-
             if file_format == 'config_db':
-                config_gen_opts += ['-j', str(file)]
+                # Write the parsed file on top of init_cfg.json, as sonic-cfggen -j would
+                config = config_db_writer.merge_config(config_db_writer.merge_config({}, init_cfg), load.file_input)
+                write_config_to_db(load, config_db, config, load.file, diff_only)
             else:
-                config_gen_opts += ['-Y', str(file)]
+                config_gen_opts = []
 
-            if namespace is not DEFAULT_NAMESPACE:
-                config_gen_opts += ['-n', str(namespace)]
+                if os.path.isfile(INIT_CFG_FILE):
+                    config_gen_opts += ['-j', str(INIT_CFG_FILE)]
 
-            command = [SONIC_CFGGEN_PATH] + config_gen_opts + ['--write-to-db']
+                config_gen_opts += ['-Y', str(load.file)]
 
-            clicommon.run_command(command, display_cmd=True)
-            client.set(config_db.INIT_INDICATOR, 1)
+                if namespace is not DEFAULT_NAMESPACE:
+                    config_gen_opts += ['-n', str(namespace)]
 
-            if os.path.exists(file) and file.endswith("_configReloadStdin"):
-                # Remove tmpfile
-                try:
-                    os.remove(file)
-                except OSError as e:
-                    click.echo("An error occurred while removing the temporary file: {}".format(str(e)), err=True)
+                command = [SONIC_CFGGEN_PATH] + config_gen_opts + ['--write-to-db']
+
+                load.run_command(command)
+            client.set(config_db.INIT_INDICATOR, 1)
 
             # Migrate DB contents to latest version
-            migrate_db_to_lastest(namespace)
+            command = get_db_migrator_command(namespace)
+            if command:
+                load.run_command(command)
+
+        try:
+            run_namespace_tasks('reload', loads, reload_namespace)
+        finally:
+            for load in loads:
+                if os.path.exists(load.file) and load.file.endswith("_configReloadStdin"):
+                    # Remove tmpfile
+                    try:
+                        os.remove(load.file)
+                    except OSError as e:
+                        click.echo("An error occurred while removing the temporary file: {}".format(str(e)), err=True)
 
     # Re-generate the environment variable in case config_db.json was edited
     update_sonic_environment()
@@ -2181,15 +2379,14 @@ def load_minigraph(db, no_service_restart, traffic_shift_away, override_config,
     if num_npus > 1:
         namespace_list += multi_asic.get_namespaces_from_linux()
 
-    for namespace in namespace_list:
+    def load_namespace(load):
+        namespace = load.namespace
         if namespace is DEFAULT_NAMESPACE:
             config_db = ConfigDBConnector()
             cfggen_namespace_option = []
-            ns_cmd_prefix = ""
         else:
             config_db = ConfigDBConnector(use_unix_socket_path=True, namespace=namespace)
             cfggen_namespace_option = ['-n', str(namespace)]
-            ns_cmd_prefix = "sudo ip netns exec {} ".format(namespace)
         config_db.connect()
         client = config_db.get_redis_client(config_db.CONFIG_DB)
         client.flushdb()
@@ -2197,9 +2394,11 @@ def load_minigraph(db, no_service_restart, traffic_shift_away, override_config,
             command = [SONIC_CFGGEN_PATH, '-H', '-m', '-j', '/etc/sonic/init_cfg.json'] + cfggen_namespace_option + ['--write-to-db']
         else:
             command = [SONIC_CFGGEN_PATH, '-H', '-m', '--write-to-db'] + cfggen_namespace_option
-        clicommon.run_command(command, display_cmd=True)
+        load.run_command(command)
         client.set(config_db.INIT_INDICATOR, 1)
 
+    run_namespace_tasks('load_minigraph', [NamespaceTask(namespace) for namespace in namespace_list], load_namespace)
+
     # Update SONiC environmnet file
     update_sonic_environment()
 
@@ -2,7 +2,9 @@ import os
 import sys
 import json
 import re
+import copy
 import click
+from concurrent.futures import ThreadPoolExecutor
 from tabulate import tabulate
 from sonic_py_common import multi_asic
 from utilities_common.constants import DEFAULT_NAMESPACE
@@ -49,7 +51,9 @@ def dump(ctx):
               help="Prints any intermediate output to stdout useful for dev & troubleshooting")
 @click.option('--namespace', '-n', default=DEFAULT_NAMESPACE, type=str,
               show_default=True, help='Dump the redis-state for this namespace.')
-def state(ctx, module, identifier, db, table, key_map, verbose, namespace):
+@click.option('--jobs', '-j', default=1, type=click.IntRange(min=1), show_default=True,
+              help='Number of identifiers to dump in parallel')
+def state(ctx, module, identifier, db, table, key_map, verbose, namespace, jobs):
     """
     Dump the current state of the identifier for the specified module from Redis DB or CONFIG_FILE
     """
@@ -77,37 +81,61 @@ def state(ctx, module, identifier, db, table, key_map, verbose, namespace):
     else:
         ids = identifier.split(",")
 
-    params = {}
-    collected_info = {}
-    params['namespace'] = namespace
-    for arg in ids:
-        params[plugins.dump_modules[module].ARG_NAME] = arg
-        try:
-            collected_info[arg] = obj.execute(params)
-        except ValueError as err:
-            click.fail(f"Failed to execute plugin: {err}")
+    try:
+        collected_info = collect_info(obj, module, ids, namespace, db, key_map, ctx.obj.conn_pool, jobs)
+    except ValueError as err:
+        ctx.fail(f"Failed to execute plugin: {err}")
 
-    if len(db) > 0:
-        collected_info = filter_out_dbs(db, collected_info)
+    print_dump(collected_info, table, module, identifier, key_map)
 
-    vidtorid = extract_rid(collected_info, namespace, ctx.obj.conn_pool)
+    return
 
-    if not key_map:
-        collected_info = populate_fv(collected_info, module, namespace, ctx.obj.conn_pool, obj.return_pb2_obj())
 
-    for id in vidtorid.keys():
-        collected_info[id]["ASIC_DB"]["vidtorid"] = vidtorid[id]
+def collect_info(obj, module, ids, namespace, db, key_map, conn_pool, jobs=1):
+    """
+    Dump the state of each of the ids, in the order of the ids
+    With jobs > 1, up to jobs ids are dumped in parallel. The workers share the ConnectionPool,
+    which gives each thread connections of its own, and the vid to rid cache. Each id is executed
+    by a shallow copy of the plugin, so the caches and MatchRequestOptimizers of the plugin are shared too
+    """
+    vid_cache = {}
 
-    print_dump(collected_info, table, module, identifier, key_map)
+    def dump_ids(plugin, ids):
+        collected_info = {}
+        params = {}
+        params['namespace'] = namespace
+        for arg in ids:
+            params[plugins.dump_modules[module].ARG_NAME] = arg
+            collected_info[arg] = plugin.execute(params)
 
-    return
+        if len(db) > 0:
+            collected_info = filter_out_dbs(db, collected_info)
+
+        vidtorid = extract_rid(collected_info, namespace, conn_pool, vid_cache)
+
+        if not key_map:
+            collected_info = populate_fv(collected_info, module, namespace, conn_pool, plugin.return_pb2_obj())
+
+        for id in vidtorid.keys():
+            collected_info[id]["ASIC_DB"]["vidtorid"] = vidtorid[id]
+        return collected_info
+
+    if jobs == 1 or len(ids) < 2:
+        return dump_ids(obj, ids)
+
+    collected_info = {}
+    with ThreadPoolExecutor(max_workers=min(jobs, len(ids))) as executor:
+        for info in executor.map(lambda arg: dump_ids(copy.copy(obj), [arg]), ids):
+            collected_info.update(info)
+    return collected_info
 
 
-def extract_rid(info, ns, conn_pool):
+def extract_rid(info, ns, conn_pool, vid_cache=None):
     r = RedisSource(conn_pool)
     r.connect("ASIC_DB", ns)
     vidtorid = {}
-    vid_cache = {}  # Cache Entries to reduce number of Redis Calls
+    if vid_cache is None:
+        vid_cache = {}  # Cache Entries to reduce number of Redis Calls
     for arg in info.keys():
         mp = get_v_r_map(r, info[arg], vid_cache)
         if mp:
@@ -1,11 +1,13 @@
 import json
 import fnmatch
 import copy
+import threading
 from abc import ABC, abstractmethod
 from dump.helper import verbose_print
 from swsscommon.swsscommon import SonicV2Connector, SonicDBConfig
 from sonic_py_common import multi_asic
 from utilities_common.constants import DEFAULT_NAMESPACE
+from utilities_common.counter_snapshot import get_pipeline_client, hgetall_pipelined
 import redis
 
 
@@ -31,6 +33,18 @@ EXCEP_DICT = {
 }
 
 
+def split_field_value(f_values, match_entire_list=False):
+    """
+    Return the values a field matches against: the items of a "," separated list,
+    unless the entire list is matched
+    """
+    if not f_values:
+        return []
+    if "," in f_values and not match_entire_list:
+        return f_values.split(",")
+    return [f_values]
+
+
 class MatchRequest:
     """
     Request Object which should be passed to the MatchEngine
@@ -165,17 +179,23 @@ class SourceAdapter(ABC):
     def hgetall(self, db, key):
         raise NotImplementedError
 
+    def hgetall_bulk(self, db, keys):
+        """ Return the fv-pairs of each of the keys, in the order of the keys """
+        return [self.get(db, key) for key in keys]
+
 
 class RedisSource(SourceAdapter):
     """ Concrete Adaptor Class for connecting to Redis Data Sources """
 
     def __init__(self, conn_pool):
         self.conn = None
+        self.ns = DEFAULT_NAMESPACE
         self.pool = conn_pool
 
     def connect(self, db, ns):
         try:
             self.conn = self.pool.get(db, ns)
+            self.ns = ns
         except Exception as e:
             verbose_print("RedisSource: Connection Failed\n" + str(e))
             return False
@@ -196,6 +216,10 @@ class RedisSource(SourceAdapter):
     def hgetall(self, db, key):
         return self.conn.get_all(db, key)
 
+    def hgetall_bulk(self, db, keys):
+        """ Pipelines the HGETALLs of all the keys instead of a round trip per key """
+        return hgetall_pipelined(get_pipeline_client(self.conn, db, self.ns), keys)
+
 
 class RedisPySource(SourceAdapter):
     """ Concrete Adaptor Class for connecting to APPL_DB using Redis library"""
@@ -242,6 +266,11 @@ class RedisPySource(SourceAdapter):
         key_val = self.conn.hgetall(key)
         return self.get_decoded_value(self.pb_obj, key_val)
 
+    def hgetall_bulk(self, db, keys):
+        """ Pipelines the HGETALLs of all the keys instead of a round trip per key """
+        return [self.get_decoded_value(self.pb_obj, key_val) for key_val in hgetall_pipelined(self.conn, keys)]
+
+
 class JsonSource(SourceAdapter):
     """ Concrete Adaptor Class for connecting to JSON Data Sources """
 
@@ -285,9 +314,33 @@ class JsonSource(SourceAdapter):
 
 
 class ConnectionPool:
-    """ Caches SonicV2Connector objects for effective reuse """
+    """
+    Caches SonicV2Connector objects for effective reuse
+    The pool can be shared by threads. A SonicV2Connector is not thread safe, so the connection objects
+    created by the pool are only used by the thread they were created for.
+    The connection objects filled into the pool are used by all the threads
+    """
     def __init__(self):
-        self.cache = dict()  # Pool of SonicV2Connector objects
+        self.__caches = dict()  # Pool of SonicV2Connector objects of each thread
+        self.__filled = dict()  # Connection objects filled into the pool, by namespace
+        self.__lock = threading.Lock()
+
+    @property
+    def cache(self):
+        """ Pool of SonicV2Connector objects of the calling thread """
+        thread_id = threading.get_ident()
+        with self.__lock:
+            if thread_id not in self.__caches:
+                self.__caches[thread_id] = {ns: self.__copy_entry(entry) for ns, entry in self.__filled.items()}
+            return self.__caches[thread_id]
+
+    @staticmethod
+    def __copy_entry(entry):
+        """ Each thread keeps track of the databases it connected to """
+        entry = dict(entry)
+        if CONN_TO in entry:
+            entry[CONN_TO] = set(entry[CONN_TO])
+        return entry
 
     def initialize_connector(self, ns):
         if not SonicDBConfig.isInit():
@@ -330,20 +383,25 @@ class ConnectionPool:
         return self.cache[ns]["DASH_"+CONN]
 
     def clear(self, namespace=None):
-        if not namespace:
-            self.cache.clear()
-        elif namespace in self.cache:
-            del self.cache[namespace]
+        """ Drop the connection objects of all the threads, of the namespace if given """
+        with self.__lock:
+            for cache in [self.__filled] + list(self.__caches.values()):
+                if not namespace:
+                    cache.clear()
+                elif namespace in cache:
+                    del cache[namespace]
 
     def fill(self, ns, conn, connected_to, dash_object=False):
-        """ Update internal cache """
-        if ns not in self.cache:
-            self.cache[ns] = {}
-        if dash_object:
-            self.cache[ns]["DASH_"+CONN] = conn
-            return
-        self.cache[ns][CONN] = conn
-        self.cache[ns][CONN_TO] = set(connected_to)
+        """ Update internal cache, for all the threads """
+        with self.__lock:
+            entry = self.__filled.setdefault(ns, {})
+            if dash_object:
+                entry["DASH_"+CONN] = conn
+            else:
+                entry[CONN] = conn
+                entry[CONN_TO] = set(connected_to)
+            for cache in self.__caches.values():
+                cache.setdefault(ns, {}).update(self.__copy_entry(entry))
 
 
 class MatchEngine:
@@ -394,35 +452,35 @@ class MatchEngine:
         verbose_print("MatchEngine: \n" + template['error'])
         return template
 
-    def __filter_out_keys(self, src, req, all_matched_keys):
+    def __fetch_fvs(self, src, req, keys):
+        """ Fetch the fv-pairs of all the keys at once, if the request needs them """
+        if not req.field and req.just_keys and not req.return_fields:
+            return {}
+        return dict(zip(keys, src.hgetall_bulk(req.db, keys)))
+
+    def __filter_out_keys(self, req, all_matched_keys, fvs):
         # TODO: Custom Callbacks for Complex Matching Criteria
         if not req.field:
             return all_matched_keys
 
         filtered_keys = []
         for key in all_matched_keys:
-            f_values = src.hget(req.db, key, req.field)
-            if not f_values:
-                continue
-            if "," in f_values and not req.match_entire_list:
-                f_value = f_values.split(",")
-            else:
-                f_value = [f_values]
-            if req.value in f_value:
+            f_values = (fvs.get(key) or {}).get(req.field)
+            if req.value in split_field_value(f_values, req.match_entire_list):
                 filtered_keys.append(key)
         return filtered_keys
 
-    def __fill_template(self, src, req, filtered_keys, template):
+    def __fill_template(self, req, filtered_keys, fvs, template):
         for key in filtered_keys:
             temp = {}
             if not req.just_keys:
-                temp[key] = src.get(req.db, key)
+                temp[key] = fvs[key]
                 template["keys"].append(temp)
             elif len(req.return_fields) > 0:
                 template["keys"].append(key)
                 template["return_values"][key] = {}
                 for field in req.return_fields:
-                    template["return_values"][key][field] = src.hget(req.db, key, field)
+                    template["return_values"][key][field] = (fvs.get(key) or {}).get(field)
             else:
                 template["keys"].append(key)
         verbose_print("Return Values:" + str(template["return_values"]))
@@ -447,11 +505,12 @@ class MatchEngine:
         if not all_matched_keys:
             return self.__display_error(EXCEP_DICT["NO_MATCHES"])
 
-        filtered_keys = self.__filter_out_keys(src, req, all_matched_keys)
+        fvs = self.__fetch_fvs(src, req, all_matched_keys)
+        filtered_keys = self.__filter_out_keys(req, all_matched_keys, fvs)
         verbose_print("Filtered Keys:" + str(filtered_keys))
         if not filtered_keys:
             return self.__display_error(EXCEP_DICT["NO_ENTRIES"])
-        return self.__fill_template(src, req, filtered_keys, template)
+        return self.__fill_template(req, filtered_keys, fvs, template)
 
 
 class MatchRequestOptimizer():
@@ -459,10 +518,15 @@ class MatchRequestOptimizer():
     A Stateful Wrapper which reduces the number of calls to redis by caching the keys
     The Cache saves all the fv-pairs for a key
     Caching would only happen when the "key_pattern" is an absolute key and is not a glob-style pattern
+    Requests filtering on a field are served from a secondary index of field value -> keys,
+    built from a single fetch of all the keys matching the "key_pattern"
+    The optimizer can be shared by threads, an index is only built once
     """
 
     def __init__(self, m_engine):
         self.__key_cache = {}
+        self.__field_index = {}
+        self.__index_lock = threading.Lock()
         self.m_engine = m_engine
 
     def __mutate_request(self, req):
@@ -492,7 +556,7 @@ class MatchRequestOptimizer():
                 for key in keys:
                     new_ret["return_values"][key] = {}
                     for field in fv_requested:
-                        new_ret["return_values"][key][field] = key_fv[key].get(field, "")
+                        new_ret["return_values"][key][field] = key_fv[key].get(field)
         return new_ret
 
     def __fill_cache(self, ret):
@@ -504,31 +568,75 @@ class MatchRequestOptimizer():
             for key in keys:
                 self.__key_cache[key] = key_fv[key]
 
-    def __fetch_from_cache(self, key, req):
+    def __fetch_from_cache(self, keys, req):
         """
-        Cache will have all the fv-pairs of the requested key
+        Cache will have all the fv-pairs of the requested keys
         Response will be tailored based on what was asked
         """
         new_ret = {"error": "", "keys": [], "return_values": {}}
-        if not req.just_keys:
-            new_ret["keys"].append(self.__key_cache[key])
-        else:
-            new_ret["keys"].append(key)
-            if req.return_fields:
-                new_ret["return_values"][key] = {}
-                for field in req.return_fields:
-                    new_ret["return_values"][key][field] = self.__key_cache[key][field]
+        for key in keys:
+            if not req.just_keys:
+                new_ret["keys"].append({key: self.__key_cache[key]})
+            else:
+                new_ret["keys"].append(key)
+                if req.return_fields:
+                    new_ret["return_values"][key] = {}
+                    for field in req.return_fields:
+                        new_ret["return_values"][key][field] = self.__key_cache[key].get(field)
         return new_ret
 
+    def __build_index(self, ret, req):
+        """
+        Index the keys fetched by value of the field requested
+        """
+        index = {}
+        for key_fv in ret["keys"]:
+            for key, fv in key_fv.items():
+                for value in set(split_field_value((fv or {}).get(req.field), req.match_entire_list)):
+                    index.setdefault(value, []).append(key)
+        return index
+
+    def __fetch_from_index(self, req):
+        """
+        Filter the keys on field == value using the index of the table, which is built on first use
+        """
+        index_key = (req.ns, req.db, req.file, req.table, req.key_pattern, req.field, req.match_entire_list)
+        if index_key in self.__field_index:
+            verbose_print("Index Hit for Field: {}".format(req.field))
+        else:
+            with self.__index_lock:
+                if index_key not in self.__field_index:
+                    verbose_print("Index Miss for Field: {}".format(req.field))
+                    table_req = copy.deepcopy(req)
+                    table_req.field = None
+                    table_req.value = None
+                    table_req.just_keys = False
+                    table_req.return_fields = []
+                    ret = self.m_engine.fetch(table_req)
+                    if ret["error"] and ret["error"] != EXCEP_DICT["NO_MATCHES"]:
+                        return ret
+                    self.__fill_cache(ret)
+                    # An empty table is indexed as None, so that it is not fetched again
+                    self.__field_index[index_key] = self.__build_index(ret, req) if ret["keys"] else None
+
+        index = self.__field_index[index_key]
+        if index is None:
+            return {"error": EXCEP_DICT["NO_MATCHES"], "keys": [], "return_values": {}}
+        if req.value not in index:
+            return {"error": EXCEP_DICT["NO_ENTRIES"], "keys": [], "return_values": {}}
+        return self.__fetch_from_cache(index[req.value], req)
+
     def fetch(self, req_orig):
         req = copy.deepcopy(req_orig)
+        if req.field:
+            return self.__fetch_from_index(req)
         sep = "|"
         if req.db:
             sep = SonicDBConfig.getSeparator(req.db)
         key = req.table + sep + req.key_pattern
         if key in self.__key_cache:
             verbose_print("Cache Hit for Key: {}".format(key))
-            return self.__fetch_from_cache(key, req)
+            return self.__fetch_from_cache([key], req)
         else:
             verbose_print("Cache Miss for Key: {}".format(key))
             req, fv_requested, ret_just_keys = self.__mutate_request(req)
@@ -1,4 +1,4 @@
-from dump.match_infra import MatchRequest
+from dump.match_infra import MatchRequest, MatchRequestOptimizer
 from dump.helper import create_template_dict
 from dump.match_helper import fetch_port_oid
 from .executor import Executor
@@ -12,6 +12,8 @@ class Port(Executor):
 
     def __init__(self, match_engine=None):
         super().__init__(match_engine)
+        # The HOSTIF of a port is looked up by name, served from an index of the table for "all" ports
+        self.hostif_match_engine = MatchRequestOptimizer(self.match_engine)
 
     def get_all_args(self, ns=""):
         req = MatchRequest(db="CONFIG_DB", table="PORT", key_pattern="*", ns=ns)
@@ -46,7 +48,7 @@ class Port(Executor):
         self.add_to_ret_template(req.table, req.db, ret["keys"], ret["error"])
 
     def init_asic_hostif_info(self, port_name):
-        req, asic_port_obj_id, ret = fetch_port_oid(self.match_engine, port_name, self.ns)
+        req, asic_port_obj_id, ret = fetch_port_oid(self.hostif_match_engine, port_name, self.ns)
         self.add_to_ret_template(req.table, req.db, ret["keys"], ret["error"])
         return asic_port_obj_id
 
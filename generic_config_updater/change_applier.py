@@ -6,10 +6,10 @@ import importlib
 import os
 import tempfile
 from collections import defaultdict
-from swsscommon.swsscommon import ConfigDBConnector
+from swsscommon.swsscommon import ConfigDBConnector, ConfigDBPipeConnector, RedisPipeline, Table
 from sonic_py_common import multi_asic
-from .gu_common import GenericConfigUpdaterError, genericUpdaterLogging
-from .gu_common import get_config_db_as_json
+from .gu_common import GenericConfigUpdaterError, genericUpdaterLogging, genericUpdaterProfiler
+from .gu_common import get_config_db_as_json, read_config_db, configDbSnapshotCache
 
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 UPDATER_CONF_FILE = f"{SCRIPT_DIR}/gcu_services_validator.conf.json"
@@ -42,10 +42,43 @@ def get_config_db(scope=multi_asic.DEFAULT_NAMESPACE):
     return config_db
 
 
+def get_config_db_pipe(scope=multi_asic.DEFAULT_NAMESPACE):
+    config_db = ConfigDBPipeConnector(use_unix_socket_path=True, namespace=scope)
+    config_db.connect()
+    return config_db
+
+
 def set_config(config_db, tbl, key, data):
     config_db.set_entry(tbl, key, data)
 
 
+def read_config(config_db):
+    return read_config_db(config_db)
+
+
+def set_config_batch(config_db, entries):
+    # Writes the given entries in a single redis pipeline.
+    # entries: list of (tbl, key, old_data, new_data), new_data of None deletes the key.
+    # Similar to set_entry, fields in old_data but not in new_data are removed from the key.
+    pipeline = RedisPipeline(config_db.get_redis_client(config_db.CONFIG_DB))
+    tables = {}
+    for tbl, key, old_data, new_data in entries:
+        if tbl not in tables:
+            tables[tbl] = Table(pipeline, tbl, True)
+        table = tables[tbl]
+
+        if new_data is None:
+            table._del(key)
+            continue
+
+        table.set(key, list(config_db.typed_to_raw(new_data).items()))
+        for field in (old_data or {}):
+            if field not in new_data:
+                raw_field = field + "@" if isinstance(old_data[field], list) else field
+                table.hdel(key, raw_field)
+    pipeline.flush()
+
+
 def prune_empty_table(data):
     # For JSON Patch empty entries are valid
     # With redis, when last key is removed, the table gets removed too.
@@ -75,8 +108,9 @@ class ChangeApplier:
 
     updater_conf = None
 
-    def __init__(self, scope=multi_asic.DEFAULT_NAMESPACE):
+    def __init__(self, scope=multi_asic.DEFAULT_NAMESPACE, direct_read=False):
         self.scope = scope
+        self.direct_read = direct_read
         self.config_db = get_config_db(self.scope)
         self.backend_tables = [
             "BUFFER_PG",
@@ -130,6 +164,7 @@ class ChangeApplier:
 
             if run_data != upd_data:
                 set_config(self.config_db, tbl, key, upd_data)
+                genericUpdaterProfiler.increment("redis_writes")
                 upd_keys[tbl][key] = {}
                 log_debug("Patch affected tbl={} key={}".format(tbl, key))
 
@@ -138,16 +173,21 @@ class ChangeApplier:
             str(jsondiff.diff(run_data, upd_data))[0:40]))
 
     def apply(self, change):
-        run_data = get_config_db_as_json(self.scope)
+        run_data = get_config_db_as_json(self.scope, self.direct_read)
         upd_data = prune_empty_table(change.apply(copy.deepcopy(run_data)))
         upd_keys = defaultdict(dict)
 
-        for tbl in sorted(set(run_data.keys()).union(set(upd_data.keys()))):
-            self._upd_data(tbl, run_data.get(tbl, {}), upd_data.get(tbl, {}), upd_keys)
+        try:
+            for tbl in sorted(set(run_data.keys()).union(set(upd_data.keys()))):
+                self._upd_data(tbl, run_data.get(tbl, {}), upd_data.get(tbl, {}), upd_keys)
+        finally:
+            if upd_keys:
+                configDbSnapshotCache.invalidate(self.scope)
 
-        ret = self._services_validate(run_data, upd_data, upd_keys)
+        with genericUpdaterProfiler.phase("services_validate"):
+            ret = self._services_validate(run_data, upd_data, upd_keys)
         if not ret:
-            run_data = get_config_db_as_json(self.scope)
+            run_data = get_config_db_as_json(self.scope, self.direct_read)
             self.remove_backend_tables_from_config(upd_data)
             self.remove_backend_tables_from_config(run_data)
             if upd_data != run_data:
@@ -160,3 +200,60 @@ class ChangeApplier:
     def remove_backend_tables_from_config(self, data):
         for key in self.backend_tables:
             data.pop(key, None)
+
+
+class BatchedChangeApplier(ChangeApplier):
+    """
+    A ChangeApplier that reads CONFIG_DB once, and keeps the running config current in memory as
+    changes are applied, instead of running `sonic-cfggen` before and after every change.
+    All keys updated by a change are written in a single redis pipeline.
+
+    The in-memory running config assumes no other writer updates CONFIG_DB while the changes are applied,
+    the final config is still verified against CONFIG_DB by the caller once all changes are applied.
+    """
+
+    def __init__(self, scope=multi_asic.DEFAULT_NAMESPACE, direct_read=False):
+        super().__init__(scope, direct_read)
+        self.config_db_pipe = get_config_db_pipe(self.scope)
+        self.running_config = None
+
+    def get_running_config(self):
+        if self.running_config is None:
+            self.running_config = read_config(self.config_db_pipe)
+        return self.running_config
+
+    def apply(self, change):
+        run_data = self.get_running_config()
+        upd_data = prune_empty_table(change.apply(copy.deepcopy(run_data)))
+        upd_keys = defaultdict(dict)
+        entries = []
+
+        for tbl in sorted(set(run_data.keys()).union(set(upd_data.keys()))):
+            run_tbl = run_data.get(tbl, {})
+            upd_tbl = upd_data.get(tbl, {})
+            for key in set(run_tbl.keys()).union(set(upd_tbl.keys())):
+                run_entry = run_tbl.get(key, None)
+                upd_entry = upd_tbl.get(key, None)
+                if run_entry != upd_entry:
+                    entries.append((tbl, key, run_entry, upd_entry))
+                    upd_keys[tbl][key] = {}
+                    log_debug("Patch affected tbl={} key={}".format(tbl, key))
+
+        if entries:
+            try:
+                set_config_batch(self.config_db_pipe, entries)
+                genericUpdaterProfiler.increment("redis_writes", len(entries))
+            except Exception:
+                # Part of the batch might have been written, read CONFIG_DB again on next change
+                self.running_config = None
+                raise
+            finally:
+                configDbSnapshotCache.invalidate(self.scope)
+
+        self.running_config = upd_data
+
+        with genericUpdaterProfiler.phase("services_validate"):
+            ret = self._services_validate(run_data, upd_data, upd_keys)
+        if ret:
+            log_error("Failed to apply Json change")
+        return ret
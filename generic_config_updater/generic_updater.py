@@ -1,19 +1,25 @@
+import concurrent.futures
 import json
+import jsonpatch
 import jsonpointer
 import os
 import subprocess
+import time
 
 from datetime import datetime, timezone
 from enum import Enum
 from .gu_common import HOST_NAMESPACE, GenericConfigUpdaterError, EmptyTableError, ConfigWrapper, \
-                    DryRunConfigWrapper, PatchWrapper, genericUpdaterLogging
+                    DryRunConfigWrapper, PatchWrapper, JsonChange, genericUpdaterLogging, genericUpdaterProfiler, \
+                    configDbSnapshotCache
 from .patch_sorter import StrictPatchSorter, NonStrictPatchSorter, ConfigSplitter, \
-                        TablesWithoutYangConfigSplitter, IgnorePathsFromYangConfigSplitter
-from .change_applier import ChangeApplier, DryRunChangeApplier
+                        TablesWithoutYangConfigSplitter, IgnorePathsFromYangConfigSplitter, Algorithm, PatchSorter
+from .change_applier import ChangeApplier, BatchedChangeApplier, DryRunChangeApplier
 from sonic_py_common import multi_asic
 
 CHECKPOINTS_DIR = "/etc/sonic/checkpoints"
 CHECKPOINT_EXT = ".cp.json"
+# Patch sorting algorithms which can be selected for apply-patch, replace and rollback
+SORT_ALGORITHMS = [Algorithm.DFS, Algorithm.DFS_IN_PLACE, Algorithm.TOPOLOGICAL]
 
 
 def extract_scope(path):
@@ -47,31 +53,115 @@ def get_cmd_output(cmd):
     return proc.communicate()[0], proc.returncode
 
 
+def get_scope_config_json(scope):
+    command = ["sonic-cfggen", "-d", "--print-data"]
+    if scope != multi_asic.DEFAULT_NAMESPACE:
+        command += ["-n", scope]
+
+    genericUpdaterProfiler.increment("cfggen_invocations")
+    running_config_text, returncode = get_cmd_output(command)
+    if returncode:
+        raise GenericConfigUpdaterError(
+            f"Fetch all runningconfiguration failed as output:{running_config_text}")
+    return json.loads(running_config_text)
+
+
 def get_config_json():
-    scope_list = [multi_asic.DEFAULT_NAMESPACE]
-    all_running_config = {}
-    if multi_asic.is_multi_asic():
-        scope_list.extend(multi_asic.get_namespace_list())
-    for scope in scope_list:
-        command = ["sonic-cfggen", "-d", "--print-data"]
-        if scope != multi_asic.DEFAULT_NAMESPACE:
-            command += ["-n", scope]
-
-        running_config_text, returncode = get_cmd_output(command)
-        if returncode:
-            raise GenericConfigUpdaterError(
-                f"Fetch all runningconfiguration failed as output:{running_config_text}")
-        running_config = json.loads(running_config_text)
+    if not multi_asic.is_multi_asic():
+        return get_scope_config_json(multi_asic.DEFAULT_NAMESPACE)
 
-        if multi_asic.is_multi_asic():
+    scope_list = [multi_asic.DEFAULT_NAMESPACE, *multi_asic.get_namespace_list()]
+    all_running_config = {}
+    # Each namespace is fetched by its own sonic-cfggen process, run them concurrently
+    with concurrent.futures.ThreadPoolExecutor() as executor:
+        running_configs = executor.map(get_scope_config_json, scope_list)
+        for scope, running_config in zip(scope_list, running_configs):
             if scope == multi_asic.DEFAULT_NAMESPACE:
                 scope = HOST_NAMESPACE
             all_running_config[scope] = running_config
-        else:
-            all_running_config = running_config
     return all_running_config
 
 
+def get_namespace(scope):
+    # Replace localhost to DEFAULT_NAMESPACE which is db definition of Host
+    if scope.lower() == HOST_NAMESPACE:
+        return multi_asic.DEFAULT_NAMESPACE
+    return scope
+
+
+class MultiASICExecutor:
+    """
+    Runs a task for the host and each ASIC namespace concurrently with a pool of worker threads,
+    and records how long the task took for each of the scopes, also in the profile report if profiling.
+    Only the time spent waiting on sonic-cfggen and CONFIG_DB overlaps, the Python work of the
+    scopes e.g. sorting the patch is still serialized by the GIL.
+    """
+    def __init__(self, max_workers=None, logger=None):
+        self.max_workers = max_workers
+        self.logger = logger if logger is not None else \
+            genericUpdaterLogging.get_logger(title="MultiASICExecutor", print_all_to_console=True)
+        self.timings = {}
+
+    def run(self, task, scopes):
+        """
+        Calls task(scope) for each of the scopes, returns a tuple of (results, failures)
+        where results maps each succeeded scope to the value returned by the task, and
+        failures maps each failed scope to the exception raised by the task.
+        """
+        results = {}
+        failures = {}
+        # Profile the task of every scope as part of the operation being profiled by the caller, if any
+        session = genericUpdaterProfiler.get_session()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self._run_timed, task, scope, session): scope for scope in scopes}
+            for future in concurrent.futures.as_completed(futures):
+                scope = futures[future]
+                try:
+                    results[scope] = future.result()
+                except Exception as ex:
+                    self.logger.log_error(f"{scope}: failed due to: {ex}")
+                    failures[scope] = ex
+        return results, failures
+
+    def _run_timed(self, task, scope, session=None):
+        genericUpdaterProfiler.join(session)
+        start = time.monotonic()
+        try:
+            return task(scope)
+        finally:
+            elapsed = time.monotonic() - start
+            genericUpdaterProfiler.add_scope(scope, elapsed)
+            genericUpdaterProfiler.join(None)
+            self.timings[scope] = elapsed
+            self.logger.log_notice(f"{scope}: completed in {elapsed:.3f} seconds.")
+
+
+def replace_all_scopes(scopelist, target_config, logger, max_workers=None):
+    """
+    Replaces the config of every scope in parallel. If any of the scopes fails, the config of all
+    the scopes is replaced back with the config they had before, so namespaces are not left inconsistent.
+    """
+    original_configs = get_config_json()
+    scope_configs = {scope: target_config.pop(scope) for scope in scopelist}
+
+    executor = MultiASICExecutor(max_workers=max_workers, logger=logger)
+    _, failures = executor.run(
+        lambda scope: ConfigReplacer(scope=get_namespace(scope)).replace(scope_configs[scope]), scopelist)
+    if not failures:
+        return executor.timings
+
+    logger.log_error(f"Failed to replace config for scopes: {sorted(failures)}, rolling back all scopes.")
+    _, rollback_failures = executor.run(
+        lambda scope: ConfigReplacer(scope=get_namespace(scope)).replace(original_configs[scope]), scopelist)
+
+    failure_messages = "\n".join([f"- {scope}: {failures[scope]}" for scope in sorted(failures)])
+    if rollback_failures:
+        failure_messages += "\nFailed to roll back the following scopes:\n"
+        failure_messages += "\n".join([f"- {scope}: {rollback_failures[scope]}"
+                                        for scope in sorted(rollback_failures)])
+    raise GenericConfigUpdaterError(f"Failed to replace config on the following scopes:\n{failure_messages}")
+
+
 class ConfigLock:
     def acquire_lock(self):
         # TODO: Implement ConfigLock
@@ -108,15 +198,18 @@ class PatchApplier:
 
         # Get old config
         self.logger.log_notice(f"{scope} getting current config db.")
-        old_config = self.config_wrapper.get_config_db_as_json()
+        with genericUpdaterProfiler.phase("get_config"):
+            old_config = self.config_wrapper.get_config_db_as_json()
 
         # Generate target config
         self.logger.log_notice(f"{scope}: simulating the target full config after applying the patch.")
-        target_config = self.patch_wrapper.simulate_patch(patch, old_config)
+        with genericUpdaterProfiler.phase("simulate_patch"):
+            target_config = self.patch_wrapper.simulate_patch(patch, old_config)
 
         # Validate all JsonPatch operations on specified fields
         self.logger.log_notice(f"{scope}: validating all JsonPatch operations are permitted on the specified fields")
-        self.config_wrapper.validate_field_operation(old_config, target_config)
+        with genericUpdaterProfiler.phase("validate_field_operation"):
+            self.config_wrapper.validate_field_operation(old_config, target_config, patch)
 
         # Validate target config does not have empty tables since they do not show up in ConfigDb
         self.logger.log_notice(f"""{scope}: validating target config does not have empty tables,
@@ -130,7 +223,8 @@ class PatchApplier:
         # Generate list of changes to apply
         if sort:
             self.logger.log_notice(f"{scope}: sorting patch updates.")
-            changes = self.patchsorter.sort(patch)
+            with genericUpdaterProfiler.phase("sort"):
+                changes = self.patchsorter.sort(patch)
         else:
             self.logger.log_notice(f"{scope}: converting patch to JsonChange.")
             changes = [JsonChange(jsonpatch.JsonPatch([element])) for element in patch]
@@ -144,14 +238,17 @@ class PatchApplier:
                                f"in order{':' if changes_len > 0 else '.'}")
         for change in changes:
             self.logger.log_notice(f"  * {change}")
-            self.changeapplier.apply(change)
+            with genericUpdaterProfiler.phase("apply_change"):
+                self.changeapplier.apply(change)
 
         # Validate config updated successfully
         self.logger.log_notice(f"{scope}: verifying patch updates are reflected on ConfigDB.")
-        new_config = self.config_wrapper.get_config_db_as_json()
-        self.changeapplier.remove_backend_tables_from_config(target_config)
-        self.changeapplier.remove_backend_tables_from_config(new_config)
-        if not (self.patch_wrapper.verify_same_json(target_config, new_config)):
+        with genericUpdaterProfiler.phase("verify"):
+            new_config = self.config_wrapper.get_config_db_as_json()
+            self.changeapplier.remove_backend_tables_from_config(target_config)
+            self.changeapplier.remove_backend_tables_from_config(new_config)
+            same_json = self.patch_wrapper.verify_same_json(target_config, new_config)
+        if not same_json:
             raise GenericConfigUpdaterError(f"{scope}: after applying patch to config, there are still some parts not updated")
 
         self.logger.log_notice(f"{scope} patch application completed.")
@@ -170,20 +267,24 @@ class ConfigReplacer:
         self.logger.log_notice(f"Target config length: {len(json.dumps(target_config))}.")
 
         self.logger.log_notice("Getting current config db.")
-        old_config = self.config_wrapper.get_config_db_as_json()
+        with genericUpdaterProfiler.phase("get_config"):
+            old_config = self.config_wrapper.get_config_db_as_json()
 
         self.logger.log_notice("Generating patch between target config and current config db.")
-        patch = self.patch_wrapper.generate_patch(old_config, target_config)
+        with genericUpdaterProfiler.phase("generate_patch"):
+            patch = self.patch_wrapper.generate_patch(old_config, target_config)
         self.logger.log_debug(f"Generated patch: {patch}.") # debug since the patch will printed again in 'patch_applier.apply'
 
         self.logger.log_notice("Applying patch using 'Patch Applier'.")
         self.patch_applier.apply(patch)
 
         self.logger.log_notice("Verifying config replacement is reflected on ConfigDB.")
-        new_config = self.config_wrapper.get_config_db_as_json()
-        self.patch_applier.changeapplier.remove_backend_tables_from_config(target_config)
-        self.patch_applier.changeapplier.remove_backend_tables_from_config(new_config)
-        if not (self.patch_wrapper.verify_same_json(target_config, new_config)):
+        with genericUpdaterProfiler.phase("verify"):
+            new_config = self.config_wrapper.get_config_db_as_json()
+            self.patch_applier.changeapplier.remove_backend_tables_from_config(target_config)
+            self.patch_applier.changeapplier.remove_backend_tables_from_config(new_config)
+            same_json = self.patch_wrapper.verify_same_json(target_config, new_config)
+        if not same_json:
             raise GenericConfigUpdaterError(f"After replacing config, there is still some parts not updated")
 
         self.logger.log_notice("Config replacement completed.")
@@ -211,7 +312,8 @@ class FileSystemConfigRollbacker:
             raise ValueError(f"Checkpoint '{checkpoint_name}' does not exist")
 
         self.logger.log_notice(f"Loading checkpoint into memory.")
-        target_config = self.util.get_checkpoint_content(checkpoint_name)
+        with genericUpdaterProfiler.phase("load_checkpoint"):
+            target_config = self.util.get_checkpoint_content(checkpoint_name)
 
         self.logger.log_notice(f"Replacing config using 'Config Replacer'.")
         self.config_replacer.replace(target_config)
@@ -308,11 +410,7 @@ class MultiASICConfigReplacer(ConfigReplacer):
         if missing_scopes:
             raise GenericConfigUpdaterError(f"To be replace config is missing scope: {missing_scopes}")
 
-        for scope in self.scopelist:
-            scope_config = target_config.pop(scope)
-            if scope.lower() == HOST_NAMESPACE:
-                scope = multi_asic.DEFAULT_NAMESPACE
-            ConfigReplacer(scope=scope).replace(scope_config)
+        replace_all_scopes(self.scopelist, target_config, self.logger)
 
 
 class MultiASICConfigRollbacker(FileSystemConfigRollbacker):
@@ -336,14 +434,11 @@ class MultiASICConfigRollbacker(FileSystemConfigRollbacker):
             raise ValueError(f"Checkpoint '{checkpoint_name}' does not exist")
 
         self.logger.log_notice(f"Loading checkpoint '{checkpoint_name}' into memory.")
-        target_config = self.util.get_checkpoint_content(checkpoint_name)
+        with genericUpdaterProfiler.phase("load_checkpoint"):
+            target_config = self.util.get_checkpoint_content(checkpoint_name)
         self.logger.log_notice(f"Replacing config '{checkpoint_name}' using 'Config Replacer'.")
 
-        for scope in self.scopelist:
-            config = target_config.pop(scope)
-            if scope.lower() == HOST_NAMESPACE:
-                scope = multi_asic.DEFAULT_NAMESPACE
-            ConfigReplacer(scope=scope).replace(config)
+        replace_all_scopes(self.scopelist, target_config, self.logger)
 
         self.logger.log_notice("Config rollbacking completed.")
 
@@ -451,11 +546,13 @@ class SonicYangDecorator(Decorator):
         self.config_wrapper = config_wrapper
 
     def apply(self, patch):
-        config_db_patch = self.patch_wrapper.convert_sonic_yang_patch_to_config_db_patch(patch)
+        with genericUpdaterProfiler.phase("convert_sonic_yang"):
+            config_db_patch = self.patch_wrapper.convert_sonic_yang_patch_to_config_db_patch(patch)
         Decorator.apply(self, config_db_patch)
 
     def replace(self, target_config):
-        config_db_target_config = self.config_wrapper.convert_sonic_yang_to_config_db(target_config)
+        with genericUpdaterProfiler.phase("convert_sonic_yang"):
+            config_db_target_config = self.config_wrapper.convert_sonic_yang_to_config_db(target_config)
         Decorator.replace(self, config_db_target_config)
 
 
@@ -491,9 +588,60 @@ class ConfigLockDecorator(Decorator):
         self.config_lock.release_lock()
 
 
+class ProfileDecorator(Decorator):
+    """
+    Profiles apply-patch, replace and rollback operations, and prints a machine-readable JSON report
+    with the time spent in each phase of the operation, and counters such as the number of moves
+    generated and validated, the sonic-cfggen invocations and the redis writes.
+    """
+    def __init__(self,
+                 decorated_patch_applier=None,
+                 decorated_config_replacer=None,
+                 decorated_config_rollbacker=None,
+                 profiler=None,
+                 scope=multi_asic.DEFAULT_NAMESPACE):
+        Decorator.__init__(self,
+                           decorated_patch_applier,
+                           decorated_config_replacer,
+                           decorated_config_rollbacker,
+                           scope=scope)
+        self.profiler = profiler if profiler is not None else genericUpdaterProfiler
+        self.profile_logger = genericUpdaterLogging.get_logger(title="Profiler")
+
+    def apply(self, patch, sort=True):
+        self.execute_profiled_action("apply-patch", Decorator.apply, self, patch)
+
+    def replace(self, target_config):
+        self.execute_profiled_action("replace", Decorator.replace, self, target_config)
+
+    def rollback(self, checkpoint_name):
+        self.execute_profiled_action("rollback", Decorator.rollback, self, checkpoint_name)
+
+    def execute_profiled_action(self, operation, action, *args):
+        self.profiler.start(operation, self.scope if self.scope else HOST_NAMESPACE)
+        succeeded = False
+        try:
+            action(*args)
+            succeeded = True
+        finally:
+            report = self.profiler.stop()
+            report["succeeded"] = succeeded
+            report_text = json.dumps(report, sort_keys=True)
+            self.profile_logger.log_notice(report_text)
+            print(report_text)
+
+
 class GenericUpdateFactory:
-    def __init__(self, scope=multi_asic.DEFAULT_NAMESPACE):
+    def __init__(self, scope=multi_asic.DEFAULT_NAMESPACE, batch_writes=False, profile=False, direct_read=True,
+                 sort_algorithm=Algorithm.DFS, incremental_validation=False):
         self.scope = scope
+        self.batch_writes = batch_writes
+        self.sort_algorithm = sort_algorithm
+        # Validate the configs simulated by the patch sorter on a single YANG data tree
+        self.incremental_validation = incremental_validation
+        # Read CONFIG_DB in-process instead of running sonic-cfggen
+        self.direct_read = direct_read
+        self.profile = profile
 
     def create_patch_applier(self, config_format, verbose, dry_run, ignore_non_yang_tables, ignore_paths):
         self.init_verbose_logging(verbose)
@@ -520,6 +668,9 @@ class GenericUpdateFactory:
         if not dry_run:
             patch_applier = ConfigLockDecorator(decorated_patch_applier=patch_applier, scope=self.scope)
 
+        if self.profile:
+            patch_applier = ProfileDecorator(decorated_patch_applier=patch_applier, scope=self.scope)
+
         return patch_applier
 
     def create_config_replacer(self, config_format, verbose, dry_run, ignore_non_yang_tables, ignore_paths):
@@ -554,6 +705,9 @@ class GenericUpdateFactory:
         if not dry_run:
             config_replacer = ConfigLockDecorator(decorated_config_replacer=config_replacer, scope=self.scope)
 
+        if self.profile:
+            config_replacer = ProfileDecorator(decorated_config_replacer=config_replacer, scope=self.scope)
+
         return config_replacer
 
     def create_config_rollbacker(self, verbose, dry_run=False, ignore_non_yang_tables=False, ignore_paths=[]):
@@ -583,6 +737,9 @@ class GenericUpdateFactory:
         if not dry_run:
             config_rollbacker = ConfigLockDecorator(decorated_config_rollbacker=config_rollbacker, scope=self.scope)
 
+        if self.profile:
+            config_rollbacker = ProfileDecorator(decorated_config_rollbacker=config_rollbacker, scope=self.scope)
+
         return config_rollbacker
 
     def init_verbose_logging(self, verbose):
@@ -590,19 +747,23 @@ class GenericUpdateFactory:
 
     def get_config_wrapper(self, dry_run):
         if dry_run:
-            return DryRunConfigWrapper(scope=self.scope)
+            return DryRunConfigWrapper(scope=self.scope, direct_read=self.direct_read)
         else:
-            return ConfigWrapper(scope=self.scope)
+            return ConfigWrapper(scope=self.scope, direct_read=self.direct_read)
 
     def get_change_applier(self, dry_run, config_wrapper):
         if dry_run:
             return DryRunChangeApplier(config_wrapper)
+        elif self.batch_writes:
+            return BatchedChangeApplier(scope=self.scope, direct_read=self.direct_read)
         else:
-            return ChangeApplier(scope=self.scope)
+            return ChangeApplier(scope=self.scope, direct_read=self.direct_read)
 
     def get_patch_sorter(self, ignore_non_yang_tables, ignore_paths, config_wrapper, patch_wrapper):
+        inner_patch_sorter = PatchSorter(config_wrapper, patch_wrapper,
+                                         incremental_validation=self.incremental_validation)
         if not ignore_non_yang_tables and not ignore_paths:
-            return StrictPatchSorter(config_wrapper, patch_wrapper)
+            return StrictPatchSorter(config_wrapper, patch_wrapper, inner_patch_sorter, algorithm=self.sort_algorithm)
 
         inner_config_splitters = []
         if ignore_non_yang_tables:
@@ -613,29 +774,37 @@ class GenericUpdateFactory:
 
         config_splitter = ConfigSplitter(config_wrapper, inner_config_splitters)
 
-        return NonStrictPatchSorter(config_wrapper, patch_wrapper, config_splitter)
+        return NonStrictPatchSorter(config_wrapper, patch_wrapper, config_splitter, patch_sorter=inner_patch_sorter,
+                                    algorithm=self.sort_algorithm)
 
 
 class GenericUpdater:
-    def __init__(self, generic_update_factory=None, scope=multi_asic.DEFAULT_NAMESPACE):
+    def __init__(self, generic_update_factory=None, scope=multi_asic.DEFAULT_NAMESPACE, profile=False,
+                 batch_writes=False, sort_algorithm=Algorithm.DFS, incremental_validation=False):
         self.generic_update_factory = \
-            generic_update_factory if generic_update_factory is not None else GenericUpdateFactory(scope=scope)
+            generic_update_factory if generic_update_factory is not None \
+            else GenericUpdateFactory(scope=scope, profile=profile, batch_writes=batch_writes,
+                                      sort_algorithm=sort_algorithm, incremental_validation=incremental_validation)
 
     def apply_patch(self, patch, config_format, verbose, dry_run, ignore_non_yang_tables, ignore_paths, sort=True):
         patch_applier = self.generic_update_factory.create_patch_applier(config_format, verbose, dry_run, ignore_non_yang_tables, ignore_paths)
-        patch_applier.apply(patch, sort)
+        with configDbSnapshotCache.operation():
+            patch_applier.apply(patch, sort)
 
     def replace(self, target_config, config_format, verbose, dry_run, ignore_non_yang_tables, ignore_paths):
         config_replacer = self.generic_update_factory.create_config_replacer(config_format, verbose, dry_run, ignore_non_yang_tables, ignore_paths)
-        config_replacer.replace(target_config)
+        with configDbSnapshotCache.operation():
+            config_replacer.replace(target_config)
 
     def rollback(self, checkpoint_name, verbose, dry_run, ignore_non_yang_tables, ignore_paths):
         config_rollbacker = self.generic_update_factory.create_config_rollbacker(verbose, dry_run, ignore_non_yang_tables, ignore_paths)
-        config_rollbacker.rollback(checkpoint_name)
+        with configDbSnapshotCache.operation():
+            config_rollbacker.rollback(checkpoint_name)
 
     def checkpoint(self, checkpoint_name, verbose):
         config_rollbacker = self.generic_update_factory.create_config_rollbacker(verbose)
-        config_rollbacker.checkpoint(checkpoint_name)
+        with configDbSnapshotCache.operation():
+            config_rollbacker.checkpoint(checkpoint_name)
 
     def delete_checkpoint(self, checkpoint_name, verbose):
         config_rollbacker = self.generic_update_factory.create_config_rollbacker(verbose)
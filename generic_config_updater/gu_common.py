@@ -9,7 +9,11 @@ import yang as ly
 import copy
 import re
 import os
+import threading
+import time
+from contextlib import contextmanager
 from sonic_py_common import logger, multi_asic
+from swsscommon.swsscommon import ConfigDBPipeConnector
 from enum import Enum
 
 YANG_DIR = "/usr/local/yang-models"
@@ -17,6 +21,12 @@ SYSLOG_IDENTIFIER = "GenericConfigUpdater"
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 GCU_FIELD_OP_CONF_FILE = f"{SCRIPT_DIR}/gcu_field_operation_validators.conf.json"
 HOST_NAMESPACE = "localhost"
+FIELD_OPERATION_VALIDATORS_MODULE = "generic_config_updater.field_operation_validators"
+# Matches the table name in a JsonPatch path, e.g. PFC_WD for /PFC_WD/GLOBAL
+TABLE_NAME_IN_PATH_RE = re.compile(r'\/([^\/]+)(\/|$)')
+# How long a CONFIG_DB snapshot can be reused within a GCU operation, as long as the operation did not write to
+# the namespace since
+CONFIG_DB_SNAPSHOT_TTL_SECONDS = 30
 
 
 class GenericConfigUpdaterError(Exception):
@@ -54,18 +64,31 @@ class JsonChange:
         return False
 
 
-def get_config_db_as_json(scope=None):
+def get_config_db_as_json(scope=None, direct_read=False):
+    if direct_read:
+        return configDbSnapshotCache.get(scope)
+
     text = get_config_db_as_text(scope=scope)
     config_db_json = json.loads(text)
     config_db_json.pop("bgpraw", None)
     return config_db_json
 
 
+def read_config_db(config_db):
+    # Reads the whole CONFIG_DB with pipelined HGETALLs, in the same format as `sonic-cfggen -d --print-data`
+    data = {}
+    for tbl, entries in config_db.get_config().items():
+        data[tbl] = {config_db.serialize_key(key): entry for key, entry in entries.items()}
+    data.pop("bgpraw", None)
+    return data
+
+
 def get_config_db_as_text(scope=None):
     if scope is not None and scope != multi_asic.DEFAULT_NAMESPACE:
         cmd = ['sonic-cfggen', '-d', '--print-data', '-n', scope]
     else:
         cmd = ['sonic-cfggen', '-d', '--print-data']
+    genericUpdaterProfiler.increment("cfggen_invocations")
     result = subprocess.Popen(cmd, shell=False, text=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     text, err = result.communicate()
     return_code = result.returncode
@@ -76,13 +99,31 @@ def get_config_db_as_text(scope=None):
 
 
 class ConfigWrapper:
-    def __init__(self, yang_dir=YANG_DIR, scope=multi_asic.DEFAULT_NAMESPACE):
+    # illegal_operations_to_fields_map['remove'] yields a list of fields for which `remove` is an illegal operation
+    illegal_operations_to_fields_map = {
+        'add': [],
+        'replace': [],
+        'remove': [
+            '/PFC_WD/GLOBAL/POLL_INTERVAL',
+            '/PFC_WD/GLOBAL',
+            '/LOOPBACK_INTERFACE/Loopback0']
+    }
+    illegal_operations = {(operation, field) for operation, field_list in illegal_operations_to_fields_map.items()
+                          for field in field_list}
+
+    # Loaded from GCU_FIELD_OP_CONF_FILE once per process
+    field_operation_conf = None
+    # table name -> list of (validator name, validating function), resolved once per process
+    field_operation_validators = {}
+
+    def __init__(self, yang_dir=YANG_DIR, scope=multi_asic.DEFAULT_NAMESPACE, direct_read=False):
         self.scope = scope
         self.yang_dir = YANG_DIR
+        self.direct_read = direct_read
         self.sonic_yang_with_loaded_models = None
 
     def get_config_db_as_json(self):
-        return get_config_db_as_json(self.scope)
+        return get_config_db_as_json(self.scope, self.direct_read)
 
     def _get_config_db_as_text(self):
         return get_config_db_as_text(self.scope)
@@ -140,10 +181,6 @@ class ConfigWrapper:
     def validate_config_db_config(self, config_db_as_json):
         sy = self.create_sonic_yang_with_loaded_models()
 
-        # TODO: Move these validators to YANG models
-        supplemental_yang_validators = [self.validate_bgp_peer_group,
-                                        self.validate_lanes]
-
         try:
             tmp_config_db_as_json = copy.deepcopy(config_db_as_json)
 
@@ -151,68 +188,91 @@ class ConfigWrapper:
 
             sy.validate_data_tree()
 
-            for supplemental_yang_validator in supplemental_yang_validators:
-                success, error = supplemental_yang_validator(config_db_as_json)
-                if not success:
-                    return success, error
+            return self.validate_supplemental_yang_constraints(config_db_as_json)
         except sonic_yang.SonicYangException as ex:
             return False, ex
 
+    def validate_supplemental_yang_constraints(self, config_db_as_json):
+        # TODO: Move these validators to YANG models
+        supplemental_yang_validators = [self.validate_bgp_peer_group,
+                                        self.validate_lanes]
+
+        for supplemental_yang_validator in supplemental_yang_validators:
+            success, error = supplemental_yang_validator(config_db_as_json)
+            if not success:
+                return success, error
+
         return True, None
 
-    def validate_field_operation(self, old_config, target_config):
+    def validate_field_operation(self, old_config, target_config, patch=None):
         """
         Some fields in ConfigDB are restricted and may not allow third-party addition, replacement, or removal.
         Because YANG only validates state and not transitions, this method helps to JsonPatch operations/transitions for the specified fields.
+
+        If the patch transforming old_config into target_config is given, only the tables it updates are compared.
         """
-        patch = jsonpatch.JsonPatch.from_diff(old_config, target_config)
-
-        # illegal_operations_to_fields_map['remove'] yields a list of fields for which `remove` is an illegal operation
-        illegal_operations_to_fields_map = {
-            'add':[],
-            'replace': [],
-            'remove': [
-                '/PFC_WD/GLOBAL/POLL_INTERVAL',
-                '/PFC_WD/GLOBAL',
-                '/LOOPBACK_INTERFACE/Loopback0']
-        }
-        for operation, field_list in illegal_operations_to_fields_map.items():
-            for field in field_list:
-                if any(op['op'] == operation and field == op['path'] for op in patch):
-                    raise IllegalPatchOperationError("Given patch operation is invalid. Operation: {} is illegal on field: {}".format(operation, field))
+        tables = self._get_patch_tables(patch) if patch is not None else None
+        if tables is None:
+            patch = jsonpatch.JsonPatch.from_diff(old_config, target_config)
+        else:
+            old_tables = {table: old_config[table] for table in tables if table in old_config}
+            target_tables = {table: target_config[table] for table in tables if table in target_config}
+            patch = jsonpatch.JsonPatch.from_diff(old_tables, target_tables)
 
-        self.illegal_dataacl_check(old_config, target_config)
+        for op in patch:
+            if (op['op'], op['path']) in ConfigWrapper.illegal_operations:
+                raise IllegalPatchOperationError("Given patch operation is invalid. Operation: {} is illegal on field: {}".format(op['op'], op['path']))
 
-        def _invoke_validating_function(cmd, jsonpatch_element):
-            # cmd is in the format as <package/module name>.<method name>
-            method_name = cmd.split(".")[-1]
-            module_name = ".".join(cmd.split(".")[0:-1])
-            if module_name != "generic_config_updater.field_operation_validators" or "validator" not in method_name:
-                raise GenericConfigUpdaterError("Attempting to call invalid method {} in module {}. Module must be generic_config_updater.field_operation_validators, and method must be a defined validator".format(method_name, module_name))
-            module = importlib.import_module(module_name, package=None)
-            method_to_call = getattr(module, method_name)
-            return method_to_call(self.scope, jsonpatch_element)
-
-        if os.path.exists(GCU_FIELD_OP_CONF_FILE):
-            with open(GCU_FIELD_OP_CONF_FILE, "r") as s:
-                gcu_field_operation_conf = json.load(s)
-        else:
-            raise GenericConfigUpdaterError("GCU field operation validators config file not found")
+        self.illegal_dataacl_check(old_config, target_config)
 
         for element in patch:
             path = element["path"]
-            match = re.search(r'\/([^\/]+)(\/|$)', path) # This matches the table name in the path, eg if path if /PFC_WD/GLOBAL, the match would be PFC_WD
+            match = TABLE_NAME_IN_PATH_RE.search(path)
             if match is not None:
                 table = match.group(1)
             else:
                 raise GenericConfigUpdaterError("Invalid jsonpatch path: {}".format(path))
-            validating_functions= set()
-            tables = gcu_field_operation_conf["tables"]
-            validating_functions.update(tables.get(table, {}).get("field_operation_validators", []))
 
-            for function in validating_functions:
-                if not _invoke_validating_function(function, element):
-                    raise IllegalPatchOperationError("Modification of {} table is illegal- validating function {} returned False".format(table, function))
+            for name, validating_function in self._get_field_operation_validators(table):
+                if not validating_function(self.scope, element):
+                    raise IllegalPatchOperationError("Modification of {} table is illegal- validating function {} returned False".format(table, name))
+
+    def _get_patch_tables(self, patch):
+        # Returns the tables updated by the given patch, or None if the patch updates the whole config
+        tables = set()
+        for op in patch:
+            for path in [op['path'], op.get('from')]:
+                if path is None:
+                    continue
+                if path == "":
+                    return None
+                tables.add(JsonPointer(path).parts[0])
+        return tables
+
+    def _get_field_operation_validators(self, table):
+        if table not in ConfigWrapper.field_operation_validators:
+            if ConfigWrapper.field_operation_conf is None:
+                if os.path.exists(GCU_FIELD_OP_CONF_FILE):
+                    with open(GCU_FIELD_OP_CONF_FILE, "r") as s:
+                        ConfigWrapper.field_operation_conf = json.load(s)
+                else:
+                    raise GenericConfigUpdaterError("GCU field operation validators config file not found")
+
+            tables = ConfigWrapper.field_operation_conf["tables"]
+            names = sorted(set(tables.get(table, {}).get("field_operation_validators", [])))
+            ConfigWrapper.field_operation_validators[table] = [(name, self._resolve_validating_function(name))
+                                                               for name in names]
+
+        return ConfigWrapper.field_operation_validators[table]
+
+    def _resolve_validating_function(self, cmd):
+        # cmd is in the format as <package/module name>.<method name>
+        method_name = cmd.split(".")[-1]
+        module_name = ".".join(cmd.split(".")[0:-1])
+        if module_name != FIELD_OPERATION_VALIDATORS_MODULE or "validator" not in method_name:
+            raise GenericConfigUpdaterError("Attempting to call invalid method {} in module {}. Module must be generic_config_updater.field_operation_validators, and method must be a defined validator".format(method_name, module_name))
+        module = importlib.import_module(module_name, package=None)
+        return getattr(module, method_name)
 
     def illegal_dataacl_check(self, old_config, upd_config):
         '''
@@ -356,8 +416,8 @@ class ConfigWrapper:
 
 class DryRunConfigWrapper(ConfigWrapper):
     # This class will simulate all read/write operations to ConfigDB on a virtual storage unit.
-    def __init__(self, initial_imitated_config_db=None, scope=multi_asic.DEFAULT_NAMESPACE):
-        super().__init__(scope=scope)
+    def __init__(self, initial_imitated_config_db=None, scope=multi_asic.DEFAULT_NAMESPACE, direct_read=False):
+        super().__init__(scope=scope, direct_read=direct_read)
         self.logger = genericUpdaterLogging.get_logger(title="** DryRun", print_all_to_console=True)
         self.imitated_config_db = copy.deepcopy(initial_imitated_config_db)
 
@@ -376,6 +436,247 @@ class DryRunConfigWrapper(ConfigWrapper):
             self.imitated_config_db = super().get_config_db_as_json()
 
 
+class SonicYangDataTree:
+    """
+    A class to edit the data tree of a sonic_yang instance which has a config loaded.
+
+    sonic_yang has no API to update a loaded data tree in place. The sonic_yang internals needed for it,
+    _find_data_node, _xlateConfigDBtoYang, ctx and root, are only used through this class.
+    """
+    def __init__(self, sy):
+        self.sy = sy
+
+    def find_node(self, xpath):
+        return self.sy._find_data_node(xpath)
+
+    def remove_node(self, xpath):
+        node = self.find_node(xpath)
+        if node is not None:
+            node.unlink()
+
+    def add_config(self, config_db_as_json):
+        config_as_yang = dict()
+        self.sy._xlateConfigDBtoYang(copy.deepcopy(config_db_as_json), config_as_yang)
+        # The added config is validated together with the whole data tree, alone it cannot resolve references
+        node = self.sy.ctx.parse_data_mem(json.dumps(config_as_yang), ly.LYD_JSON,
+                                          ly.LYD_OPT_CONFIG | ly.LYD_OPT_STRICT | ly.LYD_OPT_TRUSTED)
+        self.sy.root.merge(node, 0)
+
+class IncrementalDataTree:
+    """
+    A class to keep a single sonic_yang data tree loaded for many similar ConfigDb configs, such as the configs
+    simulated by the patch sorter for every candidate move.
+
+    Loading a config only replaces the table keys that differ from the previously loaded config, so the cost of
+    updating the data tree is proportional to the changed keys. If the data tree cannot be updated incrementally,
+    the whole config is loaded again.
+    """
+    def __init__(self, config_wrapper, logger_title="Incremental YANG Data Tree"):
+        self.config_wrapper = config_wrapper
+        self.path_addressing = PathAddressing(config_wrapper)
+        self.logger = genericUpdaterLogging.get_logger(title=logger_title)
+        self.sy = None
+        self.data_tree = None
+        # Copy of the config currently loaded in the data tree, only tables with YANG models are kept
+        self.loaded_config = None
+        # The base config version and the (table, key) where the loaded config can differ from that base config
+        self.base_version = None
+        self.base_changed_keys = set()
+
+    def load(self, config_db_as_json, base_version=None, changed_keys=None):
+        """
+        Loads the given config into the data tree.
+        Returns the list of (table, key) replaced in the data tree, or None if the whole config was loaded.
+
+        If the config is a base config changed only under changed_keys, a set of (table, key), then base_version
+        is a value identifying the content of the base config. As long as the base config version does not change,
+        only the changed keys of the loaded and given configs are compared, instead of all of their tables.
+        """
+        if self.loaded_config is None:
+            self._load(config_db_as_json)
+            changed = None
+        elif base_version is not None and base_version == self.base_version and changed_keys is not None:
+            changed = self._update(config_db_as_json, self.base_changed_keys.union(changed_keys))
+        else:
+            changed = self._update(config_db_as_json)
+
+        self.base_version = base_version if changed_keys is not None else None
+        self.base_changed_keys = set(changed_keys) if self.base_version is not None else set()
+        return changed
+
+    def _load(self, config_db_as_json):
+        self.sy = None
+        self.data_tree = None
+        self.loaded_config = None
+
+        sy = self.config_wrapper.create_sonic_yang_with_loaded_models()
+        sy.loadData(copy.deepcopy(config_db_as_json))
+
+        self.sy = sy
+        self.data_tree = SonicYangDataTree(sy)
+        self.loaded_config = {table: copy.deepcopy(config_db_as_json[table])
+                              for table in config_db_as_json if table in sy.confDbYangMap}
+
+    def _update(self, config_db_as_json, candidate_keys=None):
+        changed_keys = self._get_changed_keys(config_db_as_json, candidate_keys)
+        if not changed_keys:
+            return changed_keys
+
+        # Replacing most of the config key by key is slower than loading it at once
+        loaded_keys_count = sum(len(keys) for keys in self.loaded_config.values())
+        if len(changed_keys) > max(1, loaded_keys_count // 2):
+            self._load(config_db_as_json)
+            return None
+
+        try:
+            for table, key in changed_keys:
+                self._replace_key(table, key, config_db_as_json)
+        except Exception as ex:
+            # The data tree is partially updated, start over with a fresh data tree
+            self.logger.log_debug(f"Failed to update YANG data tree incrementally, loading whole config. Error: {ex}")
+            self._load(config_db_as_json)
+            return None
+
+        return changed_keys
+
+    def _get_changed_keys(self, config_db_as_json, candidate_keys=None):
+        if candidate_keys is not None:
+            return [(table, key) for table, key in candidate_keys
+                    if table in self.sy.confDbYangMap and
+                    self.loaded_config.get(table, {}).get(key) != config_db_as_json.get(table, {}).get(key)]
+
+        changed_keys = []
+        tables = set(self.loaded_config.keys())
+        tables.update(table for table in config_db_as_json if table in self.sy.confDbYangMap)
+        for table in tables:
+            loaded_table = self.loaded_config.get(table, {})
+            new_table = config_db_as_json.get(table, {})
+            if loaded_table == new_table:
+                continue
+
+            for key in set(loaded_table.keys()).union(new_table.keys()):
+                if loaded_table.get(key) != new_table.get(key):
+                    changed_keys.append((table, key))
+
+        return changed_keys
+
+    def _replace_key(self, table, key, config_db_as_json):
+        path = self.path_addressing.create_path([table, key])
+
+        loaded_table = self.loaded_config.get(table, {})
+        if key in loaded_table:
+            xpath = self.path_addressing.convert_path_to_xpath(path, self.loaded_config, self.sy)
+            self.data_tree.remove_node(xpath)
+            del loaded_table[key]
+
+        new_table = config_db_as_json.get(table, {})
+        if key in new_table:
+            value = copy.deepcopy(new_table[key])
+            self.data_tree.add_config({table: {key: value}})
+            self.loaded_config.setdefault(table, {})[key] = value
+
+        if table in self.loaded_config and table not in config_db_as_json and not self.loaded_config[table]:
+            del self.loaded_config[table]
+
+class IncrementalConfigValidator(IncrementalDataTree):
+    """
+    A class to validate many similar ConfigDb configs according to YANG models, such as the configs simulated by
+    the patch sorter for every candidate move.
+
+    ConfigWrapper.validate_config_db_config parses the whole config into a new sonic_yang data tree for every
+    validation. This class instead keeps a single data tree loaded, and before each validation it only replaces
+    the table keys that differ from the previously validated config. Keys changed by one validation are reverted
+    by the next one in the same way, so the cost of updating the data tree is proportional to the changed keys.
+    """
+    def __init__(self, config_wrapper):
+        super().__init__(config_wrapper, logger_title="Incremental YANG Validator")
+
+    def validate(self, config_db_as_json, base_version=None, changed_keys=None):
+        try:
+            self.load(config_db_as_json, base_version, changed_keys)
+            self.sy.validate_data_tree()
+        except sonic_yang.SonicYangException as ex:
+            return False, ex
+
+        return self.config_wrapper.validate_supplemental_yang_constraints(config_db_as_json)
+
+class LeafrefReverseIndex(IncrementalDataTree):
+    """
+    A reverse index of YANG leafref references, used to find the references of paths in many similar configs.
+
+    sonic_yang.find_data_dependencies scans all the instances of every leaf referencing the given leaf each time
+    it is called. This class scans the instances of a referencing leaf once, and indexes them by value. When a
+    different config is loaded, only the instances under the changed table keys are updated in the index.
+    """
+    def __init__(self, config_wrapper):
+        super().__init__(config_wrapper, logger_title="Leafref Reverse Index")
+        # schema path of referencing leaf -> {value -> set of data xpaths}
+        self.refs_by_value = {}
+        # schema path of referencing leaf -> {(table, key) -> list of (value, data xpath)}
+        self.refs_by_key = {}
+
+    def find_ref_paths(self, path, config):
+        changed_keys = self.load(config)
+        if changed_keys is None:
+            self.refs_by_value = {}
+            self.refs_by_key = {}
+        elif changed_keys:
+            self._update_refs(changed_keys, config)
+
+        xpath = self.path_addressing.convert_path_to_xpath(path, config, self.sy)
+
+        ref_xpaths = set()
+        for node in self.path_addressing._get_inner_leaf_nodes(xpath, self.sy):
+            backlinks = ly.Schema_Node_Leaf(node.schema()).backlinks()
+            if backlinks is None or backlinks.number() == 0:
+                continue
+
+            value = ly.Data_Node_Leaf_List(node).value_str()
+            for link in backlinks.schema():
+                ref_xpaths.update(self._get_refs(link.path(), config).get(value, ()))
+
+        ref_paths = set(self.path_addressing.convert_xpath_to_path(ref_xpath, config, self.sy)
+                        for ref_xpath in ref_xpaths)
+        return sorted(ref_paths)
+
+    def _get_refs(self, schema_path, config):
+        if schema_path not in self.refs_by_value:
+            self.refs_by_value[schema_path] = {}
+            self.refs_by_key[schema_path] = {}
+            for node in self.sy.root.find_path(schema_path).data():
+                ref_path = self.path_addressing.convert_xpath_to_path(node.path(), config, self.sy)
+                table_key = tuple(self.path_addressing.get_path_tokens(ref_path)[:2])
+                self._add_ref(schema_path, table_key, node)
+
+        return self.refs_by_value[schema_path]
+
+    def _add_ref(self, schema_path, table_key, node):
+        value = ly.Data_Node_Leaf_List(node).value_str()
+        xpath = node.path()
+        self.refs_by_value[schema_path].setdefault(value, set()).add(xpath)
+        self.refs_by_key[schema_path].setdefault(table_key, []).append((value, xpath))
+
+    def _update_refs(self, changed_keys, config):
+        for schema_path, refs in self.refs_by_key.items():
+            for table_key in changed_keys:
+                for value, xpath in refs.pop(table_key, []):
+                    self.refs_by_value[schema_path][value].discard(xpath)
+
+        for table, key in changed_keys:
+            if key not in config.get(table, {}):
+                continue
+
+            xpath = self.path_addressing.convert_path_to_xpath(
+                self.path_addressing.create_path([table, key]), config, self.sy)
+            key_node = self.data_tree.find_node(xpath)
+            if key_node is None:
+                continue
+
+            for node in key_node.tree_dfs():
+                schema_path = node.schema().path()
+                if schema_path in self.refs_by_key:
+                    self._add_ref(schema_path, (table, key), node)
+
 class PatchWrapper:
     def __init__(self, config_wrapper=None, scope=multi_asic.DEFAULT_NAMESPACE):
         self.scope = scope
@@ -463,6 +764,7 @@ class PathAddressing:
 
     def __init__(self, config_wrapper=None):
         self.config_wrapper = config_wrapper
+        self.leafref_index = None
 
     def get_path_tokens(self, path):
         return JsonPointer(path).parts
@@ -605,7 +907,18 @@ class PathAddressing:
             /ACL_TABLE/EVERFLOW6/ports/1
         """
         # TODO: Also fetch references by must statement (check similar statements)
-        return self._find_leafref_paths(path, config)
+        if self.leafref_index is None:
+            self.leafref_index = LeafrefReverseIndex(self.config_wrapper)
+
+        try:
+            return self.leafref_index.find_ref_paths(path, config)
+        except Exception as ex:
+            # The index might be partially updated, build it again on next call
+            logger = genericUpdaterLogging.get_logger(title="Path Addressing")
+            logger.log_warning(f"Failed to find references of {path} using the leafref index, "
+                               f"falling back to loading the whole config. Error: {ex!r}")
+            self.leafref_index = None
+            return self._find_leafref_paths(path, config)
 
     def _find_leafref_paths(self, path, config):
         sy = self._create_sonic_yang_with_loaded_models()
@@ -634,6 +947,10 @@ class PathAddressing:
         return ref_paths
 
     def _get_inner_leaf_xpaths(self, xpath, sy):
+        for node in self._get_inner_leaf_nodes(xpath, sy):
+            yield node.path()
+
+    def _get_inner_leaf_nodes(self, xpath, sy):
         if xpath == "/": # Point to Root element which contains all xpaths
             nodes = sy.root.tree_for()
         else: # Otherwise get all nodes that match xpath
@@ -643,7 +960,7 @@ class PathAddressing:
             for inner_node in node.tree_dfs():
                 # TODO: leaflist also can be used as the 'path' argument in 'leafref' so add support to leaflist
                 if self._is_leaf_node(inner_node):
-                    yield inner_node.path()
+                    yield inner_node
 
     def _is_leaf_node(self, node):
         schema = node.schema()
@@ -1127,3 +1444,176 @@ class GenericUpdaterLogging:
         return TitledLogger(SYSLOG_IDENTIFIER, title, self._verbose, print_all_to_console)
 
 genericUpdaterLogging = GenericUpdaterLogging()
+
+
+class ConfigDbSnapshotCache:
+    """
+    Reads CONFIG_DB snapshots in-process, instead of running `sonic-cfggen -d --print-data`, and caches
+    them so a single GCU operation does not read the same namespace again and again.
+
+    Snapshots are only cached while an operation is running, see 'operation', and are dropped once it ends,
+    so writes done by other processes between operations are never missed.
+    Each namespace has a version which is bumped by 'invalidate' whenever the operation writes to the namespace,
+    a cached snapshot is only returned if no write happened since it was read.
+    Callers get a copy of the snapshot, so they are free to modify it.
+    """
+    def __init__(self, ttl_seconds=CONFIG_DB_SNAPSHOT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self.lock = threading.Lock()
+        self.operations = 0
+        self.versions = {}
+        self.snapshots = {}
+        self.connectors = {}
+
+    @contextmanager
+    def operation(self):
+        # Operations can run concurrently e.g. apply-patch of multiple ASICs, snapshots are kept until the last one ends
+        with self.lock:
+            if self.operations == 0:
+                self.snapshots.clear()
+            self.operations += 1
+        try:
+            yield
+        finally:
+            with self.lock:
+                self.operations -= 1
+                if self.operations == 0:
+                    self.snapshots.clear()
+
+    def get(self, scope=None):
+        scope = scope if scope else multi_asic.DEFAULT_NAMESPACE
+        with self.lock:
+            caching = self.operations > 0
+            version = self.versions.get(scope, 0)
+            snapshot = self.snapshots.get(scope)
+            if snapshot is not None:
+                snapshot_version, read_time, config = snapshot
+                if snapshot_version == version and time.monotonic() - read_time < self.ttl_seconds:
+                    return copy.deepcopy(config)
+
+        genericUpdaterProfiler.increment("config_db_snapshot_reads")
+        read_time = time.monotonic()
+        config = read_config_db(self._get_connector(scope))
+        if not caching:
+            return config
+
+        with self.lock:
+            # If the namespace was written to while reading, or the operation ended, the snapshot is not cached
+            # as it might be stale
+            if self.operations > 0 and self.versions.get(scope, 0) == version:
+                self.snapshots[scope] = (version, read_time, config)
+        return copy.deepcopy(config)
+
+    def invalidate(self, scope=None):
+        scope = scope if scope else multi_asic.DEFAULT_NAMESPACE
+        with self.lock:
+            self.versions[scope] = self.versions.get(scope, 0) + 1
+            self.snapshots.pop(scope, None)
+
+    def clear(self):
+        with self.lock:
+            self.snapshots.clear()
+
+    def _get_connector(self, scope):
+        with self.lock:
+            if scope not in self.connectors:
+                config_db = ConfigDBPipeConnector(use_unix_socket_path=True, namespace=scope)
+                config_db.connect()
+                self.connectors[scope] = config_db
+            return self.connectors[scope]
+
+configDbSnapshotCache = ConfigDbSnapshotCache()
+
+class ProfileSession:
+    """
+    Timings and counters collected while profiling a single GCU operation e.g. apply-patch on a single scope.
+    A session can be shared by multiple threads working on the same operation.
+    """
+    COUNTERS = ["moves_generated", "moves_validated", "cfggen_invocations", "redis_writes"]
+
+    def __init__(self, operation, scope):
+        self.operation = operation
+        self.scope = scope
+        self.lock = threading.Lock()
+        self.phases = {}
+        self.counters = {counter: 0 for counter in ProfileSession.COUNTERS}
+        self.scopes = {}
+        self.start_time = time.monotonic()
+
+    def add_phase(self, name, seconds):
+        with self.lock:
+            phase = self.phases.setdefault(name, {"count": 0, "seconds": 0.0})
+            phase["count"] += 1
+            phase["seconds"] += seconds
+
+    def increment(self, counter, count=1):
+        with self.lock:
+            self.counters[counter] = self.counters.get(counter, 0) + count
+
+    def add_scope(self, scope, seconds):
+        # Wall-clock time spent on each scope of a multi-ASIC operation, the scopes run concurrently
+        with self.lock:
+            self.scopes[scope] = self.scopes.get(scope, 0.0) + seconds
+
+    def report(self):
+        with self.lock:
+            return {
+                "operation": self.operation,
+                "scope": self.scope,
+                "total_seconds": round(time.monotonic() - self.start_time, 6),
+                "phases": {name: {"count": phase["count"], "seconds": round(phase["seconds"], 6)}
+                           for name, phase in self.phases.items()},
+                "counters": dict(self.counters),
+                "scopes": {scope: round(seconds, 6) for scope, seconds in self.scopes.items()}
+            }
+
+class GenericUpdaterProfiler:
+    """
+    Collects per-phase timings and counters of GCU operations.
+    Profiling is only active in the thread that started a session, and in threads which joined it.
+    Otherwise phases and counters are no-ops, so they can be left in the code paths.
+    """
+    def __init__(self):
+        self._local = threading.local()
+
+    def start(self, operation, scope=HOST_NAMESPACE):
+        session = ProfileSession(operation, scope)
+        self._local.session = session
+        return session
+
+    def stop(self):
+        session = self.get_session()
+        self._local.session = None
+        return session.report() if session is not None else None
+
+    def get_session(self):
+        return getattr(self._local, "session", None)
+
+    def join(self, session):
+        # Used by worker threads to add their phases and counters to the session of the calling thread
+        self._local.session = session
+
+    @contextmanager
+    def phase(self, name):
+        session = self.get_session()
+        if session is None:
+            yield
+            return
+
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            session.add_phase(name, time.monotonic() - start)
+
+    def increment(self, counter, count=1):
+        session = self.get_session()
+        if session is not None:
+            session.increment(counter, count)
+
+    def add_scope(self, scope, seconds):
+        session = self.get_session()
+        if session is not None:
+            session.add_scope(scope, seconds)
+
+genericUpdaterProfiler = GenericUpdaterProfiler()
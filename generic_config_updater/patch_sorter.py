@@ -1,23 +1,110 @@
 import copy
+import itertools
 import json
 import jsonpatch
 from collections import deque, OrderedDict
 from enum import Enum
+from toposort import toposort, CircularDependencyError
 from .gu_common import OperationWrapper, OperationType, GenericConfigUpdaterError, \
-                       JsonChange, PathAddressing, genericUpdaterLogging
+                       JsonChange, PathAddressing, IncrementalConfigValidator, genericUpdaterLogging, \
+                       genericUpdaterProfiler
+
+class ConfigHasher:
+    """
+    A class to compute a structural hash of a ConfigDB config that can be updated incrementally.
+
+    The config hash is the sum of the hashes of its parts:
+      - a hash for every table name
+      - a hash for every key within a table, covering the key content
+    Since the sum does not depend on the order of the parts, a move only requires subtracting the hashes of the
+    table keys it touches before the move, and adding their hashes after the move. So the cost of updating
+    the hash is proportional to the changed keys rather than the whole config.
+    """
+    HASH_MODULUS = 1 << 64
+
+    def hash_config(self, config):
+        if not isinstance(config, dict):
+            return self._hash_value(("", config))
+
+        config_hash = 0
+        for table in config:
+            config_hash += self.hash_scope(config, [table])
+        return config_hash % ConfigHasher.HASH_MODULUS
+
+    def get_scope(self, config, tokens):
+        """
+        Returns the tokens of the smallest part of the config whose hash covers any change under the given tokens.
+        It is the table key if the table is a dict, otherwise the table, or the whole config.
+        """
+        if len(tokens) < 2:
+            return tokens[:1]
+        table = tokens[0]
+        if isinstance(config, dict) and isinstance(config.get(table), dict):
+            return tokens[:2]
+        return tokens[:1]
+
+    def hash_scope(self, config, scope):
+        """
+        Returns the part of the config hash that is contributed by the given scope, 0 if the scope does not exist.
+        """
+        if not scope:
+            return self.hash_config(config)
+
+        if not isinstance(config, dict) or scope[0] not in config:
+            return 0
+
+        table = scope[0]
+        table_content = config[table]
+        if len(scope) == 2:
+            key = scope[1]
+            if not isinstance(table_content, dict) or key not in table_content:
+                return 0
+            return self._hash_value((table, key, table_content[key]))
+
+        if not isinstance(table_content, dict):
+            return self._hash_value((table, table_content))
+
+        table_hash = hash((table,))
+        for key in table_content:
+            table_hash += self._hash_value((table, key, table_content[key]))
+        return table_hash
+
+    def _hash_value(self, value):
+        return hash(json.dumps(value, sort_keys=True))
 
 class Diff:
     """
     A class that contains the diff info between current and target configs.
     """
+    # Source of the versions of current_config, a new version is taken every time current_config changes
+    _config_versions = itertools.count()
+
     def __init__(self, current_config, target_config):
         self.current_config = current_config
         self.target_config = target_config
+        self.config_version = next(Diff._config_versions)
+        self.undo_log = []
+        self.config_hasher = ConfigHasher()
+        # Hashes are computed on first use, then current_config hash is updated incrementally with moves
+        self._current_config_hash = None
+        self._target_config_hash = None
 
     def __hash__(self):
-        cc = json.dumps(self.current_config, sort_keys=True)
-        tc = json.dumps(self.target_config, sort_keys=True)
-        return hash((cc,tc))
+        return hash((self._get_current_config_hash(), self._get_target_config_hash()))
+
+    def _get_current_config_hash(self):
+        if self._current_config_hash is None:
+            self._current_config_hash = self.config_hasher.hash_config(self.current_config)
+        return self._current_config_hash
+
+    def _get_target_config_hash(self):
+        if self._target_config_hash is None:
+            self._target_config_hash = self.config_hasher.hash_config(self.target_config)
+        return self._target_config_hash
+
+    def _get_move_scope(self, move):
+        tokens = PathAddressing().get_path_tokens(move.path)
+        return self.config_hasher.get_scope(self.current_config, tokens)
 
     def __eq__(self, other):
         """Overrides the default implementation"""
@@ -26,12 +113,48 @@ class Diff:
 
         return False
 
-    # TODO: Can be optimized to apply the move in place. JsonPatch supports that using the option 'in_place=True'
-    # Check: https://python-json-patch.readthedocs.io/en/latest/tutorial.html#applying-a-patch
-    # NOTE: in case move is applied in place, we will need to support `undo_move` as well.
     def apply_move(self, move):
         new_current_config = move.apply(self.current_config)
-        return Diff(new_current_config, self.target_config)
+        new_diff = Diff(new_current_config, self.target_config)
+        new_diff._target_config_hash = self._target_config_hash
+
+        if self._current_config_hash is not None:
+            scope = self._get_move_scope(move)
+            new_diff._current_config_hash = (self._current_config_hash -
+                                             self.config_hasher.hash_scope(self.current_config, scope) +
+                                             self.config_hasher.hash_scope(new_current_config, scope)) \
+                                            % ConfigHasher.HASH_MODULUS
+
+        return new_diff
+
+    def apply_move_in_place(self, move):
+        """
+        Applies the move directly to current_config without copying it, and records the information needed
+        to revert it in the undo log. The cost is proportional to the size of the move rather than the config.
+        Call 'undo_move' to revert the most recently applied move.
+        """
+        old_config_hash = self._current_config_hash
+        scope = None
+        if old_config_hash is not None:
+            scope = self._get_move_scope(move)
+            old_scope_hash = self.config_hasher.hash_scope(self.current_config, scope)
+
+        self.current_config, undo_record = move.apply_in_place(self.current_config)
+        self.config_version = next(Diff._config_versions)
+        self.undo_log.append((undo_record, old_config_hash))
+
+        if old_config_hash is not None:
+            new_scope_hash = self.config_hasher.hash_scope(self.current_config, scope)
+            self._current_config_hash = (old_config_hash - old_scope_hash + new_scope_hash) % ConfigHasher.HASH_MODULUS
+
+        return self
+
+    def undo_move(self):
+        undo_record, old_config_hash = self.undo_log.pop()
+        self.current_config = undo_record.revert(self.current_config)
+        self.config_version = next(Diff._config_versions)
+        self._current_config_hash = old_config_hash
+        return self
 
     def has_no_diff(self):
         return self.current_config == self.target_config
@@ -274,6 +397,47 @@ class JsonMove:
     def apply(self, config):
         return self.patch.apply(config)
 
+    def apply_in_place(self, config):
+        """
+        Applies the move to the given config without creating a copy of it.
+        Returns a tuple of the updated config and a JsonMoveUndoRecord that can revert the update.
+
+        The updated config is the same object as the given config, unless the move is updating the whole config.
+        The move value is copied before being added to the config, so later in-place moves do not alter this move.
+        """
+        tokens = PathAddressing().get_path_tokens(self.path)
+        value = copy.deepcopy(self.value)
+
+        # whole config is updated, there is no parent to update in place
+        if not tokens:
+            if self.op_type == OperationType.REMOVE:
+                raise GenericConfigUpdaterError("Removing the whole config is not supported")
+            return value, JsonMoveUndoRecord(None, None, config)
+
+        parent = config
+        for token in tokens[:-1]:
+            parent = parent[int(token) if isinstance(parent, list) else token]
+
+        key = tokens[-1]
+        if isinstance(parent, list):
+            key = len(parent) if key == "-" else int(key)
+            if self.op_type == OperationType.ADD:
+                parent.insert(key, value)
+                return config, JsonMoveUndoRecord(parent, key, JsonMoveUndoRecord.INSERTED)
+            if self.op_type == OperationType.REMOVE:
+                old_value = parent.pop(key)
+                return config, JsonMoveUndoRecord(parent, key, JsonMoveUndoRecord.REMOVED, old_value)
+            old_value = parent[key]
+            parent[key] = value
+            return config, JsonMoveUndoRecord(parent, key, old_value)
+
+        old_value = parent.get(key, JsonMoveUndoRecord.MISSING)
+        if self.op_type == OperationType.REMOVE:
+            del parent[key]
+        else:
+            parent[key] = value
+        return config, JsonMoveUndoRecord(parent, key, old_value)
+
     def __str__(self):
         return str(self.patch)
 
@@ -289,6 +453,42 @@ class JsonMove:
     def __hash__(self):
         return hash((self.op_type, self.path, json.dumps(self.value)))
 
+class JsonMoveUndoRecord:
+    """
+    A class that keeps the information needed to revert a JsonMove applied in place.
+
+    'parent' is the dict or list that was updated, and 'key' is the dict key or list index that was updated.
+    'old_value' is the value that was replaced or removed, or one of the markers:
+      MISSING  - the dict key did not exist before the move
+      INSERTED - the list item was inserted by the move
+      REMOVED  - the list item was removed by the move, the removed item is kept in 'removed_item'
+    If 'parent' is None, the move updated the whole config and 'old_value' is the previous config.
+    """
+    MISSING = object()
+    INSERTED = object()
+    REMOVED = object()
+
+    def __init__(self, parent, key, old_value, removed_item=None):
+        self.parent = parent
+        self.key = key
+        self.old_value = old_value
+        self.removed_item = removed_item
+
+    def revert(self, config):
+        if self.parent is None:
+            return self.old_value
+
+        if self.old_value is JsonMoveUndoRecord.MISSING:
+            del self.parent[self.key]
+        elif self.old_value is JsonMoveUndoRecord.INSERTED:
+            self.parent.pop(self.key)
+        elif self.old_value is JsonMoveUndoRecord.REMOVED:
+            self.parent.insert(self.key, self.removed_item)
+        else:
+            self.parent[self.key] = self.old_value
+
+        return config
+
 class MoveWrapper:
     def __init__(self, move_generators, move_non_extendable_generators, move_extenders, move_validators):
         self.move_generators = move_generators
@@ -316,11 +516,13 @@ class MoveWrapper:
         for move in self._generate_non_extendable_moves(diff):
             if not(move in processed_moves):
                 processed_moves.add(move)
+                genericUpdaterProfiler.increment("moves_generated")
                 yield move
 
         for move in self._generate_moves(diff):
             if not(move in processed_moves):
                 processed_moves.add(move)
+                genericUpdaterProfiler.increment("moves_generated")
                 yield move
 
             if not(move in extended_moves):
@@ -331,6 +533,7 @@ class MoveWrapper:
             move = moves.popleft()
             if not(move in processed_moves):
                 processed_moves.add(move)
+                genericUpdaterProfiler.increment("moves_generated")
                 yield move
 
             if not(move in extended_moves):
@@ -338,6 +541,7 @@ class MoveWrapper:
                 moves.extend(self._extend_moves(move, diff))
 
     def validate(self, move, diff):
+        genericUpdaterProfiler.increment("moves_validated")
         for validator in self.move_validators:
             if not validator.validate(move, diff):
                 return False
@@ -346,6 +550,12 @@ class MoveWrapper:
     def simulate(self, move, diff):
         return diff.apply_move(move)
 
+    def simulate_in_place(self, move, diff):
+        return diff.apply_move_in_place(move)
+
+    def undo_simulation(self, diff):
+        return diff.undo_move()
+
     def _generate_moves(self, diff):
         for generator in self.move_generators:
             for move in generator.generate(diff):
@@ -397,7 +607,7 @@ class JsonPointerFilter:
 
         matching_keys = []
         if token == "*":
-            matching_keys = config.keys()
+            matching_keys = list(config.keys())
         elif token.startswith("*|"):
             suffix = token[1:]
             matching_keys = [key for key in config.keys() if key.endswith(suffix)]
@@ -676,15 +886,43 @@ class DeleteWholeConfigMoveValidator:
 class FullConfigMoveValidator:
     """
     A class to validate that full config is valid according to YANG models after applying the move.
+
+    If a config_validator such as IncrementalConfigValidator is given, it is used to validate the simulated configs
+    instead of ConfigWrapper.validate_config_db_config, so the YANG data tree is not parsed again for every move.
+    It is given the version of the current config and the table keys changed by the move, so it only has to compare
+    these keys with the config it validated previously.
     """
-    def __init__(self, config_wrapper):
+    def __init__(self, config_wrapper, config_validator=None):
         self.config_wrapper = config_wrapper
+        self.config_validator = config_validator
+        self.path_addressing = PathAddressing()
 
     def validate(self, move, diff):
         simulated_config = move.apply(diff.current_config)
-        is_valid, error = self.config_wrapper.validate_config_db_config(simulated_config)
+        if self.config_validator is not None:
+            changed_keys = self._get_changed_keys(move, diff.current_config, simulated_config)
+            is_valid, error = self.config_validator.validate(simulated_config, diff.config_version, changed_keys)
+        else:
+            is_valid, error = self.config_wrapper.validate_config_db_config(simulated_config)
         return is_valid
 
+    def _get_changed_keys(self, move, current_config, simulated_config):
+        """
+        Returns the set of (table, key) the move can change, or None if the move can change more than table keys.
+        """
+        tokens = self.path_addressing.get_path_tokens(move.path)
+        if not tokens:
+            return None
+
+        table = tokens[0]
+        current_table = current_config.get(table, {})
+        simulated_table = simulated_config.get(table, {})
+        if not isinstance(current_table, dict) or not isinstance(simulated_table, dict):
+            return None
+        if len(tokens) > 1:
+            return {(table, tokens[1])}
+        return {(table, key) for key in itertools.chain(current_table, simulated_table)}
+
 class CreateOnlyMoveValidator:
     """
     A class to validate create-only fields are only created, but never modified/updated. In other words:
@@ -1085,8 +1323,9 @@ class KeyLevelMoveGenerator:
             yield JsonMove(diff, OperationType.ADD, tokens, tokens)
 
     def _get_non_existing_keys_tokens(self, config1, config2):
-        for table in config1:
-            for key in config1[table]:
+        # Iterating over copies of the keys, as the config can be updated in place while the generator is suspended
+        for table in list(config1):
+            for key in list(config1[table]):
                 if not(table in config2) or not (key in config2[table]):
                     yield [table, key]
 
@@ -1138,7 +1377,7 @@ class RemoveCreateOnlyDependencyMoveGenerator:
             if not target_members:
                 continue
 
-            for member_name in current_members:
+            for member_name in list(current_members):
                 if member_name not in target_members:
                     continue
 
@@ -1194,7 +1433,9 @@ class SingleRunLowLevelMoveGenerator:
             return
 
         if isinstance(current_ptr, dict) or isinstance(target_ptr, dict):
-            for key in current_ptr:
+            # Iterating over a copy of the keys, as the current config can be updated in place
+            # by the sorter while this generator is suspended
+            for key in list(current_ptr):
                 current_tokens.append(key)
                 if key in target_ptr:
                     target_tokens.append(key)
@@ -1289,7 +1530,7 @@ class SingleRunLowLevelMoveGenerator:
                 yield JsonMove(self.diff, OperationType.REMOVE, current_tokens)
                 return
 
-            for key in ptr:
+            for key in list(ptr):
                 current_tokens.append(key)
                 for move in self._traverse_current(ptr[key], current_tokens):
                     yield move
@@ -1559,6 +1800,42 @@ class DfsSorter:
 
         return None
 
+class InPlaceDfsSorter:
+    """
+    A DFS sorter that keeps a single working config for the whole search. Each move is applied to the working
+    config in place and reverted using the undo log when backtracking, instead of keeping a full copy of the
+    config for every search node. Memory and copying cost scale with the size of the moves, not the config.
+    """
+    def __init__(self, move_wrapper):
+        self.visited = {}
+        self.move_wrapper = move_wrapper
+
+    def sort(self, diff):
+        # The working config is updated in place, so do not alter the caller's config
+        working_diff = Diff(copy.deepcopy(diff.current_config), diff.target_config)
+        return self._sort(working_diff)
+
+    def _sort(self, diff):
+        if diff.has_no_diff():
+            return []
+
+        diff_hash = hash(diff)
+        if diff_hash in self.visited:
+            return None
+        self.visited[diff_hash] = True
+
+        moves = self.move_wrapper.generate(diff)
+
+        for move in moves:
+            if self.move_wrapper.validate(move, diff):
+                self.move_wrapper.simulate_in_place(move, diff)
+                new_moves = self._sort(diff)
+                self.move_wrapper.undo_simulation(diff)
+                if new_moves is not None:
+                    return [move] + new_moves
+
+        return None
+
 class BfsSorter:
     def __init__(self, move_wrapper):
         self.visited = {}
@@ -1624,18 +1901,175 @@ class MemoizationSorter:
         self.mem[diff_hash] = bst_moves
         return bst_moves
 
+class TopologicalSorter:
+    """
+    A sorter that orders key-level moves using a dependency graph, instead of searching the state-space.
+
+    The graph is built once from the diff:
+    - Each key that is only in the current config is removed, each key that is only in the target config is added,
+      and each key that is in both but different is replaced. If a create-only field of the key is changed,
+      the key is removed then added instead.
+    - A key referencing an added key is added/replaced after it.
+    - A key referencing a removed key is removed/replaced before it.
+
+    The moves are then applied in topological order, each move is still validated. If the graph has a cycle,
+    or a move is not valid, the remaining diff is sorted using the fallback sorter.
+    """
+    REMOVE_NODE = 0
+    REPLACE_NODE = 1
+    ADD_NODE = 2
+
+    def __init__(self, move_wrapper, path_addressing, fallback_sorter):
+        self.move_wrapper = move_wrapper
+        self.path_addressing = path_addressing
+        self.fallback_sorter = fallback_sorter
+        self.create_only_filter = CreateOnlyFilter(path_addressing).get_filter()
+
+    def sort(self, diff):
+        if diff.has_no_diff():
+            return []
+
+        if not self._is_key_level_config(diff.current_config) or not self._is_key_level_config(diff.target_config):
+            return self.fallback_sorter.sort(diff)
+
+        graph = self._build_graph(diff)
+        try:
+            levels = list(toposort(graph))
+        except CircularDependencyError:
+            return self.fallback_sorter.sort(diff)
+
+        moves = []
+        for level in levels:
+            # sorted for a deterministic order, removals first within the same level
+            for node in sorted(level):
+                move = self._create_move(node, diff)
+                if move is None:
+                    continue
+
+                if not self.move_wrapper.validate(move, diff):
+                    return self._sort_remaining(moves, diff)
+
+                moves.append(move)
+                diff = self.move_wrapper.simulate(move, diff)
+
+        if not diff.has_no_diff():
+            return self._sort_remaining(moves, diff)
+
+        return moves
+
+    def _sort_remaining(self, moves, diff):
+        remaining_moves = self.fallback_sorter.sort(diff)
+        if remaining_moves is None:
+            return None
+        return moves + remaining_moves
+
+    def _is_key_level_config(self, config):
+        return all(isinstance(table, dict) for table in config.values())
+
+    def _build_graph(self, diff):
+        current_config = diff.current_config
+        target_config = diff.target_config
+        create_only_keys = self._get_create_only_changed_keys(current_config, target_config)
+
+        graph = {}
+        nodes_by_key = {}
+        for table in set(current_config.keys()).union(target_config.keys()):
+            current_table = current_config.get(table, {})
+            target_table = target_config.get(table, {})
+            for key in set(current_table.keys()).union(target_table.keys()):
+                if key not in target_table:
+                    node_types = [self.REMOVE_NODE]
+                elif key not in current_table:
+                    node_types = [self.ADD_NODE]
+                elif current_table[key] == target_table[key]:
+                    continue
+                elif (table, key) in create_only_keys:
+                    node_types = [self.REMOVE_NODE, self.ADD_NODE]
+                else:
+                    node_types = [self.REPLACE_NODE]
+
+                nodes = [(node_type, table, key) for node_type in node_types]
+                nodes_by_key[(table, key)] = nodes
+                for node in nodes:
+                    graph[node] = set()
+
+                if len(nodes) == 2:
+                    # add the key back only after it was removed
+                    graph[nodes[1]].add(nodes[0])
+
+        for node in list(graph.keys()):
+            node_type, table, key = node
+            path = self.path_addressing.create_path([table, key])
+            if node_type == self.ADD_NODE:
+                # keys referencing an added key are added/replaced after it
+                for ref_node in self._get_ref_nodes(path, target_config, nodes_by_key, (table, key)):
+                    if ref_node[0] != self.REMOVE_NODE:
+                        graph[ref_node].add(node)
+            elif node_type == self.REMOVE_NODE:
+                # keys referencing a removed key are removed/replaced before it
+                for ref_node in self._get_ref_nodes(path, current_config, nodes_by_key, (table, key)):
+                    if ref_node[0] != self.ADD_NODE:
+                        graph[node].add(ref_node)
+
+        return graph
+
+    def _get_ref_nodes(self, path, config, nodes_by_key, table_key):
+        for ref_path in self.path_addressing.find_ref_paths(path, config):
+            ref_tokens = self.path_addressing.get_path_tokens(ref_path)
+            ref_key = tuple(ref_tokens[:2])
+            if ref_key == table_key:
+                continue
+            for ref_node in nodes_by_key.get(ref_key, []):
+                yield ref_node
+
+    def _get_create_only_changed_keys(self, current_config, target_config):
+        changed_keys = set()
+        paths = set(self.create_only_filter.get_paths(current_config)).union(
+            self.create_only_filter.get_paths(target_config))
+        for path in paths:
+            tokens = self.path_addressing.get_path_tokens(path)
+            current_exists = self.path_addressing.has_path(current_config, path)
+            target_exists = self.path_addressing.has_path(target_config, path)
+            if current_exists and target_exists and \
+               self.path_addressing.get_from_path(current_config, path) == \
+               self.path_addressing.get_from_path(target_config, path):
+                continue
+            changed_keys.add(tuple(tokens[:2]))
+        return changed_keys
+
+    def _create_move(self, node, diff):
+        node_type, table, key = node
+        current_config = diff.current_config
+        if node_type == self.REMOVE_NODE:
+            if key not in current_config.get(table, {}):
+                return None
+            # tables cannot be left empty, remove the whole table with its last key
+            if len(current_config[table]) == 1:
+                return JsonMove(diff, OperationType.REMOVE, [table])
+            return JsonMove(diff, OperationType.REMOVE, [table, key])
+
+        if node_type == self.ADD_NODE:
+            return JsonMove(diff, OperationType.ADD, [table, key], [table, key])
+
+        return JsonMove(diff, OperationType.REPLACE, [table, key], [table, key])
+
 class Algorithm(Enum):
     DFS = 1
     BFS = 2
     MEMOIZATION = 3
+    DFS_IN_PLACE = 4
+    TOPOLOGICAL = 5
 
 class SortAlgorithmFactory:
-    def __init__(self, operation_wrapper, config_wrapper, path_addressing):
+    def __init__(self, operation_wrapper, config_wrapper, path_addressing, incremental_validation=False):
         self.operation_wrapper = operation_wrapper
         self.config_wrapper = config_wrapper
         self.path_addressing = path_addressing
+        # Validate the simulated configs with an IncrementalConfigValidator, instead of parsing each of them again
+        self.incremental_validation = incremental_validation
 
     def create(self, algorithm=Algorithm.DFS):
+        config_validator = IncrementalConfigValidator(self.config_wrapper) if self.incremental_validation else None
         move_generators = [RemoveCreateOnlyDependencyMoveGenerator(self.path_addressing),
                            LowLevelMoveGenerator(self.path_addressing)]
         # TODO: Enable TableLevelMoveGenerator once it is confirmed whole table can be updated at the same time
@@ -1645,7 +2079,7 @@ class SortAlgorithmFactory:
                           DeleteInsteadOfReplaceMoveExtender(),
                           DeleteRefsMoveExtender(self.path_addressing)]
         move_validators = [DeleteWholeConfigMoveValidator(),
-                           FullConfigMoveValidator(self.config_wrapper),
+                           FullConfigMoveValidator(self.config_wrapper, config_validator),
                            NoDependencyMoveValidator(self.path_addressing, self.config_wrapper),
                            CreateOnlyMoveValidator(self.path_addressing),
                            RequiredValueMoveValidator(self.path_addressing),
@@ -1660,19 +2094,26 @@ class SortAlgorithmFactory:
             sorter = BfsSorter(move_wrapper)
         elif algorithm == Algorithm.MEMOIZATION:
             sorter = MemoizationSorter(move_wrapper)
+        elif algorithm == Algorithm.DFS_IN_PLACE:
+            sorter = InPlaceDfsSorter(move_wrapper)
+        elif algorithm == Algorithm.TOPOLOGICAL:
+            sorter = TopologicalSorter(move_wrapper, self.path_addressing, DfsSorter(move_wrapper))
         else:
             raise ValueError(f"Algorithm {algorithm} is not supported")
 
         return sorter
 
 class StrictPatchSorter:
-    def __init__(self, config_wrapper, patch_wrapper, inner_patch_sorter=None):
+    def __init__(self, config_wrapper, patch_wrapper, inner_patch_sorter=None, algorithm=Algorithm.DFS):
         self.logger = genericUpdaterLogging.get_logger(title="Patch Sorter - Strict", print_all_to_console=True)
         self.config_wrapper = config_wrapper
         self.patch_wrapper = patch_wrapper
         self.inner_patch_sorter = inner_patch_sorter if inner_patch_sorter else PatchSorter(config_wrapper, patch_wrapper)
+        # The algorithm used when sort is not given one
+        self.algorithm = algorithm
 
-    def sort(self, patch, algorithm=Algorithm.DFS):
+    def sort(self, patch, algorithm=None):
+        algorithm = algorithm if algorithm else self.algorithm
         current_config = self.config_wrapper.get_config_db_as_json()
 
         # Validate patch is only updating tables with yang models
@@ -1854,15 +2295,19 @@ class ChangeWrapper:
         return adjusted_changes
 
 class NonStrictPatchSorter:
-    def __init__(self, config_wrapper, patch_wrapper, config_splitter, change_wrapper=None, patch_sorter=None):
+    def __init__(self, config_wrapper, patch_wrapper, config_splitter, change_wrapper=None, patch_sorter=None,
+                 algorithm=Algorithm.DFS):
         self.logger = genericUpdaterLogging.get_logger(title="Patch Sorter - Non-Strict", print_all_to_console=True)
         self.config_wrapper = config_wrapper
         self.patch_wrapper = patch_wrapper
         self.config_splitter = config_splitter
         self.change_wrapper = change_wrapper if change_wrapper else ChangeWrapper(patch_wrapper, config_splitter)
         self.inner_patch_sorter = patch_sorter if patch_sorter else PatchSorter(config_wrapper, patch_wrapper)
+        # The algorithm used when sort is not given one
+        self.algorithm = algorithm
 
-    def sort(self, patch, algorithm=Algorithm.DFS):
+    def sort(self, patch, algorithm=None):
+        algorithm = algorithm if algorithm else self.algorithm
         current_config = self.config_wrapper.get_config_db_as_json()
         target_config = self.patch_wrapper.simulate_patch(patch, current_config)
 
@@ -1915,13 +2360,14 @@ class NonStrictPatchSorter:
         return changes
 
 class PatchSorter:
-    def __init__(self, config_wrapper, patch_wrapper, sort_algorithm_factory=None):
+    def __init__(self, config_wrapper, patch_wrapper, sort_algorithm_factory=None, incremental_validation=False):
         self.config_wrapper = config_wrapper
         self.patch_wrapper = patch_wrapper
         self.operation_wrapper = OperationWrapper()
         self.path_addressing = PathAddressing(self.config_wrapper)
         self.sort_algorithm_factory = sort_algorithm_factory if sort_algorithm_factory else \
-            SortAlgorithmFactory(self.operation_wrapper, config_wrapper, self.path_addressing)
+            SortAlgorithmFactory(self.operation_wrapper, config_wrapper, self.path_addressing,
+                                 incremental_validation=incremental_validation)
 
     def sort(self, patch, algorithm=Algorithm.DFS, preloaded_current_config=None):
         current_config = preloaded_current_config if preloaded_current_config else self.config_wrapper.get_config_db_as_json()
@@ -30,12 +30,21 @@ To verify:
         Analyze the reported failures to match expected.
     You may use the exit code to verify the result as success or not.
 
+Daemon mode (-d):
+    Instead of reading both DBs on every run, subscribe to APPL-DB ROUTE_TABLE
+    & ASIC-DB ASIC_STATE, read them once and keep both route sets current from
+    the subscribe updates. Routes which stay diverged for longer than the grace
+    period are run through the same filters and reported. INTF_TABLE, FRR & SIDs
+    are checked every interval. Stats are served as JSON on a unix socket:
+        socat - UNIX-CONNECT:/var/run/route_check.sock
 
 
 """
 
 import argparse
+import contextlib
 from enum import Enum
+import heapq
 import ipaddress
 import json
 import os
@@ -44,13 +53,15 @@ import sys
 import syslog
 import time
 import signal
+import socket
+import socketserver
+import threading
 import traceback
-import subprocess
 import concurrent.futures
 
 from ipaddress import ip_network
 from swsscommon import swsscommon
-from utilities_common import chassis
+from utilities_common import chassis, frr_json
 from sonic_py_common import multi_asic, device_info
 from utilities_common.general import load_db_config
 
@@ -75,12 +86,17 @@ MIN_SCAN_INTERVAL = 10      # Every 10 seconds
 MAX_SCAN_INTERVAL = 3600    # An hour
 
 PRINT_MSG_LEN_MAX = 1000
+DEBUG_DUMP_MAX = 100        # Max entries of a table dumped in a debug message
 
 FRR_CHECK_RETRIES = 3
 FRR_WAIT_TIME = 15
 
 REDIS_TIMEOUT_MSECS = 0
 
+DAEMON_GRACE_SECS = 30          # Report routes diverged for longer than this
+DAEMON_CHECK_INTERVAL = 300     # INTF, FRR & SID check interval w/o -i
+DAEMON_STATS_SOCKET = '/var/run/route_check.sock'
+
 class Level(Enum):
     ERR = 'ERR'
     INFO = 'INFO'
@@ -122,6 +138,8 @@ def set_level(lvl, log_to_syslog):
 def print_message(lvl, *args, write_to_stdout=True):
     """
     print and log the message for given level.
+    Args are converted to string only if the level is enabled, so
+    expensive ones, as TableDump, cost nothing when not logged.
     :param lvl: Log level for this message as ERR/INFO/DEBUG
     :param args: message as list of strings or convertible to string
     :param write_to_stdout: print the message to stdout if set to true
@@ -143,6 +161,58 @@ def print_message(lvl, *args, write_to_stdout=True):
     return msg
 
 
+class TableDump(object):
+    """
+    Table entries to dump in a log message, formatted only when converted
+    to string. Only the first DEBUG_DUMP_MAX entries in sorted order are
+    dumped, along with the count of entries.
+    """
+
+    def __init__(self, name, entries, fmt=None, key=None):
+        """
+        :param name: table name to dump the entries under
+        :param entries: sized iterable of the entries, e.g. list, set or dict
+        :param fmt: optional function to convert a sorted entry to dump
+        :param key: optional function to sort the entries by
+        """
+        self.name = name
+        self.entries = entries
+        self.fmt = fmt
+        self.key = key
+
+    def __str__(self):
+        entries = heapq.nsmallest(DEBUG_DUMP_MAX, self.entries, key=self.key)
+        if self.fmt:
+            entries = [self.fmt(e) for e in entries]
+        dump = {self.name: entries}
+        if len(self.entries) > len(entries):
+            dump["count"] = len(self.entries)
+        return json.dumps(dump, indent=4)
+
+
+class Timings(dict):
+    """
+    Seconds taken by each phase of a check, formatted when converted to string.
+    """
+
+    def __str__(self):
+        return " ".join("{}={:.3f}s".format(phase, secs) for phase, secs in self.items())
+
+
+@contextlib.contextmanager
+def timed(timings, phase):
+    """
+    helper to time a phase of a check
+    :param timings: Timings to add the seconds taken by the phase to
+    :param phase: name of the phase
+    """
+    start = time.monotonic()
+    try:
+        yield
+    finally:
+        timings[phase] = timings.get(phase, 0) + time.monotonic() - start
+
+
 def add_prefix(ip):
     """
     helper add static prefix based on IP type
@@ -185,6 +255,92 @@ def is_default_route(ip):
     return t.is_unspecified and ip.split("/")[1] == "0"
 
 
+def parse_prefix(prefix):
+    """
+    helper to parse an IP prefix or IP w/o the overhead of ipaddress.
+    :param prefix: prefix as string; IP w/o prefix length is a host prefix
+    :return (address family as 4/6, prefix length, address as int)
+    :raise ValueError if not a valid prefix
+    """
+    ip, _, prefixlen = prefix.partition(PREFIX_SEPARATOR)
+    if ip.find(IPV6_SEPARATOR) == -1:
+        af, family, bits = 4, socket.AF_INET, 32
+    else:
+        af, family, bits = 6, socket.AF_INET6, 128
+    try:
+        addr = int.from_bytes(socket.inet_pton(family, ip), "big")
+    except OSError:
+        raise ValueError("Invalid IP prefix {}".format(prefix))
+    prefixlen = int(prefixlen) if prefixlen else bits
+    if not 0 <= prefixlen <= bits:
+        raise ValueError("Invalid IP prefix {}".format(prefix))
+    return af, prefixlen, addr
+
+
+def pack_prefix(prefix):
+    """
+    helper to pack a prefix as (af, prefixlen, network as int) tuple.
+    Packed prefixes hash, compare & sort without string handling, so
+    routes are kept & diffed as sets of them.
+    :param prefix: prefix as string
+    :return packed prefix
+    """
+    af, prefixlen, addr = parse_prefix(prefix)
+    host_bits = (32 if af == 4 else 128) - prefixlen
+    return af, prefixlen, addr >> host_bits << host_bits
+
+
+def pack_route(prefix):
+    """
+    helper to pack a route prefix, as pack_prefix, skipping link local.
+    :param prefix: prefix as string
+    :return packed prefix or None if link local
+    """
+    af, prefixlen, addr = parse_prefix(prefix)
+    if (af == 4 and addr >> 16 == 0xa9fe) or (af == 6 and addr >> 118 == 0x3fa):
+        # 169.254.0.0/16 or fe80::/10
+        return None
+    host_bits = (32 if af == 4 else 128) - prefixlen
+    return af, prefixlen, addr >> host_bits << host_bits
+
+
+def unpack_prefix(packed):
+    """
+    helper to get back the prefix string of a packed prefix.
+    :param packed: (af, prefixlen, int) as of pack_prefix
+    :return prefix as string
+    """
+    af, prefixlen, addr = packed
+    if af == 4:
+        return str(ipaddress.IPv4Network((addr, prefixlen)))
+    return str(ipaddress.IPv6Network((addr, prefixlen)))
+
+
+def pack_prefixes(prefixes):
+    """
+    helper to pack a list of prefixes into a set, skipping invalid ones.
+    :param prefixes: prefixes as strings
+    :return set of packed prefixes
+    """
+    packed = set()
+    for prefix in prefixes:
+        try:
+            packed.add(pack_prefix(prefix))
+        except ValueError:
+            continue
+    return packed
+
+
+def diff_prefix_sets(s1, s2):
+    """
+    helper to compare two sets of packed prefixes.
+    :param s1: set 1
+    :param s2: set 2
+    :return (<s1 prefixes not in s2>, <s2 prefixes not in s1>) as sorted prefix strings
+    """
+    return sorted(map(unpack_prefix, s1 - s2)), sorted(map(unpack_prefix, s2 - s1))
+
+
 def cmps(s1, s2):
     """
     helper to compare two strings
@@ -272,8 +428,8 @@ def get_subscribe_updates(selector, subs):
                 elif op == "DEL":
                     deletes.append(e)
 
-    print_message(syslog.LOG_DEBUG, "adds={}".format(adds))
-    print_message(syslog.LOG_DEBUG, "dels={}".format(deletes))
+    print_message(syslog.LOG_DEBUG, "adds=", TableDump("adds", adds))
+    print_message(syslog.LOG_DEBUG, "dels=", TableDump("dels", deletes))
     return (sorted(adds), sorted(deletes))
 
 
@@ -281,52 +437,72 @@ def is_vrf(k):
     return k.startswith("Vrf")
 
 
+def pack_appl_rt_entry(k):
+    """
+    helper to strip the VRF off an APPL-DB ROUTE_TABLE key and pack its prefix.
+    :param k: key to check as string
+    :return packed prefix or None for link local routes
+    """
+    if (is_vrf(k)):
+        k = k.split(":", 1)[1]
+    return pack_route(k)
+
+
+def pack_asic_rt_entry(k):
+    """
+    helper to filter out ASIC-DB route entry keys and pack their prefix.
+    :param k: key to check as string
+    :return packed prefix or None for other keys & link local routes
+    """
+    if k.startswith(ASIC_KEY_PREFIX):
+        return pack_route(k[len(ASIC_KEY_PREFIX) + len('{"dest":"'):].split("\"", 1)[0])
+    return None
+
+
 def get_appdb_routes(namespace):
     """
     helper to read route table from APPL-DB.
-    :return list of sorted routes with prefix ensured
+    :return set of packed routes
     """
     db = swsscommon.DBConnector(APPL_DB_NAME, REDIS_TIMEOUT_MSECS, True, namespace)
     print_message(syslog.LOG_DEBUG, "APPL DB connected for routes")
     tbl = swsscommon.Table(db, 'ROUTE_TABLE')
     keys = tbl.getKeys()
 
-    valid_rt = []
+    valid_rt = set()
     for k in keys:
-        if (is_vrf(k)):
-            k = k.split(":", 1)[1]
-
-        if not is_local(k):
-            valid_rt.append(add_prefix_ifnot(k.lower()))
+        e = pack_appl_rt_entry(k)
+        if e is not None:
+            valid_rt.add(e)
 
-    print_message(syslog.LOG_DEBUG, json.dumps({"ROUTE_TABLE": sorted(valid_rt)}, indent=4))
-    return sorted(valid_rt)
+    print_message(syslog.LOG_DEBUG, TableDump("ROUTE_TABLE", valid_rt, unpack_prefix))
+    return valid_rt
 
 
 def get_asicdb_routes(namespace):
     """
     helper to read present route entries from ASIC-DB and
     as well initiate selector for ASIC-DB:ASIC-state updates.
-    :return (selector,  subscriber, <list of sorted routes>)
+    :return (selector,  subscriber, <set of packed routes>)
     """
     db = swsscommon.DBConnector(ASIC_DB_NAME, REDIS_TIMEOUT_MSECS, True, namespace)
     subs = swsscommon.SubscriberStateTable(db, ASIC_TABLE_NAME)
-    print_message(syslog.LOG_DEBUG, "ASIC DB {} connected".format(namespace))
+    print_message(syslog.LOG_DEBUG, "ASIC DB ", namespace, " connected")
 
-    rt = []
+    rt = set()
     while True:
         k, _, _ = subs.pop()
         if not k:
             break
-        res, e = checkout_rt_entry(k)
-        if res:
-            rt.append(e)
+        e = pack_asic_rt_entry(k)
+        if e is not None:
+            rt.add(e)
 
-    print_message(syslog.LOG_DEBUG, json.dumps({"ASIC_ROUTE_ENTRY": sorted(rt)}, indent=4))
+    print_message(syslog.LOG_DEBUG, TableDump("ASIC_ROUTE_ENTRY", rt, unpack_prefix))
 
     selector = swsscommon.Select()
     selector.addSelectable(subs)
-    return (selector, subs, sorted(rt))
+    return (selector, subs, rt)
 
 
 def get_appdb_sids(namespace):
@@ -340,7 +516,7 @@ def get_appdb_sids(namespace):
     keys = tbl.getKeys()
 
     sids = sorted(keys)
-    print_message(syslog.LOG_DEBUG, json.dumps({"APPL_MY_SID_TABLE": sids}, indent=4))
+    print_message(syslog.LOG_DEBUG, TableDump("APPL_MY_SID_TABLE", sids))
     return sids
 
 
@@ -371,7 +547,7 @@ def get_asicdb_sids(namespace):
         sids.append(sid_entry)
 
     sids = sorted(sids)
-    print_message(syslog.LOG_DEBUG, json.dumps({"ASIC_MY_SID_TABLE": sids}, indent=4))
+    print_message(syslog.LOG_DEBUG, TableDump("ASIC_MY_SID_TABLE", sids))
     return sids
 
 
@@ -385,17 +561,27 @@ def is_suppress_fib_pending_enabled(namespace):
     return state == 'enabled'
 
 
-def fetch_routes(cmd):
+def fetch_routes(cmd, route_filter=None):
     """
     Fetch routes using the given command.
+    The output is parsed as it streams in and only the route entries for
+    which route_filter returns True are kept, as they were output, so a
+    full table is never held in memory.
+    :param route_filter: optional function of a route entry
+    :return dictionary of prefix -> list of route entries
     """
-    output = subprocess.check_output(cmd, text=True)
-    return json.loads(output)
+    routes = {}
+    for prefix, entries in frr_json.stream_command_routes(cmd):
+        for entry in entries:
+            if route_filter is None or route_filter(entry):
+                routes.setdefault(prefix, []).append(entry)
+    return routes
 
 
-def get_frr_routes_parallel(namespace):
+def get_frr_routes_parallel(namespace, route_filter=None):
     """
     Read routes from zebra through CLI command for IPv4 and IPv6 in parallel
+    :param route_filter: optional function of a route entry to keep it
     :return combined IPv4 and IPv6 routes dictionary.
     """
     if namespace == multi_asic.DEFAULT_NAMESPACE:
@@ -406,8 +592,8 @@ def get_frr_routes_parallel(namespace):
         v6_route_cmd = ['show', 'ipv6', 'route', '-n', namespace, 'json']
 
     with concurrent.futures.ThreadPoolExecutor() as executor:
-        future_v4 = executor.submit(fetch_routes, v4_route_cmd)
-        future_v6 = executor.submit(fetch_routes, v6_route_cmd)
+        future_v4 = executor.submit(fetch_routes, v4_route_cmd, route_filter)
+        future_v6 = executor.submit(fetch_routes, v6_route_cmd, route_filter)
 
         # Wait for both results to complete
         v4_routes = future_v4.result()
@@ -415,7 +601,8 @@ def get_frr_routes_parallel(namespace):
 
     # Combine both IPv4 and IPv6 routes
     v4_routes.update(v6_routes)
-    print_message(syslog.LOG_DEBUG, "FRR Routes: namespace={}, routes={}".format(namespace, v4_routes))
+    print_message(syslog.LOG_DEBUG, "FRR Routes: namespace=", namespace, ", routes=",
+                  TableDump("FRR", v4_routes.items(), key=lambda item: item[0]))
     return v4_routes
 
 
@@ -440,7 +627,7 @@ def get_interfaces(namespace):
         if not is_local(ip):
             intf.append(ip)
 
-    print_message(syslog.LOG_DEBUG, json.dumps({"APPL_DB_INTF": sorted(intf)}, indent=4))
+    print_message(syslog.LOG_DEBUG, TableDump("APPL_DB_INTF", intf))
     return sorted(intf)
 
 
@@ -482,7 +669,7 @@ def get_local_p2p_ips(namespace):
         if is_point_to_point_prefix(ip):
             intf.append(ip)
 
-    print_message(syslog.LOG_DEBUG, json.dumps({"APPL_DB_INTF": sorted(intf)}, indent=4))
+    print_message(syslog.LOG_DEBUG, TableDump("APPL_DB_INTF", intf))
     return sorted(intf)
 
 
@@ -602,10 +789,11 @@ def filter_out_vnet_routes(namespace, routes):
         vnet_route = vnet_route_attrs[1]
         vnet_routes.append(vnet_route)
 
+    vnet_routes = pack_prefixes(vnet_routes)
     updated_routes = []
 
     for route in routes:
-        if not (route in vnet_routes):
+        if not (pack_prefix(route) in vnet_routes):
             updated_routes.append(route)
 
     return updated_routes
@@ -640,15 +828,15 @@ def filter_out_standalone_tunnel_routes(namespace, routes):
     if not standalone_tunnel_route_ips:
         return routes
 
-    for route in routes:
-        ip, subnet = route.split('/')
-        ip_version = ipaddress.ip_address(ip).version
+    # IPs w/o prefix length pack as host routes, so only the host route
+    # of a standalone tunnel IP matches it
+    standalone_tunnel_routes = pack_prefixes(standalone_tunnel_route_ips)
 
+    for route in routes:
         # we want to keep the route if it is not a standalone tunnel route.
         # if the route subnet contains more than one address, it is not a
         # standalone tunnel route
-        if (ip not in standalone_tunnel_route_ips) or \
-           ((ip_version == 6 and subnet != '128') or (ip_version == 4 and subnet != '32')):
+        if pack_prefix(route) not in standalone_tunnel_routes:
             updated_routes.append(route)
 
     return updated_routes
@@ -666,6 +854,25 @@ def is_feature_bgp_enabled(namespace):
             bgp_enabled = True
     return bgp_enabled
 
+def is_frr_route_not_offloaded(entry):
+    """
+    Check if a FRR route entry is expected to be offloaded but is not.
+    """
+    if entry['protocol'] in ('connected', 'kernel', 'static'):
+        return False
+
+    # TODO: Also handle VRF routes. Currently this script does not check for VRF routes so it would be incorrect for us
+    # to assume they are installed in ASIC_DB, so we don't handle them.
+    if entry['vrfName'] != 'default':
+        return False
+
+    # skip if this bgp source prefix is not selected as best
+    if not entry.get('selected', False):
+        return False
+
+    return not entry.get('offloaded', False)
+
+
 def check_frr_pending_routes(namespace):
     """
     Check FRR routes for offload flag presence by executing "show ip route json"
@@ -676,30 +883,16 @@ def check_frr_pending_routes(namespace):
     retries = FRR_CHECK_RETRIES
     for i in range(retries):
         missed_rt = []
-        frr_routes = get_frr_routes_parallel(namespace)
+        frr_routes = get_frr_routes_parallel(namespace, is_frr_route_not_offloaded)
 
         for _, entries in frr_routes.items():
-            for entry in entries:
-                if entry['protocol'] in ('connected', 'kernel', 'static'):
-                    continue
-
-                # TODO: Also handle VRF routes. Currently this script does not check for VRF routes so it would be incorrect for us
-                # to assume they are installed in ASIC_DB, so we don't handle them.
-                if entry['vrfName'] != 'default':
-                    continue
-
-                # skip if this bgp source prefix is not selected as best
-                if not entry.get('selected', False):
-                    continue
-
-                if not entry.get('offloaded', False):
-                    missed_rt.append(entry)
+            missed_rt.extend(entries)
 
         if not missed_rt:
             break
 
         time.sleep(FRR_WAIT_TIME)
-    print_message(syslog.LOG_DEBUG, "FRR missed routes: {}".format(missed_rt, indent=4))
+    print_message(syslog.LOG_DEBUG, "FRR missed routes: ", TableDump("FRR", missed_rt, key=lambda e: e['prefix']))
     return missed_rt
 
 
@@ -717,7 +910,7 @@ def mitigate_installed_not_offloaded_frr_routes(namespace, missed_frr_rt, rt_app
     """
     db = swsscommon.DBConnector('APPL_STATE_DB', REDIS_TIMEOUT_MSECS, True, namespace)
     response_producer = swsscommon.NotificationProducer(db, f'{APPL_DB_NAME}_{swsscommon.APP_ROUTE_TABLE_NAME}_RESPONSE_CHANNEL')
-    for entry in [entry for entry in missed_frr_rt if entry['prefix'] in rt_appl]:
+    for entry in [entry for entry in missed_frr_rt if pack_prefix(entry['prefix']) in rt_appl]:
         fvs = swsscommon.FieldValuePairs([('err_str', 'SWSS_RC_SUCCESS'), ('protocol', entry['protocol'])])
         response_producer.send('SWSS_RC_SUCCESS', entry['prefix'], fvs)
 
@@ -753,14 +946,14 @@ def filter_out_soc_ip_routes(namespace, routes):
     if not is_dualtor(config_db):
         return routes
 
-    soc_ips = get_soc_ips(config_db)
+    soc_ips = pack_prefixes(get_soc_ips(config_db))
 
     if not soc_ips:
         return routes
 
     updated_routes = []
     for route in routes:
-        if route not in soc_ips:
+        if pack_prefix(route) not in soc_ips:
             updated_routes.append(route)
 
     return updated_routes
@@ -780,7 +973,7 @@ def get_vlan_neighbors(namespace):
             if device.startswith("Vlan"):
                 valid_neighs.append(add_prefix_ifnot(prefix.lower()))
 
-    print_message(syslog.LOG_DEBUG, "Vlan neighbors:",  json.dumps(valid_neighs, indent=4))
+    print_message(syslog.LOG_DEBUG, "Vlan neighbors:", TableDump("Vlan neighbors", valid_neighs))
     return valid_neighs
 
 
@@ -802,9 +995,41 @@ def filter_out_vlan_neigh_route_miss(namespace, rt_appl_miss, rt_asic_miss):
     if is_dualtor(config_db):
         vlan_neighs = set(get_vlan_neighbors(namespace))
         rt_appl_miss, ignored_rt_appl_miss = _filter_out_neigh_route(rt_appl_miss, vlan_neighs)
-        print_message(syslog.LOG_DEBUG, "Ignored appl route miss:",  json.dumps(ignored_rt_appl_miss, indent=4))
+        print_message(syslog.LOG_DEBUG, "Ignored appl route miss:", TableDump("appl", ignored_rt_appl_miss))
         rt_asic_miss, ignored_rt_asic_miss = _filter_out_neigh_route(rt_asic_miss, vlan_neighs)
-        print_message(syslog.LOG_DEBUG, "Ignored asic route miss:",  json.dumps(ignored_rt_asic_miss, indent=4))
+        print_message(syslog.LOG_DEBUG, "Ignored asic route miss:", TableDump("asic", ignored_rt_asic_miss))
+
+    return rt_appl_miss, rt_asic_miss
+
+
+def filter_out_expected_route_miss(namespace, intf_appl, rt_appl_miss, rt_asic_miss):
+    """
+    helper to drop the route misses which are expected between APPL-DB & ASIC-DB,
+    i.e. interface, default, VNET, tunnel & SOC routes only in ASIC-DB and
+    local interface & voq neighbor routes only in APPL-DB.
+    :param intf_appl: sorted APPL-DB INTF_TABLE IPs
+    :param rt_appl_miss: sorted routes in APPL-DB but not in ASIC-DB
+    :param rt_asic_miss: sorted routes in ASIC-DB but not in APPL-DB
+    :return (rt_appl_miss, rt_asic_miss) filtered
+    """
+    # Check missed ASIC routes against APPL-DB INTF_TABLE
+    intf_routes = pack_prefixes(intf_appl)
+    rt_asic_miss = [rt for rt in rt_asic_miss if pack_prefix(rt) not in intf_routes]
+    rt_asic_miss = filter_out_default_routes(rt_asic_miss)
+    rt_asic_miss = filter_out_vnet_routes(namespace, rt_asic_miss)
+    rt_asic_miss = filter_out_standalone_tunnel_routes(namespace, rt_asic_miss)
+    rt_asic_miss = filter_out_soc_ip_routes(namespace, rt_asic_miss)
+
+    if rt_appl_miss:
+        rt_appl_miss = filter_out_local_interfaces(namespace, rt_appl_miss)
+
+    if rt_appl_miss:
+        rt_appl_miss = filter_out_voq_neigh_routes(namespace, rt_appl_miss)
+
+    # NOTE: On dualtor environment, ignore any route miss for the
+    # neighbors learned from the vlan subnet.
+    if rt_appl_miss or rt_asic_miss:
+        rt_appl_miss, rt_asic_miss = filter_out_vlan_neigh_route_miss(namespace, rt_appl_miss, rt_asic_miss)
 
     return rt_appl_miss, rt_asic_miss
 
@@ -837,49 +1062,42 @@ def check_routes_for_namespace(namespace):
     rt_appl_miss = []
     rt_asic_miss = []
     rt_frr_miss = []
+    timings = Timings()
 
-    selector, subs, rt_asic = get_asicdb_routes(namespace)
+    with timed(timings, "asic_db"):
+        selector, subs, rt_asic = get_asicdb_routes(namespace)
 
-    rt_appl = get_appdb_routes(namespace)
-    intf_appl = get_interfaces(namespace)
+    with timed(timings, "appl_db"):
+        rt_appl = get_appdb_routes(namespace)
+        intf_appl = get_interfaces(namespace)
 
-    # Diff APPL-DB routes & ASIC-DB routes
-    rt_appl_miss, rt_asic_miss = diff_sorted_lists(rt_appl, rt_asic)
+    with timed(timings, "diff"):
+        # Diff APPL-DB routes & ASIC-DB routes
+        rt_appl_miss, rt_asic_miss = diff_prefix_sets(rt_appl, rt_asic)
 
-    # Check missed ASIC routes against APPL-DB INTF_TABLE
-    _, rt_asic_miss = diff_sorted_lists(intf_appl, rt_asic_miss)
-    rt_asic_miss = filter_out_default_routes(rt_asic_miss)
-    rt_asic_miss = filter_out_vnet_routes(namespace, rt_asic_miss)
-    rt_asic_miss = filter_out_standalone_tunnel_routes(namespace, rt_asic_miss)
-    rt_asic_miss = filter_out_soc_ip_routes(namespace, rt_asic_miss)
+        # Check APPL-DB INTF_TABLE with ASIC table route entries
+        intf_appl_miss = [ip for ip in intf_appl if pack_prefix(ip) not in rt_asic]
 
-    # Check APPL-DB INTF_TABLE with ASIC table route entries
-    intf_appl_miss, _ = diff_sorted_lists(intf_appl, rt_asic)
-
-    if rt_appl_miss:
-        rt_appl_miss = filter_out_local_interfaces(namespace, rt_appl_miss)
-
-    if rt_appl_miss:
-        rt_appl_miss = filter_out_voq_neigh_routes(namespace, rt_appl_miss)
-
-    # NOTE: On dualtor environment, ignore any route miss for the
-    # neighbors learned from the vlan subnet.
-    if rt_appl_miss or rt_asic_miss:
-        rt_appl_miss, rt_asic_miss = filter_out_vlan_neigh_route_miss(namespace, rt_appl_miss, rt_asic_miss)
+    with timed(timings, "filter"):
+        rt_appl_miss, rt_asic_miss = filter_out_expected_route_miss(namespace, intf_appl, rt_appl_miss, rt_asic_miss)
 
     if rt_appl_miss or rt_asic_miss:
         # Look for subscribe updates for a second
-        adds, deletes = get_subscribe_updates(selector, subs)
+        with timed(timings, "subscribe"):
+            adds, deletes = get_subscribe_updates(selector, subs)
 
     # Drop all those for which SET received
-    rt_appl_miss, _ = diff_sorted_lists(rt_appl_miss, adds)
+    adds_packed = pack_prefixes(adds)
+    rt_appl_miss = [rt for rt in rt_appl_miss if pack_prefix(rt) not in adds_packed]
 
     # Drop all those for which DEL received
-    rt_asic_miss, _ = diff_sorted_lists(rt_asic_miss, deletes)
+    deletes_packed = pack_prefixes(deletes)
+    rt_asic_miss = [rt for rt in rt_asic_miss if pack_prefix(rt) not in deletes_packed]
 
     # Filter local p2p IPs if any that are reported as missing in APPL_DB
     if rt_appl_miss:
-        rt_appl_miss = filter_out_local_p2p_ips(namespace, rt_appl_miss)
+        with timed(timings, "filter"):
+            rt_appl_miss = filter_out_local_p2p_ips(namespace, rt_appl_miss)
 
     if rt_appl_miss:
         results["missed_ROUTE_TABLE_routes"] = rt_appl_miss
@@ -890,7 +1108,11 @@ def check_routes_for_namespace(namespace):
     if rt_asic_miss:
         results["Unaccounted_ROUTE_ENTRY_TABLE_entries"] = rt_asic_miss
 
-    rt_frr_miss = check_frr_pending_routes(namespace)
+    with timed(timings, "frr"):
+        rt_frr_miss = check_frr_pending_routes(namespace)
+
+    print_message(syslog.LOG_INFO, "Route check timings for namespace '", namespace, "': ",
+                  timings, " routes: appl=", len(rt_appl), " asic=", len(rt_asic))
 
     if rt_frr_miss:
         results["missed_FRR_routes"] = rt_frr_miss
@@ -1016,11 +1238,311 @@ def check_sids(namespace):
         return 0, None
 
 
+class RouteSet(object):
+    """
+    Routes of a DB table kept current from SET/DEL of its keys.
+    Routes are packed prefixes. Several keys may map to the same route, e.g. the
+    same prefix in different VRFs of APPL-DB, so a route stays present until the
+    last of its keys is deleted.
+    """
+
+    def __init__(self):
+        self.keys = {}
+        self.refs = {}
+
+    def __len__(self):
+        return len(self.refs)
+
+    def __contains__(self, route):
+        return route in self.refs
+
+    def __iter__(self):
+        return iter(self.refs)
+
+    def add(self, key, route):
+        if key in self.keys:
+            return
+        self.keys[key] = route
+        self.refs[route] = self.refs.get(route, 0) + 1
+
+    def remove(self, key):
+        """
+        :return the route of the key, None if key is unknown
+        """
+        route = self.keys.pop(key, None)
+        if route is not None:
+            self.refs[route] -= 1
+            if not self.refs[route]:
+                del self.refs[route]
+        return route
+
+
+class RouteTracker(object):
+    """
+    Tracks the routes of one namespace for the daemon mode.
+    After one full sync, the APPL-DB & ASIC-DB routes are kept current from
+    subscribe updates, along with the routes on which they diverge and since when.
+    """
+
+    def __init__(self, namespace):
+        self.namespace = namespace
+        self.appl_subs = None
+        self.asic_subs = None
+        self.rt_appl = RouteSet()
+        self.rt_asic = RouteSet()
+        self.diverged = {}
+        self.expired = None
+        self.intf_appl = []
+        self.results = {}
+        self.updates = 0
+        self.timings = Timings()
+        self.last_sync = None
+        self.last_check = None
+
+    def sync(self):
+        """
+        Subscribes to APPL-DB ROUTE_TABLE & ASIC-DB ASIC_STATE. A subscriber
+        pops the existing entries first, so draining both is the full sync.
+        :return the subscribers to select on
+        """
+        appl_db = swsscommon.DBConnector(APPL_DB_NAME, REDIS_TIMEOUT_MSECS, True, self.namespace)
+        self.appl_subs = swsscommon.SubscriberStateTable(appl_db, 'ROUTE_TABLE')
+        asic_db = swsscommon.DBConnector(ASIC_DB_NAME, REDIS_TIMEOUT_MSECS, True, self.namespace)
+        self.asic_subs = swsscommon.SubscriberStateTable(asic_db, ASIC_TABLE_NAME)
+
+        self.rt_appl = RouteSet()
+        self.rt_asic = RouteSet()
+        self.diverged = {}
+        self.expired = None
+        self.timings = Timings()
+        self.last_sync = time.time()
+        with timed(self.timings, "sync"):
+            self.process_updates(self.last_sync)
+
+        print_message(syslog.LOG_INFO, "Synced routes for namespace '", self.namespace, "': APPL-DB=",
+                      len(self.rt_appl), " ASIC-DB=", len(self.rt_asic), " ", self.timings)
+        return [self.appl_subs, self.asic_subs]
+
+    def _update_divergence(self, route, now):
+        if (route in self.rt_appl) != (route in self.rt_asic):
+            self.diverged.setdefault(route, now)
+        else:
+            self.diverged.pop(route, None)
+
+    def _pop_updates(self, subs, rt_set, pack, now):
+        cnt = 0
+        while True:
+            key, op, _ = subs.pop()
+            if not key:
+                break
+            cnt += 1
+            if op == "SET":
+                e = pack(key)
+                if e is None:
+                    continue
+                rt_set.add(key, e)
+            elif op == "DEL":
+                e = rt_set.remove(key)
+                if e is None:
+                    continue
+            else:
+                continue
+            self._update_divergence(e, now)
+        return cnt
+
+    def process_updates(self, now):
+        """
+        Applies the pending subscribe updates of both DBs.
+        :return count of updates popped
+        """
+        cnt = self._pop_updates(self.appl_subs, self.rt_appl, pack_appl_rt_entry, now)
+        cnt += self._pop_updates(self.asic_subs, self.rt_asic, pack_asic_rt_entry, now)
+        return cnt
+
+    def check(self, now, grace, full=False):
+        """
+        Runs the routes diverged for at least grace seconds through the filters
+        of check_routes_for_namespace. With full set, INTF_TABLE & FRR routes
+        are checked too, else their results of the last full check are kept.
+        :return results as of check_routes_for_namespace
+        """
+        expired = sorted(rt for rt, since in self.diverged.items() if now - since >= grace)
+        if not full and expired == self.expired:
+            return self.results
+
+        results = {}
+        timings = Timings()
+        if full:
+            with timed(timings, "intf"):
+                self.intf_appl = get_interfaces(self.namespace)
+        else:
+            for k in ("missed_INTF_TABLE_entries", "missed_FRR_routes"):
+                if k in self.results:
+                    results[k] = self.results[k]
+
+        rt_appl_miss = sorted(unpack_prefix(rt) for rt in expired if rt in self.rt_appl)
+        rt_asic_miss = sorted(unpack_prefix(rt) for rt in expired if rt in self.rt_asic)
+
+        with timed(timings, "filter"):
+            if rt_appl_miss or rt_asic_miss:
+                rt_appl_miss, rt_asic_miss = filter_out_expected_route_miss(
+                    self.namespace, self.intf_appl, rt_appl_miss, rt_asic_miss)
+
+            if rt_appl_miss:
+                rt_appl_miss = filter_out_local_p2p_ips(self.namespace, rt_appl_miss)
+
+        if rt_appl_miss:
+            results["missed_ROUTE_TABLE_routes"] = rt_appl_miss
+
+        if rt_asic_miss:
+            results["Unaccounted_ROUTE_ENTRY_TABLE_entries"] = rt_asic_miss
+
+        if full:
+            intf_appl_miss = [ip for ip in self.intf_appl if pack_prefix(ip) not in self.rt_asic]
+            if intf_appl_miss:
+                results["missed_INTF_TABLE_entries"] = intf_appl_miss
+
+            with timed(timings, "frr"):
+                rt_frr_miss = check_frr_pending_routes(self.namespace)
+            if rt_frr_miss:
+                results["missed_FRR_routes"] = rt_frr_miss
+                if not rt_appl_miss and not rt_asic_miss:
+                    print_message(syslog.LOG_ERR, "Some routes are not set offloaded in FRR{} \
+                                  but all routes in APPL_DB and ASIC_DB are in sync".format(self.namespace))
+                    if is_suppress_fib_pending_enabled(self.namespace):
+                        mitigate_installed_not_offloaded_frr_routes(self.namespace, rt_frr_miss, self.rt_appl)
+
+        print_message(syslog.LOG_INFO, "Route check timings for namespace '", self.namespace, "': ", timings)
+        self.timings.update(timings)
+        self.expired = expired
+        self.results = results
+        self.last_check = now
+        return results
+
+    def get_stats(self):
+        return {
+            "appl_routes": len(self.rt_appl),
+            "asic_routes": len(self.rt_asic),
+            "diverged_routes": len(self.diverged),
+            "reported_routes": len(self.results.get("missed_ROUTE_TABLE_routes", [])) +
+                               len(self.results.get("Unaccounted_ROUTE_ENTRY_TABLE_entries", [])),
+            "updates": self.updates,
+            "timings": {phase: round(secs, 3) for phase, secs in self.timings.items()},
+            "last_sync": self.last_sync,
+            "last_check": self.last_check
+        }
+
+
+class StatsRequestHandler(socketserver.StreamRequestHandler):
+    """
+    Writes the daemon stats as JSON to the connected client.
+    """
+
+    def handle(self):
+        self.wfile.write((json.dumps(self.server.get_stats(), indent=4) + "\n").encode())
+
+
+def start_stats_server(path, get_stats):
+    """
+    Serves the stats returned by get_stats on the unix socket path from a background thread.
+    :return the server, to shutdown
+    """
+    if os.path.exists(path):
+        os.unlink(path)
+    server = socketserver.ThreadingUnixStreamServer(path, StatsRequestHandler)
+    server.daemon_threads = True
+    server.get_stats = get_stats
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_daemon(namespace, interval, grace, stats_socket):
+    """
+    Daemon mode: syncs the routes of each namespace once and keeps them current
+    from subscribe updates, reporting the routes diverged for longer than grace
+    seconds. INTF_TABLE, FRR routes & SIDs are checked every interval seconds.
+    Results are reported when they change.
+    :return Same as check_routes, in unit testing after the first check.
+    """
+    namespace_list = []
+    if namespace is not multi_asic.DEFAULT_NAMESPACE and namespace in multi_asic.get_namespace_list():
+        namespace_list.append(namespace)
+    else:
+        namespace_list = multi_asic.get_namespace_list()
+        print_message(syslog.LOG_INFO, "Tracking routes for namespaces: ", namespace_list)
+
+    start = time.time()
+    trackers = [RouteTracker(ns) for ns in namespace_list]
+    selector = swsscommon.Select()
+    for tracker in trackers:
+        for subs in tracker.sync():
+            selector.addSelectable(subs)
+
+    def get_stats():
+        return {
+            "uptime": int(time.time() - start),
+            "namespaces": {tracker.namespace: tracker.get_stats() for tracker in trackers}
+        }
+
+    server = start_stats_server(stats_socket, get_stats) if stats_socket else None
+
+    reported = {}
+    res_sids = None
+    next_check = 0
+    try:
+        while True:
+            selector.select(SUBSCRIBE_WAIT_SECS * 1000)
+            now = time.time()
+            full = now >= next_check
+
+            results = {}
+            failed = False
+            for tracker in trackers:
+                try:
+                    tracker.updates += tracker.process_updates(now)
+                    result = tracker.check(now, grace, full)
+                except Exception as e:
+                    print_message(syslog.LOG_ERR, "Error processing namespace {}: {}".format(tracker.namespace, e))
+                    failed = True
+                    continue
+                if result:
+                    results[tracker.namespace] = result
+
+            if full:
+                ret_sids, res_sids = check_sids(namespace)
+                failed = failed or ret_sids < 0
+                next_check = now + interval
+
+            ret = -1 if (failed or results or res_sids) else 0
+            if results or res_sids is not None:
+                res = dict(results)
+                res.update(res_sids if res_sids else {})
+            else:
+                res = None
+
+            if res != reported:
+                if results:
+                    print_message(syslog.LOG_WARNING, "Failure results: {", json.dumps(results, indent=4), "}")
+                    print_message(syslog.LOG_WARNING, "Failed. Look at reported mismatches above")
+                else:
+                    print_message(syslog.LOG_INFO, "All good!")
+                reported = res
+
+            if UNIT_TESTING:
+                return ret, res
+    finally:
+        if server:
+            server.shutdown()
+            server.server_close()
+            os.unlink(stats_socket)
+
+
 def main():
     """
     main entry point, which mainly parses the args and call check_routes
     In case of single run, it returns on one call or stays in forever loop
-    with given interval in-between calls to check_route
+    with given interval in-between calls to check_route, or with -d runs
+    the daemon mode
     :return Same return value as returned by check_route.
     """
     interval = 0
@@ -1029,6 +1551,12 @@ def main():
     parser.add_argument("-i", "--interval", type=int, default=0, help="Scan interval in seconds")
     parser.add_argument("-s", "--log_to_syslog", action="store_true", default=True, help="Write message to syslog")
     parser.add_argument('-n','--namespace',   default=multi_asic.DEFAULT_NAMESPACE, help='Verify routes for this specific namespace')
+    parser.add_argument("-d", "--daemon", action="store_true", default=False,
+                        help="Keep running, tracking route updates")
+    parser.add_argument("-g", "--grace", type=int, default=DAEMON_GRACE_SECS,
+                        help="Seconds a route may diverge in daemon mode")
+    parser.add_argument("--stats-socket", default=DAEMON_STATS_SOCKET,
+                        help="Unix socket for daemon stats; empty to disable")
     args = parser.parse_args()
 
     namespace = args.namespace
@@ -1059,6 +1587,9 @@ def main():
         print_message(syslog.LOG_INFO, "BGP feature is disabled, exiting without checking routes!!")
         return 0, None
 
+    if args.daemon:
+        return run_daemon(namespace, interval if interval else DAEMON_CHECK_INTERVAL, args.grace, args.stats_socket)
+
     while True:
         signal.alarm(TIMEOUT_SECONDS)
         ret1, res1 = check_routes(namespace)
@@ -0,0 +1,85 @@
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from unittest import mock
+
+import pytest
+
+from utilities_common import config_db_saver
+from .config_db_writer_test import MockConfigDB
+
+
+CONFIG_DB = {
+    "PORT|Ethernet10": {"mtu": "9100", "admin_status": "up"},
+    "PORT|Ethernet2": {"mtu": "9100"},
+    "ACL_TABLE|DATAACL": {"ports@": "Ethernet0,Ethernet4", "type": "L3"},
+    "VLAN_MEMBER|Vlan1000|Ethernet8": {"NULL": "NULL"},
+    "CONFIG_DB_INITIALIZED": {"1": "1"},
+}
+
+CONFIG = OrderedDict([
+    ("ACL_TABLE", {"DATAACL": {"ports": ["Ethernet0", "Ethernet4"], "type": "L3"}}),
+    ("PORT", OrderedDict([("Ethernet2", {"mtu": "9100"}),
+                          ("Ethernet10", OrderedDict([("admin_status", "up"), ("mtu", "9100")]))])),
+    ("VLAN_MEMBER", {"Vlan1000|Ethernet8": {}}),
+])
+
+
+class TestConfigDBSaver(object):
+    def test_iter_config_tables__naturally_sorted(self):
+        tables = list(config_db_saver.iter_config_tables(MockConfigDB(CONFIG_DB), batch_size=2))
+
+        assert tables == list(CONFIG.items())
+        assert list(tables[1][1]) == ["Ethernet2", "Ethernet10"]
+        assert list(tables[1][1]["Ethernet10"]) == ["admin_status", "mtu"]
+
+    @pytest.mark.parametrize("config", [CONFIG, OrderedDict()])
+    def test_dump_config_tables__same_as_json_dump(self, config):
+        stream = io.StringIO()
+
+        count = config_db_saver.dump_config_tables(iter(config.items()), stream)
+
+        assert stream.getvalue() == json.dumps(config, indent=4)
+        assert count == sum(len(entries) for entries in config.values())
+
+    def test_save_config(self, tmp_path):
+        filename = str(tmp_path / "config_db.json")
+        with open(filename, "w") as f:
+            f.write("{}")
+        os.chmod(filename, 0o600)
+
+        assert config_db_saver.save_config(MockConfigDB(CONFIG_DB), filename) == 4
+
+        with open(filename) as f:
+            assert f.read() == json.dumps(CONFIG, indent=4)
+        assert os.stat(filename).st_mode & 0o777 == 0o600
+        assert os.listdir(str(tmp_path)) == ["config_db.json"]
+
+    def test_save_config__failed_save_keeps_file(self, tmp_path):
+        filename = str(tmp_path / "config_db.json")
+        with open(filename, "w") as f:
+            f.write("{}")
+
+        with mock.patch("utilities_common.config_db_saver.dump_config_tables", side_effect=IOError), \
+                pytest.raises(IOError):
+            config_db_saver.save_config(MockConfigDB(CONFIG_DB), filename)
+
+        with open(filename) as f:
+            assert f.read() == "{}"
+        assert os.listdir(str(tmp_path)) == ["config_db.json"]
+
+    def test_save_config__not_a_regular_file__written_directly(self, tmp_path):
+        # A pipe, as /dev/stdout is when the output of config save is piped
+        filename = str(tmp_path / "stdout")
+        os.mkfifo(filename)
+        output = []
+        reader = threading.Thread(target=lambda: output.append(open(filename).read()), daemon=True)
+        reader.start()
+
+        assert config_db_saver.save_config(MockConfigDB(CONFIG_DB), filename) == 4
+
+        reader.join(timeout=5)
+        assert output == [json.dumps(CONFIG, indent=4)]
+        assert os.listdir(str(tmp_path)) == ["stdout"]
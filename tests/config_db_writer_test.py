@@ -0,0 +1,133 @@
+import fnmatch
+
+from utilities_common import config_db_writer
+
+
+class MockPipeline(object):
+    def __init__(self, client, transaction):
+        self.client = client
+        self.transaction = transaction
+        self.commands = []
+
+    def __getattr__(self, name):
+        return lambda *args: self.commands.append((name, args))
+
+    def execute(self):
+        # Only the writes, which are sent in MULTI batches, are recorded
+        if self.transaction:
+            self.client.executed.append([name for name, _ in self.commands])
+        return [getattr(self.client, name)(*args) for name, args in self.commands]
+
+
+class MockConfigDB(object):
+    def __init__(self, data=None):
+        self.data = dict(data or {})
+        self.executed = []
+
+    def pipeline(self, transaction=True):
+        return MockPipeline(self, transaction)
+
+    def scan(self, cursor, pattern, count):
+        return 0, [key for key in self.data if fnmatch.fnmatchcase(key, pattern)]
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def hmset(self, key, fields):
+        self.data.setdefault(key, {}).update(fields)
+
+    def delete(self, key):
+        self.data.pop(key, None)
+
+
+CONFIG = {
+    "DEVICE_METADATA": {"localhost": {"hostname": "sonic", "mtu": 9100}},
+    "ACL_TABLE": {"DATAACL": {"ports": ["Ethernet0", "Ethernet4"], "type": "L3"}},
+    "VLAN_MEMBER": {"Vlan1000|Ethernet8": {}},
+    "lowercase": {"key": {"field": "value"}},
+}
+
+CONFIG_ENTRIES = {
+    "DEVICE_METADATA|localhost": {"hostname": "sonic", "mtu": "9100"},
+    "ACL_TABLE|DATAACL": {"ports@": "Ethernet0,Ethernet4", "type": "L3"},
+    "VLAN_MEMBER|Vlan1000|Ethernet8": {"NULL": "NULL"},
+}
+
+
+class TestConfigDBWriter(object):
+    def test_merge_config(self):
+        config = config_db_writer.merge_config({}, {"CRM": {"Config": {"a": "1", "b": "2"}}})
+        config_db_writer.merge_config(config, {"CRM": {"Config": {"b": "3"}}, "PORT": {"Ethernet0": {}}})
+
+        assert config == {"CRM": {"Config": {"a": "1", "b": "3"}}, "PORT": {"Ethernet0": {}}}
+
+    def test_get_config_entries__serialized_as_config_db(self):
+        assert config_db_writer.get_config_entries(CONFIG) == CONFIG_ENTRIES
+
+    def test_get_config_entries__table_upper_cased(self):
+        config = {"Vlan": {"Vlan1000": {"vlanid": 1000}}}
+
+        assert config_db_writer.get_config_entries(config) == {"VLAN|Vlan1000": {"vlanid": "1000"}}
+
+    def test_load_config__null_table_deleted(self):
+        client = MockConfigDB({
+            "PORT|Ethernet0": {"mtu": "9100"},
+            "PORT|Ethernet4": {"mtu": "9100"},
+            "PORTCHANNEL|PortChannel01": {"mtu": "9100"},
+        })
+
+        written, removed = config_db_writer.load_config(client, dict(CONFIG, PORT=None))
+
+        assert (written, removed) == (3, 2)
+        assert client.data == dict(CONFIG_ENTRIES, **{"PORTCHANNEL|PortChannel01": {"mtu": "9100"}})
+
+    def test_load_config__diff_merge_null_table_deleted(self):
+        client = MockConfigDB(dict(CONFIG_ENTRIES, **{"PORT|Ethernet0": {"mtu": "9100"}}))
+
+        written, removed = config_db_writer.load_config(client, dict(CONFIG, PORT=None), diff=True, merge=True)
+
+        assert (written, removed) == (0, 1)
+        assert client.data == CONFIG_ENTRIES
+
+    def test_load_config__batches(self):
+        client = MockConfigDB()
+
+        written, removed = config_db_writer.load_config(client, CONFIG, batch_size=2)
+
+        assert (written, removed) == (3, 0)
+        assert client.data == CONFIG_ENTRIES
+        assert [len(commands) for commands in client.executed] == [2, 1]
+
+    def test_load_config__diff_unchanged_config_not_written(self):
+        client = MockConfigDB(dict(CONFIG_ENTRIES, CONFIG_DB_INITIALIZED={"1": "1"}))
+
+        assert config_db_writer.load_config(client, CONFIG, diff=True) == (0, 0)
+        assert client.executed == []
+
+    def test_load_config__diff_same_content_as_flush(self):
+        client = MockConfigDB({
+            "DEVICE_METADATA|localhost": {"hostname": "old", "type": "ToRRouter"},
+            "ACL_TABLE|DATAACL": CONFIG_ENTRIES["ACL_TABLE|DATAACL"],
+            "PORT|Ethernet0": {"mtu": "9100"},
+            "CONFIG_DB_INITIALIZED": {"1": "1"},
+        })
+
+        written, removed = config_db_writer.load_config(client, CONFIG, diff=True)
+
+        assert (written, removed) == (2, 1)
+        assert client.data == dict(CONFIG_ENTRIES, CONFIG_DB_INITIALIZED={"1": "1"})
+        # The fields of a changed entry are replaced in the same MULTI batch
+        assert client.executed == [["delete", "delete", "hmset", "delete", "hmset"]]
+
+    def test_load_config__diff_merge(self):
+        client = MockConfigDB({
+            "DEVICE_METADATA|localhost": {"hostname": "sonic", "mtu": "9100", "type": "ToRRouter"},
+            "PORT|Ethernet0": {"mtu": "9100"},
+        })
+
+        written, removed = config_db_writer.load_config(client, CONFIG, diff=True, merge=True)
+
+        assert (written, removed) == (2, 0)
+        assert client.data["DEVICE_METADATA|localhost"]["type"] == "ToRRouter"
+        assert "PORT|Ethernet0" in client.data
+        assert client.executed == [["hmset", "hmset"]]
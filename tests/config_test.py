@@ -25,6 +25,7 @@ from utilities_common.general import load_module_from_source
 from mock import call, patch, mock_open, MagicMock
 
 from generic_config_updater.generic_updater import ConfigFormat
+from generic_config_updater.patch_sorter import Algorithm
 
 import config.main as config
 import config.validated_config_db_connector as validated_config_db_connector
@@ -166,7 +167,7 @@ Exit: 4. Command: kill 104 failed.
 RELOAD_CONFIG_DB_OUTPUT = """\
 Acquired lock on {0}
 Stopping SONiC target ...
-Running command: /usr/local/bin/sonic-cfggen -j /tmp/config.json --write-to-db
+Loaded /tmp/config.json into CONFIG_DB (written: 1, removed: 0)
 Restarting SONiC target ...
 Reloading Monit configuration ...
 Released lock on {0}
@@ -179,7 +180,7 @@ Failed to acquire lock on {0}
 RELOAD_CONFIG_DB_BYPASS_LOCK_OUTPUT = """\
 Bypass lock on {0}
 Stopping SONiC target ...
-Running command: /usr/local/bin/sonic-cfggen -j /tmp/config.json --write-to-db
+Loaded /tmp/config.json into CONFIG_DB (written: 1, removed: 0)
 Restarting SONiC target ...
 Reloading Monit configuration ...
 """
@@ -196,9 +197,9 @@ Released lock on {0}
 RELOAD_MASIC_CONFIG_DB_OUTPUT = """\
 Acquired lock on {0}
 Stopping SONiC target ...
-Running command: /usr/local/bin/sonic-cfggen -j /tmp/config.json --write-to-db
-Running command: /usr/local/bin/sonic-cfggen -j /tmp/config0.json -n asic0 --write-to-db
-Running command: /usr/local/bin/sonic-cfggen -j /tmp/config1.json -n asic1 --write-to-db
+Loaded /tmp/config.json into CONFIG_DB (written: 1, removed: 0)
+Loaded /tmp/config0.json into CONFIG_DB of asic0 (written: 1, removed: 0)
+Loaded /tmp/config1.json into CONFIG_DB of asic1 (written: 1, removed: 0)
 Restarting SONiC target ...
 Reloading Monit configuration ...
 Released lock on {0}
@@ -211,7 +212,7 @@ Running command: /usr/local/bin/sonic-cfggen -H -k Seastone-DX010-25-50 --write-
 reload_config_with_disabled_service_output="""\
 Acquired lock on {0}
 Stopping SONiC target ...
-Running command: /usr/local/bin/sonic-cfggen -j /tmp/config.json --write-to-db
+Loaded /tmp/config.json into CONFIG_DB (written: 1, removed: 0)
 Restarting SONiC target ...
 Reloading Monit configuration ...
 Released lock on {0}
@@ -220,6 +221,9 @@ Released lock on {0}
 reload_config_masic_onefile_output = """\
 Acquired lock on {0}
 Stopping SONiC target ...
+Loaded all_config_db.json into CONFIG_DB (written: 1, removed: 0)
+Loaded all_config_db.json into CONFIG_DB of asic0 (written: 1, removed: 0)
+Loaded all_config_db.json into CONFIG_DB of asic1 (written: 1, removed: 0)
 Restarting SONiC target ...
 Reloading Monit configuration ...
 Released lock on {0}
@@ -229,31 +233,34 @@ reload_config_masic_onefile_gen_sysinfo_output = """\
 Acquired lock on {0}
 Stopping SONiC target ...
 Running command: /usr/local/bin/sonic-cfggen -H -k Mellanox-SN3800-D112C8 --write-to-db
+Loaded all_config_db.json into CONFIG_DB (written: 1, removed: 0)
 Running command: /usr/local/bin/sonic-cfggen -H -k multi_asic -n asic0 --write-to-db
+Loaded all_config_db.json into CONFIG_DB of asic0 (written: 1, removed: 0)
 Running command: /usr/local/bin/sonic-cfggen -H -k multi_asic -n asic1 --write-to-db
+Loaded all_config_db.json into CONFIG_DB of asic1 (written: 1, removed: 0)
 Restarting SONiC target ...
 Reloading Monit configuration ...
 Released lock on {0}
 """
 
 save_config_output = """\
-Running command: /usr/local/bin/sonic-cfggen -d --print-data > /etc/sonic/config_db.json
+Saved CONFIG_DB to /etc/sonic/config_db.json
 """
 
 save_config_filename_output = """\
-Running command: /usr/local/bin/sonic-cfggen -d --print-data > /tmp/config_db.json
+Saved CONFIG_DB to /tmp/config_db.json
 """
 
 save_config_masic_output = """\
-Running command: /usr/local/bin/sonic-cfggen -d --print-data > /etc/sonic/config_db.json
-Running command: /usr/local/bin/sonic-cfggen -n asic0 -d --print-data > /etc/sonic/config_db0.json
-Running command: /usr/local/bin/sonic-cfggen -n asic1 -d --print-data > /etc/sonic/config_db1.json
+Saved CONFIG_DB to /etc/sonic/config_db.json
+Saved CONFIG_DB of asic0 to /etc/sonic/config_db0.json
+Saved CONFIG_DB of asic1 to /etc/sonic/config_db1.json
 """
 
 save_config_filename_masic_output = """\
-Running command: /usr/local/bin/sonic-cfggen -d --print-data > config_db.json
-Running command: /usr/local/bin/sonic-cfggen -n asic0 -d --print-data > config_db0.json
-Running command: /usr/local/bin/sonic-cfggen -n asic1 -d --print-data > config_db1.json
+Saved CONFIG_DB to config_db.json
+Saved CONFIG_DB of asic0 to config_db0.json
+Saved CONFIG_DB of asic1 to config_db1.json
 """
 
 save_config_onefile_masic_output = """\
@@ -408,6 +415,56 @@ class TestHelper(object):
         mock_subprocess.assert_called_with(['/usr/local/bin/sonic-cfggen', '-m', '-v', 'DEVICE_METADATA.localhost.type'], text=True, stdout=-1)
         assert device_type == "Unknown"
 
+    def test_run_namespace_tasks(self):
+        def run_command(command, return_cmd=False):
+            assert return_cmd
+            return command[-1] + ' done\n', 1 if command[0] == 'fail' else 0
+
+        def load_namespace(load):
+            load.run_command(['load', load.name])
+            if load.namespace == 'asic0':
+                load.run_command(['fail', load.name])
+
+        loads = [config.NamespaceTask(ns) for ns in [config.DEFAULT_NAMESPACE, 'asic0', 'asic1']]
+        with mock.patch('utilities_common.cli.run_command', mock.MagicMock(side_effect=run_command)), \
+                mock.patch('config.main.click.echo') as mock_echo, \
+                mock.patch('config.main.log.log_notice') as mock_log_notice, \
+                pytest.raises(SystemExit) as e:
+            config.run_namespace_tasks('reload', loads, load_namespace)
+
+        assert e.value.code == 1
+        # The output is shown in the order of the namespaces, all of which are loaded
+        assert [c.args[0] for c in mock_echo.call_args_list if 'done' in c.args[0]] == \
+            ['localhost done', 'asic0 done', 'asic0 done', 'asic1 done']
+        assert mock_log_notice.call_count == 2
+        assert all(load.elapsed is not None for load in loads)
+
+    @mock.patch.dict(os.environ, {'SONIC_CLI_IFACE_MODE': 'alias'})
+    def test_namespace_task_run_command__alias_mode__output_kept(self):
+        proc = mock.MagicMock(returncode=0)
+        proc.communicate.return_value = ('Ethernet0 loaded\n', None)
+        task = config.NamespaceTask('asic0')
+
+        with mock.patch('utilities_common.cli.subprocess.Popen', return_value=proc) as mock_popen, \
+                mock.patch('utilities_common.cli.run_command_in_alias_mode') as mock_run_command_in_alias_mode:
+            task.run_command(['sonic-cfggen', '-j', '/etc/sonic/config_db0.json', '-n', 'asic0', '--write-to-db'])
+
+        mock_popen.assert_called_once()
+        mock_run_command_in_alias_mode.assert_not_called()
+        assert task.output[-1] == 'Ethernet0 loaded'
+
+    @mock.patch.dict(os.environ, {'SONIC_CLI_IFACE_MODE': 'alias'})
+    def test_namespace_task_run_command__alias_mode__failure_exits(self):
+        proc = mock.MagicMock(returncode=2)
+        proc.communicate.return_value = ('', None)
+        task = config.NamespaceTask(config.DEFAULT_NAMESPACE)
+
+        with mock.patch('utilities_common.cli.subprocess.Popen', return_value=proc), \
+                pytest.raises(SystemExit) as e:
+            task.run_command(['sonic-cfggen', '-H', '-m', '--write-to-db'])
+
+        assert e.value.code == 2
+
     def teardown(self):
         print("TEARDOWN")
 
@@ -439,15 +496,7 @@ class TestConfigSave(object):
         importlib.reload(config.main)
 
     def test_config_save(self, get_cmd_module, setup_single_broadcom_asic):
-        def read_json_file_side_effect(filename):
-            return {}
-
-        with mock.patch("utilities_common.cli.run_command",
-                        mock.MagicMock(side_effect=mock_run_command_side_effect)),\
-            mock.patch('config.main.read_json_file',
-                       mock.MagicMock(side_effect=read_json_file_side_effect)),\
-            mock.patch('config.main.open',
-                       mock.MagicMock()):
+        with mock.patch('utilities_common.config_db_saver.save_config') as mock_save_config:
             (config, show) = get_cmd_module
 
             runner = CliRunner()
@@ -460,17 +509,10 @@ class TestConfigSave(object):
 
             assert result.exit_code == 0
             assert "\n".join([li.rstrip() for li in result.output.split('\n')]) == save_config_output
+            assert [c.args[1] for c in mock_save_config.call_args_list] == ['/etc/sonic/config_db.json']
 
     def test_config_save_filename(self, get_cmd_module, setup_single_broadcom_asic):
-        def read_json_file_side_effect(filename):
-            return {}
-
-        with mock.patch("utilities_common.cli.run_command",
-                        mock.MagicMock(side_effect=mock_run_command_side_effect)),\
-            mock.patch('config.main.read_json_file',
-                       mock.MagicMock(side_effect=read_json_file_side_effect)),\
-            mock.patch('config.main.open',
-                       mock.MagicMock()):
+        with mock.patch('utilities_common.config_db_saver.save_config') as mock_save_config:
 
             (config, show) = get_cmd_module
 
@@ -485,6 +527,7 @@ class TestConfigSave(object):
 
             assert result.exit_code == 0
             assert "\n".join([li.rstrip() for li in result.output.split('\n')]) == save_config_filename_output
+            assert [c.args[1] for c in mock_save_config.call_args_list] == ['/tmp/config_db.json']
 
     @classmethod
     def teardown_class(cls):
@@ -507,15 +550,7 @@ class TestConfigSaveMasic(object):
         dbconnector.load_namespace_config()
 
     def test_config_save_masic(self):
-        def read_json_file_side_effect(filename):
-            return {}
-
-        with mock.patch("utilities_common.cli.run_command",
-                        mock.MagicMock(side_effect=mock_run_command_side_effect)),\
-            mock.patch('config.main.read_json_file',
-                       mock.MagicMock(side_effect=read_json_file_side_effect)),\
-            mock.patch('config.main.open',
-                       mock.MagicMock()):
+        with mock.patch('utilities_common.config_db_saver.save_config') as mock_save_config:
 
             runner = CliRunner()
 
@@ -527,17 +562,12 @@ class TestConfigSaveMasic(object):
 
             assert result.exit_code == 0
             assert "\n".join([li.rstrip() for li in result.output.split('\n')]) == save_config_masic_output
+            # The namespaces are saved concurrently
+            assert sorted(c.args[1] for c in mock_save_config.call_args_list) == \
+                ['/etc/sonic/config_db.json', '/etc/sonic/config_db0.json', '/etc/sonic/config_db1.json']
 
     def test_config_save_filename_masic(self):
-        def read_json_file_side_effect(filename):
-            return {}
-
-        with mock.patch("utilities_common.cli.run_command",
-                        mock.MagicMock(side_effect=mock_run_command_side_effect)),\
-            mock.patch('config.main.read_json_file',
-                       mock.MagicMock(side_effect=read_json_file_side_effect)),\
-            mock.patch('config.main.open',
-                       mock.MagicMock()):
+        with mock.patch('utilities_common.config_db_saver.save_config') as mock_save_config:
 
             runner = CliRunner()
 
@@ -552,6 +582,9 @@ class TestConfigSaveMasic(object):
 
             assert result.exit_code == 0
             assert "\n".join([li.rstrip() for li in result.output.split('\n')]) == save_config_filename_masic_output
+            # The namespaces are saved concurrently
+            assert sorted(c.args[1] for c in mock_save_config.call_args_list) == \
+                ['config_db.json', 'config_db0.json', 'config_db1.json']
 
     def test_config_save_filename_wrong_cnt_masic(self):
         def read_json_file_side_effect(filename):
@@ -1465,6 +1498,31 @@ class TestReloadConfig(object):
             assert "\n".join([l.rstrip() for l in result.output.split('\n')]) \
                 == RELOAD_CONFIG_DB_OUTPUT.format(config.SYSTEM_RELOAD_LOCK)
 
+    def test_reload_config_diff(self, get_cmd_module, setup_single_broadcom_asic):
+        self.add_sysinfo_to_cfg_file()
+        with mock.patch(
+                "utilities_common.cli.run_command",
+                mock.MagicMock(side_effect=mock_run_command_side_effect)
+        ):
+            (config, show) = get_cmd_module
+            runner = CliRunner()
+
+            result = runner.invoke(
+                config.config.commands["reload"],
+                [self.dummy_cfg_file, '-y', '-f', '-n'])
+            assert result.exit_code == 0
+
+            # Nothing changed since the previous reload, nothing is written
+            result = runner.invoke(
+                config.config.commands["reload"],
+                [self.dummy_cfg_file, '-y', '-f', '-n', '--diff'])
+
+            print(result.exit_code)
+            print(result.output)
+            traceback.print_tb(result.exc_info[2])
+            assert result.exit_code == 0
+            assert "Loaded {} into CONFIG_DB (written: 0, removed: 0)".format(self.dummy_cfg_file) in result.output
+
     def test_reload_config_lock_failure(self, get_cmd_module, setup_single_broadcom_asic):
         self.add_sysinfo_to_cfg_file()
         with mock.patch(
@@ -2070,6 +2128,91 @@ class TestGenericUpdateCommands(unittest.TestCase):
         mock_generic_updater.apply_patch.assert_called_once()
         mock_generic_updater.apply_patch.assert_has_calls([expected_call])
 
+    @patch('config.main.validate_patch', mock.Mock(return_value=True))
+    def test_apply_patch__batch_writes__batch_writes_passed_to_generic_updater(self):
+        # Arrange
+        mock_generic_updater = mock.Mock()
+        with mock.patch('config.main.GenericUpdater', return_value=mock_generic_updater) as mock_generic_updater_cls:
+            with mock.patch('builtins.open', mock.mock_open(read_data=self.any_patch_as_text)):
+
+                # Act
+                result = self.runner.invoke(config.config.commands["apply-patch"],
+                                            [self.any_path, "--batch-writes"],
+                                            catch_exceptions=False)
+
+        # Assert
+        self.assertEqual(0, result.exit_code)
+        mock_generic_updater_cls.assert_called_once_with(scope=multi_asic.DEFAULT_NAMESPACE, profile=False,
+                                                         batch_writes=True, sort_algorithm=Algorithm.DFS,
+                                                         incremental_validation=False)
+        mock_generic_updater.apply_patch.assert_called_once()
+
+    @patch('config.main.validate_patch', mock.Mock(return_value=True))
+    def test_apply_patch__sort_algorithm__sort_algorithm_passed_to_generic_updater(self):
+        # Arrange
+        mock_generic_updater = mock.Mock()
+        with mock.patch('config.main.GenericUpdater', return_value=mock_generic_updater) as mock_generic_updater_cls:
+            with mock.patch('builtins.open', mock.mock_open(read_data=self.any_patch_as_text)):
+
+                # Act
+                result = self.runner.invoke(config.config.commands["apply-patch"],
+                                            [self.any_path, "--sort-algorithm", "DFS_IN_PLACE"],
+                                            catch_exceptions=False)
+
+        # Assert
+        self.assertEqual(0, result.exit_code)
+        mock_generic_updater_cls.assert_called_once_with(scope=multi_asic.DEFAULT_NAMESPACE, profile=False,
+                                                         batch_writes=False, sort_algorithm=Algorithm.DFS_IN_PLACE,
+                                                         incremental_validation=False)
+        mock_generic_updater.apply_patch.assert_called_once()
+
+    @patch('config.main.validate_patch', mock.Mock(return_value=True))
+    def test_apply_patch__incremental_validation__incremental_validation_passed_to_generic_updater(self):
+        # Arrange
+        mock_generic_updater = mock.Mock()
+        with mock.patch('config.main.GenericUpdater', return_value=mock_generic_updater) as mock_generic_updater_cls:
+            with mock.patch('builtins.open', mock.mock_open(read_data=self.any_patch_as_text)):
+
+                # Act
+                result = self.runner.invoke(config.config.commands["apply-patch"],
+                                            [self.any_path, "--incremental-validation"],
+                                            catch_exceptions=False)
+
+        # Assert
+        self.assertEqual(0, result.exit_code)
+        mock_generic_updater_cls.assert_called_once_with(scope=multi_asic.DEFAULT_NAMESPACE, profile=False,
+                                                         batch_writes=False, sort_algorithm=Algorithm.DFS,
+                                                         incremental_validation=True)
+        mock_generic_updater.apply_patch.assert_called_once()
+
+    @patch('config.main.validate_patch', mock.Mock(return_value=True))
+    def test_apply_patch__topological_sort_algorithm__sort_algorithm_passed_to_generic_updater(self):
+        # Arrange
+        mock_generic_updater = mock.Mock()
+        with mock.patch('config.main.GenericUpdater', return_value=mock_generic_updater) as mock_generic_updater_cls:
+            with mock.patch('builtins.open', mock.mock_open(read_data=self.any_patch_as_text)):
+
+                # Act
+                result = self.runner.invoke(config.config.commands["apply-patch"],
+                                            [self.any_path, "--sort-algorithm", "TOPOLOGICAL"],
+                                            catch_exceptions=False)
+
+        # Assert
+        self.assertEqual(0, result.exit_code)
+        mock_generic_updater_cls.assert_called_once_with(scope=multi_asic.DEFAULT_NAMESPACE, profile=False,
+                                                         batch_writes=False, sort_algorithm=Algorithm.TOPOLOGICAL,
+                                                         incremental_validation=False)
+        mock_generic_updater.apply_patch.assert_called_once()
+
+    def test_apply_patch__unknown_sort_algorithm__failure(self):
+        # Act
+        result = self.runner.invoke(config.config.commands["apply-patch"],
+                                    [self.any_path, "--sort-algorithm", "BFS"])
+
+        # Assert
+        self.assertNotEqual(0, result.exit_code)
+        self.assertIn("Invalid value for", result.output)
+
     def test_replace__no_params__get_required_params_error_msg(self):
         # Arrange
         unexpected_exit_code = 0
@@ -2195,6 +2338,58 @@ class TestGenericUpdateCommands(unittest.TestCase):
         mock_generic_updater.replace.assert_called_once()
         mock_generic_updater.replace.assert_has_calls([expected_call])
 
+    def test_replace__batch_writes__batch_writes_passed_to_generic_updater(self):
+        # Arrange
+        mock_generic_updater = mock.Mock()
+        with mock.patch('config.main.GenericUpdater', return_value=mock_generic_updater) as mock_generic_updater_cls:
+            with mock.patch('builtins.open', mock.mock_open(read_data=self.any_target_config_as_text)):
+
+                # Act
+                result = self.runner.invoke(config.config.commands["replace"],
+                                            [self.any_path, "--batch-writes"],
+                                            catch_exceptions=False)
+
+        # Assert
+        self.assertEqual(0, result.exit_code)
+        mock_generic_updater_cls.assert_called_once_with(profile=False, batch_writes=True,
+                                                         sort_algorithm=Algorithm.DFS, incremental_validation=False)
+        mock_generic_updater.replace.assert_called_once()
+
+    def test_replace__sort_algorithm__sort_algorithm_passed_to_generic_updater(self):
+        # Arrange
+        mock_generic_updater = mock.Mock()
+        with mock.patch('config.main.GenericUpdater', return_value=mock_generic_updater) as mock_generic_updater_cls:
+            with mock.patch('builtins.open', mock.mock_open(read_data=self.any_target_config_as_text)):
+
+                # Act
+                result = self.runner.invoke(config.config.commands["replace"],
+                                            [self.any_path, "--sort-algorithm", "DFS_IN_PLACE"],
+                                            catch_exceptions=False)
+
+        # Assert
+        self.assertEqual(0, result.exit_code)
+        mock_generic_updater_cls.assert_called_once_with(profile=False, batch_writes=False,
+                                                         sort_algorithm=Algorithm.DFS_IN_PLACE,
+                                                         incremental_validation=False)
+        mock_generic_updater.replace.assert_called_once()
+
+    def test_replace__incremental_validation__incremental_validation_passed_to_generic_updater(self):
+        # Arrange
+        mock_generic_updater = mock.Mock()
+        with mock.patch('config.main.GenericUpdater', return_value=mock_generic_updater) as mock_generic_updater_cls:
+            with mock.patch('builtins.open', mock.mock_open(read_data=self.any_target_config_as_text)):
+
+                # Act
+                result = self.runner.invoke(config.config.commands["replace"],
+                                            [self.any_path, "--incremental-validation"],
+                                            catch_exceptions=False)
+
+        # Assert
+        self.assertEqual(0, result.exit_code)
+        mock_generic_updater_cls.assert_called_once_with(profile=False, batch_writes=False,
+                                                         sort_algorithm=Algorithm.DFS, incremental_validation=True)
+        mock_generic_updater.replace.assert_called_once()
+
     def test_rollback__no_params__get_required_params_error_msg(self):
         # Arrange
         unexpected_exit_code = 0
@@ -2310,6 +2505,52 @@ class TestGenericUpdateCommands(unittest.TestCase):
         mock_generic_updater.rollback.assert_called_once()
         mock_generic_updater.rollback.assert_has_calls([expected_call])
 
+    def test_rollback__batch_writes__batch_writes_passed_to_generic_updater(self):
+        # Arrange
+        mock_generic_updater = mock.Mock()
+        with mock.patch('config.main.GenericUpdater', return_value=mock_generic_updater) as mock_generic_updater_cls:
+            # Act
+            result = self.runner.invoke(config.config.commands["rollback"],
+                                        [self.any_checkpoint_name, "--batch-writes"],
+                                        catch_exceptions=False)
+
+        # Assert
+        self.assertEqual(0, result.exit_code)
+        mock_generic_updater_cls.assert_called_once_with(profile=False, batch_writes=True,
+                                                         sort_algorithm=Algorithm.DFS, incremental_validation=False)
+        mock_generic_updater.rollback.assert_called_once()
+
+    def test_rollback__sort_algorithm__sort_algorithm_passed_to_generic_updater(self):
+        # Arrange
+        mock_generic_updater = mock.Mock()
+        with mock.patch('config.main.GenericUpdater', return_value=mock_generic_updater) as mock_generic_updater_cls:
+            # Act
+            result = self.runner.invoke(config.config.commands["rollback"],
+                                        [self.any_checkpoint_name, "--sort-algorithm", "DFS_IN_PLACE"],
+                                        catch_exceptions=False)
+
+        # Assert
+        self.assertEqual(0, result.exit_code)
+        mock_generic_updater_cls.assert_called_once_with(profile=False, batch_writes=False,
+                                                         sort_algorithm=Algorithm.DFS_IN_PLACE,
+                                                         incremental_validation=False)
+        mock_generic_updater.rollback.assert_called_once()
+
+    def test_rollback__incremental_validation__incremental_validation_passed_to_generic_updater(self):
+        # Arrange
+        mock_generic_updater = mock.Mock()
+        with mock.patch('config.main.GenericUpdater', return_value=mock_generic_updater) as mock_generic_updater_cls:
+            # Act
+            result = self.runner.invoke(config.config.commands["rollback"],
+                                        [self.any_checkpoint_name, "--incremental-validation"],
+                                        catch_exceptions=False)
+
+        # Assert
+        self.assertEqual(0, result.exit_code)
+        mock_generic_updater_cls.assert_called_once_with(profile=False, batch_writes=False,
+                                                         sort_algorithm=Algorithm.DFS, incremental_validation=True)
+        mock_generic_updater.rollback.assert_called_once()
+
     def test_checkpoint__no_params__get_required_params_error_msg(self):
         # Arrange
         unexpected_exit_code = 0
@@ -0,0 +1,61 @@
+import datetime
+import json
+from collections import OrderedDict
+
+import pytest
+
+from utilities_common.cli import CounterCheckpoint, UserCache, json_serial
+
+
+def create_counters():
+    counters = OrderedDict()
+    counters['time'] = datetime.datetime(2024, 1, 1, 12, 0, 0)
+    counters['Ethernet0'] = OrderedDict([('rx_ok', '10'), ('rx_err', 'N/A'), ('tx_ok', str(2 ** 64 - 1))])
+    counters['Ethernet4'] = OrderedDict([('rx_ok', '20'), ('rx_err', '3'), ('tx_ok', '0')])
+    return counters
+
+
+class TestCounterCheckpoint(object):
+    def test_write_read_checkpoint__same_as_json_round_trip(self, tmp_path):
+        path = str(tmp_path / "portstat")
+        counters = create_counters()
+
+        UserCache.write_checkpoint(path, counters)
+
+        expected = json.loads(json.dumps(counters, default=json_serial))
+        assert UserCache.read_checkpoint(path) == expected
+        with open(path, 'rb') as fp:
+            assert fp.read(4) == CounterCheckpoint.MAGIC
+
+    def test_read_checkpoint__json_checkpoint(self, tmp_path):
+        path = str(tmp_path / "portstat")
+        with open(path, 'w') as fp:
+            json.dump({'time': '2024-01-01T12:00:00', 'Ethernet0': {'rx_ok': '10'}}, fp)
+
+        assert UserCache.read_checkpoint(path) == {'time': '2024-01-01T12:00:00', 'Ethernet0': {'rx_ok': '10'}}
+
+    def test_checkpoint__columns_and_exceptions(self):
+        checkpoint = CounterCheckpoint.from_dict(create_counters())
+
+        assert checkpoint.objects == ['Ethernet0', 'Ethernet4']
+        assert checkpoint.index == {'Ethernet0': 0, 'Ethernet4': 1}
+        assert checkpoint.column('rx_ok').tolist() == [10, 20]
+        assert checkpoint.column('rx_err').tolist() == [0, 3]
+        assert checkpoint.exceptions == {'rx_err': {0: 'N/A'}}
+
+    def test_checkpoint__tuple_keys_ints_and_missing_fields(self):
+        counters = {('TABLE', 'RULE_1'): {'packets': 5, 'bytes': 100, 'type': 'L3'},
+                    ('TABLE', 'RULE_2'): {'packets': 6}}
+
+        checkpoint = CounterCheckpoint.from_bytes(CounterCheckpoint.from_dict(counters).to_bytes())
+
+        assert checkpoint.to_dict() == counters
+        assert checkpoint.fields == {'packets': CounterCheckpoint.KIND_INT, 'bytes': CounterCheckpoint.KIND_INT,
+                                     'type': CounterCheckpoint.KIND_JSON}
+
+    def test_from_bytes__unsupported_version(self):
+        raw = bytearray(CounterCheckpoint.from_dict(create_counters()).to_bytes())
+        raw[4] = CounterCheckpoint.VERSION + 1
+
+        with pytest.raises(ValueError, match="Unsupported counter checkpoint version"):
+            CounterCheckpoint.from_bytes(bytes(raw))
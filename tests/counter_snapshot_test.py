@@ -0,0 +1,115 @@
+from unittest import mock
+from unittest.mock import MagicMock, call, patch
+
+from utilities_common import counter_snapshot
+
+
+def create_pipeline_client(data):
+    client = MagicMock()
+
+    def pipeline(transaction=True):
+        pipe = MagicMock()
+        keys = []
+        pipe.hgetall.side_effect = lambda key: keys.append(key)
+        pipe.execute.side_effect = lambda: [data.get(key) for key in keys]
+        return pipe
+    client.pipeline.side_effect = pipeline
+    return client
+
+
+class TestCounterSnapshot(object):
+    def test_hgetall_pipelined__keys_in_order(self):
+        client = create_pipeline_client({"COUNTERS:oid:1": {"a": "1"}, "COUNTERS:oid:2": {"a": "2"}})
+
+        result = counter_snapshot.hgetall_pipelined(client, ["COUNTERS:oid:2", "COUNTERS:oid:3", "COUNTERS:oid:1"])
+
+        assert result == [{"a": "2"}, {}, {"a": "1"}]
+        client.pipeline.assert_called_once_with(transaction=False)
+
+    def test_hgetall_pipelined__batches(self):
+        data = {"COUNTERS:oid:{}".format(i): {"a": str(i)} for i in range(5)}
+        client = create_pipeline_client(data)
+
+        result = counter_snapshot.hgetall_pipelined(client, sorted(data), batch_size=2)
+
+        assert result == [data[key] for key in sorted(data)]
+        assert client.pipeline.call_count == 3
+
+    def test_get_all_pipelined__uses_connector_client(self):
+        client = create_pipeline_client({"RATES:oid:1": {"RX_BPS": "10"}})
+        db = MagicMock()
+        db.get_redis_client.return_value = client
+
+        result = counter_snapshot.get_all_pipelined(db, "COUNTERS_DB", ["RATES:oid:1"])
+
+        assert result == {"RATES:oid:1": {"RX_BPS": "10"}}
+        db.get_redis_client.assert_called_once_with("COUNTERS_DB")
+
+    @patch("utilities_common.counter_snapshot.SonicDBConfig")
+    @patch("utilities_common.counter_snapshot.redis.Redis")
+    def test_get_pipeline_client__no_pipeline_support__redis_client_cached(self, mock_redis, mock_db_config):
+        db = MagicMock()
+        db.get_redis_client.return_value = MagicMock(spec=[])
+        mock_db_config.getDbId.return_value = 2
+        mock_db_config.getDbSock.return_value = "/var/run/redis0/redis.sock"
+
+        with patch.dict(counter_snapshot._pipeline_clients, clear=True):
+            first = counter_snapshot.get_pipeline_client(db, "COUNTERS_DB", "asic0")
+            second = counter_snapshot.get_pipeline_client(db, "COUNTERS_DB", "asic0")
+
+        assert first is second
+        mock_redis.assert_called_once_with(unix_socket_path="/var/run/redis0/redis.sock", db=2,
+                                           decode_responses=True)
+        mock_db_config.getDbSock.assert_called_once_with("COUNTERS_DB", "asic0")
+
+    def create_snapshot(self, data, maps=None):
+        db = MagicMock()
+        db.COUNTERS_DB = "COUNTERS_DB"
+        db.get_redis_client.return_value = create_pipeline_client(data)
+        db.get_all.side_effect = lambda db_name, key: (maps or {}).get(key)
+        return counter_snapshot.CounterSnapshot(db), db
+
+    def test_counter_snapshot__get_map__read_once(self):
+        snapshot, db = self.create_snapshot({}, {"COUNTERS_QUEUE_INDEX_MAP": {"oid:1": "0"}})
+
+        assert snapshot.get_map("COUNTERS_QUEUE_INDEX_MAP") == {"oid:1": "0"}
+        assert snapshot.get_map("COUNTERS_QUEUE_INDEX_MAP") == {"oid:1": "0"}
+        assert snapshot.get_map("COUNTERS_QUEUE_TYPE_MAP") == {}
+        assert db.get_all.call_count == 2
+
+    def test_counter_snapshot__get_counters__loaded_keys_not_read_again(self):
+        snapshot, db = self.create_snapshot({"COUNTERS:oid:1": {"a": "1"}, "COUNTERS:oid:2": {"a": "2"}})
+        client = db.get_redis_client.return_value
+
+        assert snapshot.get_counters(["oid:1", "oid:2", "oid:1"]) == [{"a": "1"}, {"a": "2"}, {"a": "1"}]
+        assert snapshot.get_table("COUNTERS:oid:2") == {"a": "2"}
+        assert snapshot.get_table("COUNTERS:oid:3") == {}
+        assert client.pipeline.call_count == 2
+
+    def test_counter_snapshot__get_columns(self):
+        snapshot, _ = self.create_snapshot({"RATES:oid:1": {"RX_BPS": "10", "TX_BPS": "20"},
+                                            "RATES:oid:2": {"RX_BPS": "30"}})
+
+        columns = snapshot.get_columns(["oid:1", "oid:2", "oid:3"], ["RX_BPS", "TX_BPS"], "RATES:")
+
+        assert columns == {"RX_BPS": ["10", "30", None], "TX_BPS": ["20", None, None]}
+
+    def test_scan_keys__batches_until_cursor_is_zero_without_duplicates(self):
+        client = MagicMock()
+        client.scan.side_effect = [(5, ["FDB:1", "FDB:2"]), (9, []), (0, ["FDB:2", "FDB:3"])]
+
+        batches = list(counter_snapshot.scan_keys(client, "FDB:*", count=2))
+
+        assert batches == [["FDB:1", "FDB:2"], ["FDB:3"]]
+        client.scan.assert_has_calls([call(0, "FDB:*", 2), call(5, "FDB:*", 2), call(9, "FDB:*", 2)])
+
+    def test_scan_all_pipelined__filtered_keys_not_read(self):
+        client = create_pipeline_client({"FDB:1": {"port": "1"}, "FDB:2": {"port": "2"}})
+        client.scan.return_value = (0, ["FDB:1", "FDB:2"])
+        db = MagicMock()
+        db.get_redis_client.return_value = client
+
+        entries = list(counter_snapshot.scan_all_pipelined(db, "ASIC_DB", "FDB:*",
+                                                           key_filter=lambda key: key != "FDB:1"))
+
+        assert entries == [("FDB:2", {"port": "2"})]
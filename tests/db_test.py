@@ -0,0 +1,58 @@
+from unittest import mock
+
+from utilities_common import db as db_module
+from utilities_common.db import Db, LazyDBConnector
+
+
+class TestLazyDBConnector(object):
+    def test_connects_on_first_use_of_a_db(self):
+        connector = mock.MagicMock()
+        db = LazyDBConnector(connector, ["APPL_DB", "COUNTERS_DB"])
+
+        db.get_all("COUNTERS_DB", "COUNTERS:oid:1")
+        db.keys("COUNTERS_DB", "COUNTERS:*")
+        db.get_db_list()
+
+        connector.connect.assert_called_once_with("COUNTERS_DB")
+        connector.get_all.assert_called_once_with("COUNTERS_DB", "COUNTERS:oid:1")
+
+    def test_db_not_in_list_not_connected(self):
+        connector = mock.MagicMock()
+        connector.APPL_DB = "APPL_DB"
+        db = LazyDBConnector(connector, ["APPL_DB"])
+
+        db.get_all("CHASSIS_APP_DB", "key")
+        db.close("APPL_DB")
+        db.get_all("APPL_DB", "key")
+
+        connector.connect.assert_called_once_with("APPL_DB")
+        assert db.APPL_DB == "APPL_DB"
+
+
+class TestDb(object):
+    @mock.patch("utilities_common.db.device_info.is_supervisor", mock.MagicMock(return_value=False))
+    @mock.patch("utilities_common.db.multi_asic.is_multi_asic", mock.MagicMock(return_value=True))
+    @mock.patch("utilities_common.db.multi_asic_ns_choices", mock.MagicMock(return_value=["asic0", "asic1"]))
+    @mock.patch("utilities_common.db.multi_asic.connect_config_db_for_ns")
+    @mock.patch("utilities_common.db.SonicV2Connector")
+    @mock.patch("utilities_common.db.ConfigDBConnector")
+    def test_clients_created_on_first_use(self, mock_cfgdb, mock_connector, mock_connect_config_db):
+        mock_connector.return_value.get_db_list.return_value = ["APPL_DB", "CHASSIS_APP_DB", "CHASSIS_STATE_DB"]
+
+        db = Db()
+        mock_cfgdb.assert_not_called()
+        mock_connector.assert_not_called()
+        assert list(db.cfgdb_clients) == ["", "asic0", "asic1"]
+
+        assert db.cfgdb_clients[""] is db.cfgdb
+        mock_cfgdb.return_value.connect.assert_called_once_with()
+        assert db.db_list == ["APPL_DB"]
+
+        assert db.cfgdb_clients["asic1"] is mock_connect_config_db.return_value
+        mock_connect_config_db.assert_called_once_with("asic1")
+
+        asic0_db = db.db_clients["asic0"]
+        mock_connector.assert_called_with(use_unix_socket_path=True, namespace="asic0")
+        mock_connector.return_value.connect.assert_not_called()
+        asic0_db.get_all("APPL_DB", "key")
+        mock_connector.return_value.connect.assert_called_once_with("APPL_DB")
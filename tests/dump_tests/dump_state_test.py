@@ -218,6 +218,16 @@ class TestDumpState:
         ddiff = DeepDiff(set(expected_entries), set(rec_json.keys()))
         assert not ddiff, "Expected Entries were not recieved when passing all keyword"
 
+    def test_option_jobs(self, match_engine):
+        runner = CliRunner()
+        result = runner.invoke(dump.state, ["port", "all"], obj=match_engine)
+        assert result.exit_code == 0, "exit code: {}, Exception: {}, Traceback: {}".format(result.exit_code, result.exception, result.exc_info)
+
+        # Workers use the connection filled into the pool, with the mock data
+        result_jobs = runner.invoke(dump.state, ["port", "all", "--jobs", "4"], obj=match_engine)
+        assert result_jobs.exit_code == 0, "exit code: {}, Exception: {}, Traceback: {}".format(result_jobs.exit_code, result_jobs.exception, result_jobs.exc_info)
+        assert result_jobs.output == result.output
+
     def test_namespace_single_asic(self, match_engine):
         runner = CliRunner()
         result = runner.invoke(dump.state, ["port", "Ethernet0", "--table", "--key-map", "--namespace", "asic0"], obj=match_engine)
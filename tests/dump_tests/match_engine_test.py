@@ -2,10 +2,11 @@ import os
 import sys
 import unittest
 import pytest
-from dump.match_infra import MatchEngine, EXCEP_DICT, MatchRequest, MatchRequestOptimizer, ConnectionPool, CONN
+from dump.match_infra import MatchEngine, EXCEP_DICT, MatchRequest, MatchRequestOptimizer, ConnectionPool, CONN, RedisSource
 from utilities_common.constants import DEFAULT_NAMESPACE
 from dump.helper import populate_mock
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
+from concurrent.futures import ThreadPoolExecutor
 from deepdiff import DeepDiff
 from importlib import reload
 
@@ -248,6 +249,23 @@ class TestMatchEngine:
         assert len(ret["keys"]) == 1
         assert "PORT|Ethernet60" in ret["keys"]
 
+    def test_field_value_match_fetched_in_bulk(self, match_engine):
+        req = MatchRequest(db="STATE_DB", table="VXLAN_TUNNEL_TABLE", key_pattern="EVPN_25.25.25.2*", field="operstatus", value="down", return_fields=["src_ip"])
+        # The fv-pairs of the keys are pipelined, instead of fetched one key at a time
+        with patch.object(RedisSource, "hget", side_effect=AssertionError), \
+                patch.object(RedisSource, "hgetall_bulk", autospec=True, side_effect=RedisSource.hgetall_bulk) as bulk:
+            ret = match_engine.fetch(req)
+        assert ret["error"] == ""
+        assert len(ret["keys"]) == 3
+        assert "1.1.1.1" == ret["return_values"]["VXLAN_TUNNEL_TABLE|EVPN_25.25.25.25"]["src_ip"]
+        assert bulk.call_count == 1
+
+    def test_hgetall_bulk(self, match_engine):
+        src = match_engine.get_redis_source_adapter()
+        assert src.connect("STATE_DB", DEFAULT_NAMESPACE)
+        keys = src.getKeys("STATE_DB", "REBOOT_CAUSE", "*") + ["REBOOT_CAUSE|missing"]
+        assert src.hgetall_bulk("STATE_DB", keys) == [src.hgetall("STATE_DB", key) for key in keys]
+
 @pytest.mark.usefixtures("match_engine")
 class TestNonDefaultNameSpace:
 
@@ -267,6 +285,38 @@ class TestNonDefaultNameSpace:
         assert len(ret["keys"]) == 1
         assert "PORT|Ethernet-BP256" in ret["keys"]
 
+class TestConnectionPool:
+
+    def test_connection_per_thread(self):
+        conn_pool = ConnectionPool()
+        with patch.object(ConnectionPool, "initialize_connector", side_effect=lambda ns: MagicMock()):
+            conn = conn_pool.get("CONFIG_DB", DEFAULT_NAMESPACE)
+            assert conn_pool.get("CONFIG_DB", DEFAULT_NAMESPACE) is conn
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                thread_conn = executor.submit(conn_pool.get, "CONFIG_DB", DEFAULT_NAMESPACE).result()
+                assert thread_conn is not conn
+                thread_conn.connect.assert_called_once_with("CONFIG_DB")
+                # Clearing the pool drops the connections of all the threads
+                conn_pool.clear(DEFAULT_NAMESPACE)
+                assert executor.submit(conn_pool.get, "CONFIG_DB", DEFAULT_NAMESPACE).result() is not thread_conn
+            assert conn_pool.get("CONFIG_DB", DEFAULT_NAMESPACE) is not conn
+
+    def test_filled_connection_shared_by_threads(self):
+        conn_pool = ConnectionPool()
+        conn, dash_conn = MagicMock(), MagicMock()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(lambda: conn_pool.cache).result()
+            # Filling the pool updates the threads already using it too
+            conn_pool.fill(DEFAULT_NAMESPACE, conn, ["CONFIG_DB"])
+            conn_pool.fill(DEFAULT_NAMESPACE, dash_conn, None, dash_object=True)
+            thread_conn = executor.submit(conn_pool.get, "CONFIG_DB", DEFAULT_NAMESPACE).result()
+            thread_dash_conn = executor.submit(conn_pool.get_dash_conn, DEFAULT_NAMESPACE).result()
+        assert thread_conn is conn
+        assert thread_dash_conn is dash_conn
+        conn.connect.assert_not_called()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            assert executor.submit(conn_pool.get, "CONFIG_DB", DEFAULT_NAMESPACE).result() is conn
+
 class TestMatchEngineOptimizer:
 
     def test_caching(self):
@@ -296,10 +346,70 @@ class TestMatchEngineOptimizer:
         m_engine.fetch = MagicMock(return_value=template)
         m_engine_optim = MatchRequestOptimizer(m_engine)
         req = MatchRequest(db="CONFIG_DB", table="COPP_GROUP", key_pattern="queue4*", field="red_action", value="drop", return_fields=["whatever"])
+        # The first fetch fills the cache, the second one is served from it
+        for _ in range(2):
+            ret = m_engine_optim.fetch(req)
+            assert ret["error"] == ""
+            assert len(ret["keys"]) == 1
+            assert "COPP_GROUP|queue4_group2" in ret["keys"]
+            # missing filed should not cause an excpetion in the optimizer
+            assert "whatever" in ret["return_values"]["COPP_GROUP|queue4_group2"]
+            assert ret["return_values"]["COPP_GROUP|queue4_group2"]["whatever"] is None
+        assert m_engine.fetch.call_count == 1
+
+    def test_missing_field__cache_miss_and_hit(self):
+        rv = {"COPP_GROUP|queue4_group2": {"trap_action": "copy", "trap_priority": "4", "queue": "4"}}
+        template = {"error": "", "keys": [rv], "return_values": {}}
+        m_engine = MatchEngine()
+        m_engine.fetch = MagicMock(return_value=template)
+        m_engine_optim = MatchRequestOptimizer(m_engine)
+        req = MatchRequest(db="CONFIG_DB", table="COPP_GROUP", key_pattern="queue4_group2",
+                           return_fields=["queue", "whatever"])
+        # The first fetch misses the cache and fills it, the second one is served from it
+        for _ in range(2):
+            ret = m_engine_optim.fetch(req)
+            assert ret["error"] == ""
+            assert ret["keys"] == ["COPP_GROUP|queue4_group2"]
+            assert ret["return_values"] == {"COPP_GROUP|queue4_group2": {"queue": "4", "whatever": None}}
+        assert m_engine.fetch.call_count == 1
+
+    def test_field_index(self):
+        rv = [{"COPP_TRAP|arp": {"trap_ids": "arp_req,arp_resp,neigh_discovery", "trap_group": "queue4_group2"}},
+              {"COPP_TRAP|lacp": {"trap_ids": "lacp", "trap_group": "queue4_group1"}}]
+        template = {"error": "", "keys": rv, "return_values": {}}
+        m_engine = MatchEngine()
+        m_engine.fetch = MagicMock(return_value=template)
+        m_engine_optim = MatchRequestOptimizer(m_engine)
+        req = MatchRequest(db="CONFIG_DB", table="COPP_TRAP", field="trap_ids", value="arp_resp", return_fields=["trap_group"])
         ret = m_engine_optim.fetch(req)
         assert ret["error"] == ""
-        assert len(ret["keys"]) == 1
-        assert "COPP_GROUP|queue4_group2" in ret["keys"]
-        # missing filed should not cause an excpetion in the optimizer
-        assert "whatever" in ret["return_values"]["COPP_GROUP|queue4_group2"]
-        assert not  ret["return_values"]["COPP_GROUP|queue4_group2"]["whatever"]
+        assert ret["keys"] == ["COPP_TRAP|arp"]
+        assert ret["return_values"]["COPP_TRAP|arp"]["trap_group"] == "queue4_group2"
+
+        req = MatchRequest(db="CONFIG_DB", table="COPP_TRAP", field="trap_ids", value="lacp", just_keys=False)
+        ret = m_engine_optim.fetch(req)
+        assert ret["error"] == ""
+        assert ret["keys"] == [rv[1]]
+
+        req = MatchRequest(db="CONFIG_DB", table="COPP_TRAP", field="trap_ids", value="bgp")
+        ret = m_engine_optim.fetch(req)
+        assert ret["error"] == EXCEP_DICT["NO_ENTRIES"]
+        assert not ret["keys"]
+
+        # The table is fetched once, with all its fv-pairs, and indexed for the following requests
+        assert m_engine.fetch.call_count == 1
+        table_req = m_engine.fetch.call_args[0][0]
+        assert not table_req.field and not table_req.just_keys
+
+    def test_field_index_missing_field(self, match_engine):
+        req = MatchRequest(db="STATE_DB", table="VXLAN_TUNNEL_TABLE", key_pattern="EVPN_25.25.25.2*", field="operstatus",
+                           value="down", return_fields=["src_ip", "whatever"])
+        ret = match_engine.fetch(req)
+        m_engine_optim = MatchRequestOptimizer(match_engine)
+        # A missing field is returned as None, as the MatchEngine does, whether the cache is filled or not
+        for _ in range(2):
+            ret_optim = m_engine_optim.fetch(req)
+            assert ret_optim["error"] == ""
+            assert sorted(ret_optim["keys"]) == sorted(ret["keys"])
+            assert ret_optim["return_values"] == ret["return_values"]
+            assert ret_optim["return_values"]["VXLAN_TUNNEL_TABLE|EVPN_25.25.25.25"]["whatever"] is None
@@ -3,6 +3,19 @@ import fnmatch
 import base64
 
 
+class RedisPipelineMock():
+
+    def __init__(self, redis_mock):
+        self.redis_mock = redis_mock
+        self.keys = []
+
+    def hgetall(self, key):
+        self.keys.append(key)
+
+    def execute(self):
+        return [self.redis_mock.hgetall(key) for key in self.keys]
+
+
 class RedisMock():
 
     def __init__(self, host="None", port=0, db=0):
@@ -29,6 +42,9 @@ class RedisMock():
     def hgetall(self, key):
         return self.data[key]
 
+    def pipeline(self, transaction=True):
+        return RedisPipelineMock(self)
+
     def keys(self, match):
         kp = match.replace("[^", "[!")
         kys = fnmatch.filter(self.data.keys(), kp)
@@ -0,0 +1,55 @@
+import io
+import json
+import subprocess
+import sys
+
+import pytest
+
+from utilities_common import frr_json
+
+ROUTES = {
+    "0.0.0.0/0": [
+        {"prefix": "0.0.0.0/0", "protocol": "bgp", "selected": True, "offloaded": True,
+         "nexthops": [{"ip": "10.0.0.57", "interfaceName": "PortChannel0001", "weight": 1}]}
+    ],
+    "10.1.0.32/32": [
+        {"prefix": "10.1.0.32/32", "protocol": "connected", "selected": True, "metric": 0},
+        {"prefix": "10.1.0.32/32", "protocol": "static", "distance": 1.5, "tag": 12345678}
+    ],
+    "fc00::/64": [
+        {"prefix": "fc00::/64", "protocol": "bgp", "selected": False, "description": "é \"quoted\" }]"}
+    ]
+}
+
+
+class TestFrrJson(object):
+    @pytest.mark.parametrize("chunk_size", [1, 3, 7, 64 * 1024])
+    def test_iter_prefix_routes__any_chunk_size(self, chunk_size):
+        stream = io.StringIO(json.dumps(ROUTES, indent=4))
+
+        result = list(frr_json.iter_prefix_routes(stream, chunk_size))
+
+        assert result == list(ROUTES.items())
+
+    def test_iter_prefix_routes__empty(self):
+        assert list(frr_json.iter_prefix_routes(io.StringIO(" {}\n"))) == []
+
+    @pytest.mark.parametrize("output", ["", "% Unknown command", '{"10.0.0.0/8": [{}]', '{"10.0.0.0/8" []}'])
+    def test_iter_prefix_routes__invalid(self, output):
+        with pytest.raises(ValueError):
+            list(frr_json.iter_prefix_routes(io.StringIO(output), 4))
+
+    def test_dumps_prefix_routes__same_as_json_dumps(self):
+        assert frr_json.dumps_prefix_routes(ROUTES.items()) == json.dumps(ROUTES)
+        assert frr_json.dumps_prefix_routes([]) == json.dumps({})
+
+    def test_stream_command_routes(self):
+        cmd = [sys.executable, "-c", "import sys; sys.stdout.write(sys.argv[1])", json.dumps(ROUTES)]
+
+        assert list(frr_json.stream_command_routes(cmd, 16)) == list(ROUTES.items())
+
+    def test_stream_command_routes__command_fails(self):
+        cmd = [sys.executable, "-c", "print('% Unknown command'); exit(1)"]
+
+        with pytest.raises(subprocess.CalledProcessError):
+            list(frr_json.stream_command_routes(cmd))
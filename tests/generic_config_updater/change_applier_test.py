@@ -1,6 +1,7 @@
 import copy
 import json
 import jsondiff
+import jsonpatch
 import os
 import unittest
 from collections import defaultdict
@@ -9,6 +10,7 @@ from unittest.mock import patch, Mock, call
 import generic_config_updater.change_applier
 import generic_config_updater.services_validator
 import generic_config_updater.gu_common
+from generic_config_updater.gu_common import JsonChange
 
 SCRIPT_DIR = os.path.dirname(os.path.realpath(__file__))
 DATA_FILE =  os.path.join(SCRIPT_DIR, "files", "change_applier_test.data.json")
@@ -281,6 +283,134 @@ class TestChangeApplier(unittest.TestCase):
 
         debug_print("all good for applier")
 
+    @patch("generic_config_updater.change_applier.configDbSnapshotCache")
+    @patch("generic_config_updater.change_applier.get_config_db_as_json")
+    @patch("generic_config_updater.change_applier.get_config_db")
+    @patch("generic_config_updater.change_applier.set_config")
+    def test_change_apply__direct_read__snapshot_invalidated_after_write(self, mock_set, mock_db, mock_get_config,
+                                                                         mock_snapshot_cache):
+        mock_db.return_value = DB_HANDLE
+        generic_config_updater.change_applier.ChangeApplier.updater_conf = {"tables": {}, "services": {}}
+        config = {"PORT": {"Ethernet0": {"mtu": "9100"}}}
+        updated_config = {"PORT": {"Ethernet0": {"mtu": "9000"}}}
+        mock_get_config.side_effect = [copy.deepcopy(config), copy.deepcopy(updated_config)]
+        change = JsonChange(jsonpatch.JsonPatch(
+            [{"op": "replace", "path": "/PORT/Ethernet0/mtu", "value": "9000"}]))
+
+        applier = generic_config_updater.change_applier.ChangeApplier(direct_read=True)
+        ret = applier.apply(change)
+
+        assert ret == 0
+        mock_set.assert_called_once_with(DB_HANDLE, "PORT", "Ethernet0", {"mtu": "9000"})
+        mock_get_config.assert_has_calls([call("", True), call("", True)])
+        mock_snapshot_cache.invalidate.assert_called_once_with("")
+
+
+# mimics the pipelined writes, by calling set_entry for each entry
+#
+def set_entries(config_db, entries):
+    for tbl, key, _, data in entries:
+        set_entry(DB_HANDLE, tbl, key, data)
+
+
+class TestBatchedChangeApplier(unittest.TestCase):
+
+    @patch("generic_config_updater.change_applier.get_config_db")
+    @patch("generic_config_updater.change_applier.get_config_db_pipe")
+    @patch("generic_config_updater.change_applier.read_config")
+    @patch("generic_config_updater.change_applier.set_config_batch")
+    @patch("generic_config_updater.change_applier.set_config")
+    def test_change_apply(self, mock_set, mock_set_batch, mock_read, mock_db_pipe, mock_db):
+        global read_data, running_config, json_changes, json_change_index
+        global start_running_config
+
+        mock_db.return_value = DB_HANDLE
+        mock_db_pipe.return_value = DB_HANDLE
+        mock_read.side_effect = lambda config_db: copy.deepcopy(running_config)
+        mock_set_batch.side_effect = set_entries
+
+        with open(DATA_FILE, "r") as s:
+            read_data = json.load(s)
+
+        running_config = copy.deepcopy(read_data["running_data"])
+        json_changes = copy.deepcopy(read_data["json_changes"])
+
+        generic_config_updater.change_applier.ChangeApplier.updater_conf = None
+        generic_config_updater.change_applier.UPDATER_CONF_FILE = CONF_FILE
+        generic_config_updater.change_applier.set_verbose(True)
+        generic_config_updater.services_validator.set_verbose(True)
+
+        applier = generic_config_updater.change_applier.BatchedChangeApplier()
+
+        for i in range(len(json_changes)):
+            json_change_index = i
+            start_running_config = copy.deepcopy(running_config)
+
+            applier.apply(mock_obj())
+
+            assert not json_changes[i]["update"]
+            assert not json_changes[i]["remove"]
+            assert not json_changes[i].get("services_validated", [])
+
+        assert read_data["running_data"] == running_config
+        assert applier.running_config == running_config
+
+        # CONFIG_DB is read only once, and written once per change with entries
+        mock_read.assert_called_once_with(DB_HANDLE)
+        expected_batches = len([change for change in read_data["json_changes"]
+                                if change["update"] or change["remove"]])
+        self.assertEqual(expected_batches, mock_set_batch.call_count)
+        mock_set.assert_not_called()
+
+    @patch("generic_config_updater.change_applier.get_config_db")
+    @patch("generic_config_updater.change_applier.get_config_db_pipe")
+    @patch("generic_config_updater.change_applier.read_config")
+    @patch("generic_config_updater.change_applier.set_config_batch")
+    def test_apply__write_fails__running_config_read_again(self, mock_set_batch, mock_read, mock_db_pipe, mock_db):
+        # Arrange
+        mock_read.return_value = {"PORT": {"Ethernet0": {"mtu": "9100"}}}
+        mock_set_batch.side_effect = Exception("redis error")
+        change = Mock()
+        change.apply.side_effect = lambda config: {"PORT": {"Ethernet0": {"mtu": "1500"}}}
+        applier = generic_config_updater.change_applier.BatchedChangeApplier()
+
+        # Act and Assert
+        self.assertRaises(Exception, applier.apply, change)
+        self.assertIsNone(applier.running_config)
+        mock_set_batch.assert_called_once_with(
+            mock_db_pipe.return_value,
+            [("PORT", "Ethernet0", {"mtu": "9100"}, {"mtu": "1500"})])
+
+
+class TestSetConfigBatch(unittest.TestCase):
+
+    @patch("generic_config_updater.change_applier.Table")
+    @patch("generic_config_updater.change_applier.RedisPipeline")
+    def test_set_config_batch__single_pipeline_flush(self, mock_pipeline, mock_table):
+        # Arrange
+        config_db = Mock()
+        config_db.typed_to_raw.side_effect = lambda data: data
+        entries = [
+            ("PORT", "Ethernet0", {"mtu": "9100", "alias": "etp1"}, {"mtu": "1500"}),
+            ("PORT", "Ethernet4", None, {"mtu": "9100"}),
+            ("VLAN", "Vlan1000", {"vlanid": "1000", "dhcp_servers": ["1.1.1.1"]}, {"vlanid": "1000"}),
+            ("ACL_TABLE", "DATAACL", {"type": "L3"}, None),
+        ]
+        tables = {}
+        mock_table.side_effect = lambda pipeline, tbl, buffered: tables.setdefault(tbl, Mock())
+
+        # Act
+        generic_config_updater.change_applier.set_config_batch(config_db, entries)
+
+        # Assert
+        self.assertEqual(3, mock_table.call_count)
+        tables["PORT"].set.assert_has_calls([call("Ethernet0", [("mtu", "1500")]),
+                                             call("Ethernet4", [("mtu", "9100")])])
+        tables["PORT"].hdel.assert_called_once_with("Ethernet0", "alias")
+        tables["VLAN"].hdel.assert_called_once_with("Vlan1000", "dhcp_servers@")
+        tables["ACL_TABLE"]._del.assert_called_once_with("DATAACL")
+        mock_pipeline.return_value.flush.assert_called_once()
+
 
 class TestDryRunChangeApplier(unittest.TestCase):
     def test_apply__calls_apply_change_to_config_db(self):
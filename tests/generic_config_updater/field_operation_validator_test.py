@@ -471,6 +471,48 @@ class TestValidateFieldOperation(unittest.TestCase):
             target_config
         )
 
+    def test_validate_field_operation_illegal__pfcwd__patch_given(self):
+        old_config = {"PFC_WD": {"GLOBAL": {"POLL_INTERVAL": "60"}}, "PORT": {"Ethernet0": {"mtu": "9100"}}}
+        target_config = {"PFC_WD": {"GLOBAL": {}}, "PORT": {"Ethernet0": {"mtu": "9100"}}}
+        patch = [{"op": "replace", "path": "/PFC_WD/GLOBAL", "value": {}}]
+        config_wrapper = gu_common.ConfigWrapper()
+        self.assertRaises(
+            gu_common.IllegalPatchOperationError,
+            config_wrapper.validate_field_operation,
+            old_config,
+            target_config,
+            patch
+        )
+
+    def test_validate_field_operation__patch_given__only_patch_tables_compared(self):
+        old_config = {"PORT": {"Ethernet0": {"mtu": "9100"}}, "VLAN": {"Vlan1000": {"vlanid": "1000"}}}
+        target_config = {"PORT": {"Ethernet0": {"mtu": "9100"}}, "VLAN": {"Vlan1000": {"vlanid": "1000", "mtu": "9100"}}}
+        patch = [{"op": "add", "path": "/VLAN/Vlan1000/mtu", "value": "9100"}]
+        config_wrapper = gu_common.ConfigWrapper()
+        config_wrapper._get_field_operation_validators = MagicMock(return_value=[])
+
+        config_wrapper.validate_field_operation(old_config, target_config, patch)
+
+        config_wrapper._get_field_operation_validators.assert_called_once_with("VLAN")
+
+    @patch("generic_config_updater.field_operation_validators.read_statedb_entry", mock.Mock(return_value=""))
+    def test_validate_field_operation__validators_resolved_once(self):
+        gu_common.ConfigWrapper.field_operation_conf = None
+        gu_common.ConfigWrapper.field_operation_validators = {}
+        old_config = {"PORT": {"Ethernet3": {"speed": "100"}}}
+        target_config = {"PORT": {"Ethernet3": {"speed": "234"}}}
+        config_wrapper = gu_common.ConfigWrapper()
+
+        with patch("generic_config_updater.gu_common.importlib.import_module",
+                   side_effect=gu_common.importlib.import_module) as mock_import_module:
+            config_wrapper.validate_field_operation(old_config, target_config)
+            gu_common.ConfigWrapper().validate_field_operation(old_config, target_config)
+
+        mock_import_module.assert_called_once_with("generic_config_updater.field_operation_validators", package=None)
+        self.assertEqual([("generic_config_updater.field_operation_validators.port_config_update_validator",
+                           fov.port_config_update_validator)],
+                         gu_common.ConfigWrapper.field_operation_validators["PORT"])
+
 class TestGetAsicName(unittest.TestCase):
 
     @patch('sonic_py_common.device_info.get_sonic_version_info')
@@ -1,3 +1,4 @@
+import copy
 import json
 import os
 import shutil
@@ -394,6 +395,108 @@ class TestFileSystemConfigRollbacker(unittest.TestCase):
                                              config_replacer=replacer,
                                              config_wrapper=config_wrapper)
 
+class TestMultiASICExecutor(unittest.TestCase):
+    def test_run__all_scopes_succeed__results_and_timings_per_scope(self):
+        # Arrange
+        executor = gu.MultiASICExecutor(logger=Mock())
+        scopes = ["localhost", "asic0", "asic1"]
+
+        # Act
+        results, failures = executor.run(lambda scope: scope.upper(), scopes)
+
+        # Assert
+        self.assertEqual({"localhost": "LOCALHOST", "asic0": "ASIC0", "asic1": "ASIC1"}, results)
+        self.assertEqual({}, failures)
+        self.assertCountEqual(scopes, executor.timings.keys())
+
+    def test_run__scope_fails__failure_reported_and_other_scopes_run(self):
+        # Arrange
+        executor = gu.MultiASICExecutor(logger=Mock())
+        error = ValueError("asic1 failed")
+
+        def task(scope):
+            if scope == "asic1":
+                raise error
+            return scope
+
+        # Act
+        results, failures = executor.run(task, ["localhost", "asic0", "asic1"])
+
+        # Assert
+        self.assertEqual({"localhost": "localhost", "asic0": "asic0"}, results)
+        self.assertEqual({"asic1": error}, failures)
+        self.assertIn("asic1", executor.timings)
+
+
+@patch('sonic_py_common.multi_asic.get_namespace_list', MagicMock(return_value=["asic0", "asic1"]))
+@patch('sonic_py_common.multi_asic.is_multi_asic', MagicMock(return_value=True))
+class TestMultiASICConfigReplacer(unittest.TestCase):
+    def setUp(self):
+        self.original_configs = {"localhost": {"DEVICE_METADATA": {"localhost": {"hostname": "old"}}},
+                                 "asic0": {"PORT": {"Ethernet0": {"mtu": "9100"}}},
+                                 "asic1": {"PORT": {"Ethernet4": {"mtu": "9100"}}}}
+        self.target_configs = {"localhost": {"DEVICE_METADATA": {"localhost": {"hostname": "new"}}},
+                               "asic0": {"PORT": {"Ethernet0": {"mtu": "1500"}}},
+                               "asic1": {"PORT": {"Ethernet4": {"mtu": "1500"}}}}
+
+    def test_get_config_json__multi_asic__config_per_scope(self):
+        # Arrange
+        outputs = {"": self.original_configs["localhost"],
+                   "asic0": self.original_configs["asic0"],
+                   "asic1": self.original_configs["asic1"]}
+
+        def get_cmd_output(cmd):
+            scope = cmd[-1] if "-n" in cmd else ""
+            return json.dumps(outputs[scope]), 0
+
+        # Act
+        with patch('generic_config_updater.generic_updater.get_cmd_output', side_effect=get_cmd_output):
+            actual = gu.get_config_json()
+
+        # Assert
+        self.assertEqual(self.original_configs, actual)
+
+    @patch('generic_config_updater.generic_updater.ConfigReplacer')
+    def test_replace__all_scopes_succeed__replaced_in_every_namespace(self, mock_config_replacer):
+        # Arrange
+        replacer = self.create_replacer()
+
+        # Act
+        with patch('generic_config_updater.generic_updater.get_config_json', return_value=self.original_configs):
+            replacer.replace(copy.deepcopy(self.target_configs))
+
+        # Assert
+        mock_config_replacer.assert_has_calls([call(scope=""), call(scope="asic0"), call(scope="asic1")],
+                                              any_order=True)
+        replace_calls = mock_config_replacer.return_value.replace.call_args_list
+        self.assertCountEqual([call(config) for config in self.target_configs.values()], replace_calls)
+
+    @patch('generic_config_updater.generic_updater.ConfigReplacer')
+    def test_replace__one_scope_fails__all_scopes_rolled_back(self, mock_config_replacer):
+        # Arrange
+        replacer = self.create_replacer()
+
+        def replace(config):
+            if config == self.target_configs["asic1"]:
+                raise gu.GenericConfigUpdaterError("asic1 failed")
+        mock_config_replacer.return_value.replace.side_effect = replace
+
+        # Act
+        with patch('generic_config_updater.generic_updater.get_config_json', return_value=self.original_configs):
+            with self.assertRaises(gu.GenericConfigUpdaterError) as context:
+                replacer.replace(copy.deepcopy(self.target_configs))
+
+        # Assert
+        self.assertIn("asic1: asic1 failed", str(context.exception))
+        replace_calls = mock_config_replacer.return_value.replace.call_args_list
+        expected_calls = [call(config) for config in self.target_configs.values()] + \
+                         [call(config) for config in self.original_configs.values()]
+        self.assertCountEqual(expected_calls, replace_calls)
+
+    def create_replacer(self):
+        return gu.MultiASICConfigReplacer(patch_applier=Mock(), config_wrapper=Mock(), patch_wrapper=Mock())
+
+
 class TestGenericUpdateFactory(unittest.TestCase):
     def setUp(self):
         self.any_verbose=True
@@ -414,6 +517,72 @@ class TestGenericUpdateFactory(unittest.TestCase):
                           self.any_ignore_non_yang_tables,
                           self.any_ignore_paths)
 
+    def test_get_change_applier__batch_writes__batched_change_applier(self):
+        # Arrange
+        factory = gu.GenericUpdateFactory(batch_writes=True)
+
+        # Act
+        with patch("generic_config_updater.change_applier.get_config_db"), \
+             patch("generic_config_updater.change_applier.get_config_db_pipe"):
+            change_applier = factory.get_change_applier(False, Mock())
+            dry_run_change_applier = factory.get_change_applier(True, Mock())
+
+        # Assert
+        self.assertIsInstance(change_applier, ca.BatchedChangeApplier)
+        self.assertIsInstance(dry_run_change_applier, ca.DryRunChangeApplier)
+
+    def test_get_patch_sorter__sort_algorithm__passed_to_patch_sorter(self):
+        # Arrange
+        factory = gu.GenericUpdateFactory(sort_algorithm=ps.Algorithm.DFS_IN_PLACE)
+        config_wrapper = Mock()
+        patch_wrapper = Mock()
+
+        # Act
+        strict_patch_sorter = factory.get_patch_sorter(False, [], config_wrapper, patch_wrapper)
+        non_strict_patch_sorter = factory.get_patch_sorter(True, [], config_wrapper, patch_wrapper)
+
+        # Assert
+        self.assertIsInstance(strict_patch_sorter, ps.StrictPatchSorter)
+        self.assertEqual(ps.Algorithm.DFS_IN_PLACE, strict_patch_sorter.algorithm)
+        self.assertIsInstance(non_strict_patch_sorter, ps.NonStrictPatchSorter)
+        self.assertEqual(ps.Algorithm.DFS_IN_PLACE, non_strict_patch_sorter.algorithm)
+        self.assertEqual(ps.Algorithm.DFS, gu.GenericUpdateFactory().get_patch_sorter(
+            False, [], config_wrapper, patch_wrapper).algorithm)
+
+    def test_get_patch_sorter__incremental_validation__passed_to_sort_algorithm_factory(self):
+        # Arrange
+        factory = gu.GenericUpdateFactory(incremental_validation=True)
+        config_wrapper = Mock()
+        patch_wrapper = Mock()
+
+        # Act
+        strict_patch_sorter = factory.get_patch_sorter(False, [], config_wrapper, patch_wrapper)
+        non_strict_patch_sorter = factory.get_patch_sorter(True, [], config_wrapper, patch_wrapper)
+        default_patch_sorter = gu.GenericUpdateFactory().get_patch_sorter(False, [], config_wrapper, patch_wrapper)
+
+        # Assert
+        self.assertTrue(strict_patch_sorter.inner_patch_sorter.sort_algorithm_factory.incremental_validation)
+        self.assertTrue(non_strict_patch_sorter.inner_patch_sorter.sort_algorithm_factory.incremental_validation)
+        self.assertFalse(default_patch_sorter.inner_patch_sorter.sort_algorithm_factory.incremental_validation)
+
+    def test_get_config_wrapper_and_change_applier__direct_read(self):
+        # Arrange
+        factory = gu.GenericUpdateFactory()
+        cfggen_factory = gu.GenericUpdateFactory(direct_read=False)
+
+        # Act
+        with patch("generic_config_updater.change_applier.get_config_db"):
+            config_wrapper = factory.get_config_wrapper(False)
+            dry_run_config_wrapper = factory.get_config_wrapper(True)
+            change_applier = factory.get_change_applier(False, config_wrapper)
+            cfggen_config_wrapper = cfggen_factory.get_config_wrapper(False)
+
+        # Assert
+        self.assertTrue(config_wrapper.direct_read)
+        self.assertTrue(dry_run_config_wrapper.direct_read)
+        self.assertTrue(change_applier.direct_read)
+        self.assertFalse(cfggen_config_wrapper.direct_read)
+
     def test_create_patch_applier__different_options(self):
         # Arrange
         options = [
@@ -763,6 +932,47 @@ class TestGenericUpdater(unittest.TestCase):
         # Assert
         self.assertCountEqual(expected, actual)
 
+    def test_apply_patch__config_db_snapshots_cached_during_operation_only(self):
+        # Arrange
+        patch_applier = Mock()
+        patch_applier.apply.side_effect = lambda patch, sort: self.assertEqual(1, gu.configDbSnapshotCache.operations)
+        factory = Mock()
+        factory.create_patch_applier.return_value = patch_applier
+        generic_updater = gu.GenericUpdater(factory)
+
+        # Act
+        generic_updater.apply_patch(Files.SINGLE_OPERATION_SONIC_YANG_PATCH, self.any_config_format,
+                                    self.any_verbose, self.any_dry_run, self.any_ignore_non_yang_tables,
+                                    self.any_ignore_paths)
+
+        # Assert
+        patch_applier.apply.assert_called_once()
+        self.assertEqual(0, gu.configDbSnapshotCache.operations)
+
+    def test_init__batch_writes__passed_to_factory(self):
+        # Act
+        generic_updater = gu.GenericUpdater(batch_writes=True)
+
+        # Assert
+        self.assertTrue(generic_updater.generic_update_factory.batch_writes)
+        self.assertFalse(gu.GenericUpdater().generic_update_factory.batch_writes)
+
+    def test_init__sort_algorithm__passed_to_factory(self):
+        # Act
+        generic_updater = gu.GenericUpdater(sort_algorithm=ps.Algorithm.DFS_IN_PLACE)
+
+        # Assert
+        self.assertEqual(ps.Algorithm.DFS_IN_PLACE, generic_updater.generic_update_factory.sort_algorithm)
+        self.assertEqual(ps.Algorithm.DFS, gu.GenericUpdater().generic_update_factory.sort_algorithm)
+
+    def test_init__incremental_validation__passed_to_factory(self):
+        # Act
+        generic_updater = gu.GenericUpdater(incremental_validation=True)
+
+        # Assert
+        self.assertTrue(generic_updater.generic_update_factory.incremental_validation)
+        self.assertFalse(gu.GenericUpdater().generic_update_factory.incremental_validation)
+
 class TestDecorator(unittest.TestCase):
     def setUp(self):
         self.decorated_patch_applier = Mock()
@@ -942,3 +1152,92 @@ class TestConfigLockDecorator(unittest.TestCase):
                                       decorated_patch_applier=patch_applier,
                                       decorated_config_replacer=config_replacer,
                                       decorated_config_rollbacker=config_rollbacker)
+
+
+class TestProfileDecorator(unittest.TestCase):
+    def setUp(self):
+        self.any_checkpoint_name = "anycheckpoint"
+
+    def test_apply__profile_report_printed(self):
+        # Arrange
+        profile_decorator = self.__create_profile_decorator()
+        def apply(patch):
+            with gu.genericUpdaterProfiler.phase("sort"):
+                gu.genericUpdaterProfiler.increment("moves_generated", 3)
+            gu.genericUpdaterProfiler.increment("redis_writes")
+        profile_decorator.decorated_patch_applier.apply.side_effect = apply
+
+        # Act
+        with patch("builtins.print") as mock_print:
+            profile_decorator.apply(Files.SINGLE_OPERATION_SONIC_YANG_PATCH)
+
+        # Assert
+        profile_decorator.decorated_patch_applier.apply.assert_has_calls(
+            [call(Files.SINGLE_OPERATION_SONIC_YANG_PATCH)])
+        report = json.loads(mock_print.call_args[0][0])
+        self.assertEqual("apply-patch", report["operation"])
+        self.assertEqual("localhost", report["scope"])
+        self.assertTrue(report["succeeded"])
+        self.assertEqual(1, report["phases"]["sort"]["count"])
+        self.assertEqual({"moves_generated": 3, "moves_validated": 0, "cfggen_invocations": 0, "redis_writes": 1},
+                         report["counters"])
+        self.assertIsNone(gu.genericUpdaterProfiler.get_session())
+
+    def test_replace__failure__profile_report_printed(self):
+        # Arrange
+        profile_decorator = self.__create_profile_decorator()
+        profile_decorator.decorated_config_replacer.replace.side_effect = gu.GenericConfigUpdaterError("failed")
+
+        # Act and assert
+        with patch("builtins.print") as mock_print:
+            self.assertRaises(gu.GenericConfigUpdaterError, profile_decorator.replace, Files.SONIC_YANG_AS_JSON)
+
+        report = json.loads(mock_print.call_args[0][0])
+        self.assertEqual("replace", report["operation"])
+        self.assertFalse(report["succeeded"])
+        self.assertIsNone(gu.genericUpdaterProfiler.get_session())
+
+    def test_rollback__profile_report_printed(self):
+        # Arrange
+        profile_decorator = self.__create_profile_decorator()
+
+        # Act
+        with patch("builtins.print") as mock_print:
+            profile_decorator.rollback(self.any_checkpoint_name)
+
+        # Assert
+        profile_decorator.decorated_config_rollbacker.rollback.assert_has_calls([call(self.any_checkpoint_name)])
+        report = json.loads(mock_print.call_args[0][0])
+        self.assertEqual("rollback", report["operation"])
+        self.assertTrue(report["succeeded"])
+
+    def test_multi_asic_executor__workers_join_session(self):
+        # Arrange
+        executor = gu.MultiASICExecutor(logger=Mock())
+        gu.genericUpdaterProfiler.start("replace")
+
+        # Act
+        executor.run(lambda scope: gu.genericUpdaterProfiler.increment("redis_writes"), ["localhost", "asic0"])
+        report = gu.genericUpdaterProfiler.stop()
+
+        # Assert
+        self.assertEqual(2, report["counters"]["redis_writes"])
+        self.assertCountEqual(["localhost", "asic0"], report["scopes"].keys())
+        self.assertAlmostEqual(executor.timings["asic0"], report["scopes"]["asic0"], places=5)
+
+    def test_create_patch_applier__profile__profile_decorator(self):
+        # Arrange
+        factory = gu.GenericUpdateFactory(profile=True)
+
+        # Act
+        with patch("generic_config_updater.change_applier.get_config_db"):
+            patch_applier = factory.create_patch_applier(gu.ConfigFormat.CONFIGDB, False, False, False, [])
+
+        # Assert
+        self.assertIsInstance(patch_applier, gu.ProfileDecorator)
+        self.assertIsInstance(patch_applier.decorated_patch_applier, gu.ConfigLockDecorator)
+
+    def __create_profile_decorator(self):
+        return gu.ProfileDecorator(decorated_patch_applier=Mock(),
+                                   decorated_config_replacer=Mock(),
+                                   decorated_config_rollbacker=Mock())
@@ -494,6 +494,187 @@ class TestConfigWrapper(unittest.TestCase):
         check(sy1, config_wrapper.sonic_yang_with_loaded_models)
         check(sy2, config_wrapper.sonic_yang_with_loaded_models)
 
+class TestIncrementalConfigValidator(unittest.TestCase):
+    def setUp(self):
+        self.config_wrapper = gu_common.ConfigWrapper()
+        self.validator = gu_common.IncrementalConfigValidator(self.config_wrapper)
+
+    def test_validate__same_results_as_full_validation(self):
+        # Arrange
+        configs = [Files.CONFIG_DB_AS_JSON,
+                   Files.SINGLE_OPERATION_CONFIG_DB_PATCH.apply(Files.CONFIG_DB_AS_JSON),
+                   Files.CONFIG_DB_AS_JSON_INVALID,
+                   Files.CONFIG_DB_AS_JSON,
+                   Files.MULTI_OPERATION_CONFIG_DB_PATCH.apply(Files.CONFIG_DB_AS_JSON)]
+
+        for config in configs:
+            expected, _ = self.config_wrapper.validate_config_db_config(config)
+
+            # Act
+            actual, error = self.validator.validate(config)
+
+            # Assert
+            self.assertEqual(expected, actual)
+            self.assertEqual(expected, error is None)
+
+    def test_validate__small_change__data_tree_not_reloaded(self):
+        # Arrange
+        current_config = Files.CONFIG_DB_AS_JSON
+        self.validator.validate(current_config)
+        self.validator._load = MagicMock(side_effect=self.validator._load)
+        simulated_config = copy.deepcopy(current_config)
+        simulated_config["VLAN_MEMBER"].pop(next(iter(simulated_config["VLAN_MEMBER"])))
+
+        # Act
+        simulated_result = self.validator.validate(simulated_config)
+        reverted_result = self.validator.validate(current_config)
+
+        # Assert
+        self.assertEqual(self.config_wrapper.validate_config_db_config(simulated_config), simulated_result)
+        self.assertEqual((True, None), reverted_result)
+        self.validator._load.assert_not_called()
+        self.assertEqual(self.config_wrapper.crop_tables_without_yang(current_config), self.validator.loaded_config)
+
+    def test_validate__base_version_given__only_changed_keys_compared(self):
+        # Arrange
+        current_config = Files.CONFIG_DB_AS_JSON
+        member = next(iter(current_config["VLAN_MEMBER"]))
+        simulated_config = copy.deepcopy(current_config)
+        simulated_config["VLAN_MEMBER"].pop(member)
+        other_member = next(iter(simulated_config["VLAN_MEMBER"]))
+        other_simulated_config = copy.deepcopy(current_config)
+        other_simulated_config["VLAN_MEMBER"].pop(other_member)
+        self.validator.validate(current_config, 1, set())
+        self.validator._get_changed_keys = MagicMock(side_effect=self.validator._get_changed_keys)
+
+        # Act
+        simulated_result = self.validator.validate(simulated_config, 1, {("VLAN_MEMBER", member)})
+        other_result = self.validator.validate(other_simulated_config, 1, {("VLAN_MEMBER", other_member)})
+
+        # Assert
+        self.assertEqual(self.config_wrapper.validate_config_db_config(simulated_config), simulated_result)
+        self.assertEqual(self.config_wrapper.validate_config_db_config(other_simulated_config), other_result)
+        self.validator._get_changed_keys.assert_called_with(other_simulated_config,
+                                                            {("VLAN_MEMBER", member), ("VLAN_MEMBER", other_member)})
+        self.assertEqual(self.config_wrapper.crop_tables_without_yang(other_simulated_config),
+                         self.validator.loaded_config)
+
+    def test_validate__base_version_changed__all_tables_compared(self):
+        # Arrange
+        current_config = Files.CONFIG_DB_AS_JSON
+        self.validator.validate(current_config, 1, set())
+        self.validator._get_changed_keys = MagicMock(side_effect=self.validator._get_changed_keys)
+        simulated_config = copy.deepcopy(current_config)
+        simulated_config["VLAN_MEMBER"].pop(next(iter(simulated_config["VLAN_MEMBER"])))
+
+        # Act
+        self.validator.validate(simulated_config, 2, set())
+
+        # Assert
+        self.validator._get_changed_keys.assert_called_once_with(simulated_config, None)
+        self.assertEqual(self.config_wrapper.crop_tables_without_yang(simulated_config), self.validator.loaded_config)
+
+class TestSonicYangDataTree(unittest.TestCase):
+    def setUp(self):
+        self.config_wrapper = gu_common.ConfigWrapper()
+        self.path_addressing = gu_common.PathAddressing(self.config_wrapper)
+        self.config = Files.CROPPED_CONFIG_DB_AS_JSON
+        self.sy = self.config_wrapper.create_sonic_yang_with_loaded_models()
+        self.sy.loadData(copy.deepcopy(self.config))
+        self.data_tree = gu_common.SonicYangDataTree(self.sy)
+        self.xpath = self.path_addressing.convert_path_to_xpath("/VLAN_MEMBER/Vlan1000|Ethernet0", self.config,
+                                                                self.sy)
+
+    def test_find_node(self):
+        self.assertIsNotNone(self.data_tree.find_node(self.xpath))
+        self.assertIsNone(self.data_tree.find_node(self.xpath.replace("Ethernet0", "Ethernet100")))
+
+    def test_remove_node__then_add_config__same_data_tree(self):
+        # Arrange
+        expected = self.sy.getData()
+
+        # Act
+        self.data_tree.remove_node(self.xpath)
+        removed = self.data_tree.find_node(self.xpath)
+        self.data_tree.add_config({"VLAN_MEMBER": {"Vlan1000|Ethernet0":
+                                                   self.config["VLAN_MEMBER"]["Vlan1000|Ethernet0"]}})
+
+        # Assert
+        self.assertIsNone(removed)
+        self.assertIsNotNone(self.data_tree.find_node(self.xpath))
+        self.assertEqual(expected, self.sy.getData())
+        self.sy.validate_data_tree()
+
+class TestLeafrefReverseIndex(unittest.TestCase):
+    def setUp(self):
+        self.config_wrapper = gu_common.ConfigWrapper()
+        self.path_addressing = gu_common.PathAddressing(self.config_wrapper)
+        self.index = gu_common.LeafrefReverseIndex(self.config_wrapper)
+
+    def test_find_ref_paths__same_results_as_data_dependencies(self):
+        # Arrange
+        config = Files.CROPPED_CONFIG_DB_AS_JSON
+        without_member = copy.deepcopy(config)
+        without_member["VLAN_MEMBER"].pop("Vlan1000|Ethernet4")
+        with_acl_port = copy.deepcopy(config)
+        with_acl_port["ACL_TABLE"]["DATAACL"]["ports"].append("Ethernet8")
+        cases = [("/PORT/Ethernet0", config),
+                 ("/VLAN/Vlan1000", config),
+                 ("/VLAN/Vlan1000", without_member),
+                 ("/PORT/Ethernet8", with_acl_port),
+                 ("/PORT", with_acl_port),
+                 ("", without_member),
+                 ("/PORT", config),
+                 ("/PORT/Ethernet8", Files.CONFIG_DB_WITH_INTERFACE),
+                 ("/PORTCHANNEL/PortChannel0001", Files.CONFIG_DB_WITH_PORTCHANNEL_AND_ACL),
+                 ("/BUFFER_PROFILE/egress_lossless_profile", Files.CONFIG_DB_WITH_PROFILE_LIST)]
+
+        for path, case_config in cases:
+            expected = self.path_addressing._find_leafref_paths(path, case_config)
+
+            # Act
+            actual = self.index.find_ref_paths(path, case_config)
+
+            # Assert
+            self.assertEqual(expected, actual)
+
+    def test_find_ref_paths__small_change__index_updated_without_reload(self):
+        # Arrange
+        config = Files.CROPPED_CONFIG_DB_AS_JSON
+        self.index.find_ref_paths("/VLAN/Vlan1000", config)
+        self.index._load = MagicMock(side_effect=self.index._load)
+        simulated_config = copy.deepcopy(config)
+        simulated_config["VLAN_MEMBER"].pop("Vlan1000|Ethernet0")
+
+        # Act
+        simulated_refs = self.index.find_ref_paths("/VLAN/Vlan1000", simulated_config)
+        reverted_refs = self.index.find_ref_paths("/VLAN/Vlan1000", config)
+
+        # Assert
+        self.assertEqual(["/VLAN_MEMBER/Vlan1000|Ethernet4", "/VLAN_MEMBER/Vlan1000|Ethernet8"], simulated_refs)
+        self.assertEqual(["/VLAN_MEMBER/Vlan1000|Ethernet0",
+                          "/VLAN_MEMBER/Vlan1000|Ethernet4",
+                          "/VLAN_MEMBER/Vlan1000|Ethernet8"], reverted_refs)
+        self.index._load.assert_not_called()
+
+    def test_path_addressing_find_ref_paths__index_fails__falls_back_to_data_dependencies(self):
+        # Arrange
+        path_addressing = gu_common.PathAddressing(self.config_wrapper)
+        path_addressing.leafref_index = Mock()
+        path_addressing.leafref_index.find_ref_paths.side_effect = Exception("index failure")
+        path_addressing._find_leafref_paths = MagicMock(return_value=["/VLAN_MEMBER/Vlan1000|Ethernet0"])
+        mock_logger = Mock()
+
+        # Act
+        with patch.object(gu_common.genericUpdaterLogging, "get_logger", return_value=mock_logger):
+            actual = path_addressing.find_ref_paths("/VLAN/Vlan1000", Files.CROPPED_CONFIG_DB_AS_JSON)
+
+        # Assert
+        self.assertEqual(["/VLAN_MEMBER/Vlan1000|Ethernet0"], actual)
+        self.assertIsNone(path_addressing.leafref_index)
+        mock_logger.log_warning.assert_called_once()
+        self.assertIn("index failure", mock_logger.log_warning.call_args[0][0])
+
 class TestPatchWrapper(unittest.TestCase):
     def setUp(self):
         self.config_wrapper_mock = gu_common.ConfigWrapper()
@@ -1116,3 +1297,195 @@ class TestPathAddressing(unittest.TestCase):
         check(config={"ANOTHER_TABLE": {}, "TABLE":{"key1":{"key11":{"key111":[1,2,3,4,5]}}}},
               path="/TABLE/key1/key11/key111/5",
               expected=False)
+
+
+class TestConfigDbSnapshotCache(unittest.TestCase):
+    def setUp(self):
+        self.config_db = MagicMock()
+        self.config_db.get_config.return_value = {
+            "PORT": {"Ethernet0": {"lanes": "0,1"}},
+            "VLAN_MEMBER": {("Vlan1000", "Ethernet0"): {"tagging_mode": "untagged"}},
+            "bgpraw": {}
+        }
+        self.config_db.serialize_key.side_effect = lambda key: "|".join(key) if isinstance(key, tuple) else key
+        self.expected = {
+            "PORT": {"Ethernet0": {"lanes": "0,1"}},
+            "VLAN_MEMBER": {"Vlan1000|Ethernet0": {"tagging_mode": "untagged"}}
+        }
+
+    @patch('generic_config_updater.gu_common.ConfigDBPipeConnector')
+    def test_get__same_format_as_cfggen(self, mock_connector):
+        mock_connector.return_value = self.config_db
+        cache = gu_common.ConfigDbSnapshotCache()
+
+        self.assertEqual(self.expected, cache.get("asic0"))
+        mock_connector.assert_called_once_with(use_unix_socket_path=True, namespace="asic0")
+
+    @patch('generic_config_updater.gu_common.ConfigDBPipeConnector')
+    def test_get__no_writes__read_once(self, mock_connector):
+        mock_connector.return_value = self.config_db
+        cache = gu_common.ConfigDbSnapshotCache()
+
+        with cache.operation():
+            first = cache.get()
+            first["PORT"].clear()
+            second = cache.get()
+
+        self.assertEqual(self.expected, second)
+        self.config_db.get_config.assert_called_once()
+
+    @patch('generic_config_updater.gu_common.ConfigDBPipeConnector')
+    def test_get__after_invalidate__read_again(self, mock_connector):
+        mock_connector.return_value = self.config_db
+        cache = gu_common.ConfigDbSnapshotCache()
+
+        with cache.operation():
+            cache.get("asic0")
+            cache.invalidate("asic0")
+            cache.get("asic0")
+            cache.invalidate("asic1")
+            cache.get("asic0")
+
+        self.assertEqual(2, self.config_db.get_config.call_count)
+
+    @patch('generic_config_updater.gu_common.ConfigDBPipeConnector')
+    def test_get__write_while_reading__not_cached(self, mock_connector):
+        mock_connector.return_value = self.config_db
+        cache = gu_common.ConfigDbSnapshotCache()
+        config = self.config_db.get_config.return_value
+        def get_config():
+            cache.invalidate()
+            return config
+        self.config_db.get_config.side_effect = get_config
+
+        with cache.operation():
+            cache.get()
+            cache.get()
+
+        self.assertEqual(2, self.config_db.get_config.call_count)
+
+    @patch('generic_config_updater.gu_common.ConfigDBPipeConnector')
+    def test_get__expired__read_again(self, mock_connector):
+        mock_connector.return_value = self.config_db
+        cache = gu_common.ConfigDbSnapshotCache(ttl_seconds=0)
+
+        with cache.operation():
+            cache.get()
+            cache.get()
+
+        self.assertEqual(2, self.config_db.get_config.call_count)
+
+    @patch('generic_config_updater.gu_common.ConfigDBPipeConnector')
+    def test_get__no_operation__read_every_time(self, mock_connector):
+        mock_connector.return_value = self.config_db
+        cache = gu_common.ConfigDbSnapshotCache()
+
+        cache.get()
+        cache.get()
+
+        self.assertEqual(2, self.config_db.get_config.call_count)
+
+    @patch('generic_config_updater.gu_common.ConfigDBPipeConnector')
+    def test_get__next_operation__read_again(self, mock_connector):
+        mock_connector.return_value = self.config_db
+        cache = gu_common.ConfigDbSnapshotCache()
+
+        with cache.operation():
+            cache.get()
+            with cache.operation():
+                cache.get()
+            # The outer operation is still running, its snapshot is kept
+            cache.get()
+        with cache.operation():
+            cache.get()
+
+        self.assertEqual(2, self.config_db.get_config.call_count)
+        self.assertEqual({}, cache.snapshots)
+
+    @patch('generic_config_updater.gu_common.configDbSnapshotCache')
+    @patch('generic_config_updater.gu_common.subprocess.Popen')
+    def test_config_wrapper__direct_read__no_cfggen(self, mock_popen, mock_snapshot_cache):
+        mock_snapshot_cache.get.return_value = self.expected
+        config_wrapper = gu_common.ConfigWrapper(scope="asic0", direct_read=True)
+
+        self.assertEqual(self.expected, config_wrapper.get_config_db_as_json())
+        mock_snapshot_cache.get.assert_called_once_with("asic0")
+        mock_popen.assert_not_called()
+
+class TestGenericUpdaterProfiler(unittest.TestCase):
+    def test_phase_and_increment__no_session__ignored(self):
+        # Arrange
+        profiler = gu_common.GenericUpdaterProfiler()
+
+        # Act
+        with profiler.phase("sort"):
+            profiler.increment("moves_generated")
+
+        # Assert
+        self.assertIsNone(profiler.get_session())
+        self.assertIsNone(profiler.stop())
+
+    def test_report__phases_and_counters_accumulated(self):
+        # Arrange
+        profiler = gu_common.GenericUpdaterProfiler()
+        profiler.start("apply-patch", "asic0")
+
+        # Act
+        for _ in range(3):
+            with profiler.phase("apply_change"):
+                profiler.increment("redis_writes", 2)
+        profiler.increment("moves_validated")
+        report = profiler.stop()
+
+        # Assert
+        self.assertEqual("apply-patch", report["operation"])
+        self.assertEqual("asic0", report["scope"])
+        self.assertEqual(3, report["phases"]["apply_change"]["count"])
+        self.assertGreaterEqual(report["phases"]["apply_change"]["seconds"], 0)
+        self.assertEqual({"moves_generated": 0, "moves_validated": 1, "cfggen_invocations": 0, "redis_writes": 6},
+                         report["counters"])
+        self.assertEqual({}, report["scopes"])
+        self.assertIsNone(profiler.get_session())
+
+    def test_add_scope__scope_seconds_accumulated(self):
+        # Arrange
+        profiler = gu_common.GenericUpdaterProfiler()
+        profiler.start("replace")
+
+        # Act
+        profiler.add_scope("asic0", 1.5)
+        profiler.add_scope("asic0", 0.5)
+        profiler.add_scope("localhost", 1)
+        report = profiler.stop()
+
+        # Assert
+        self.assertEqual({"asic0": 2.0, "localhost": 1}, report["scopes"])
+
+    def test_phase__exception__phase_still_recorded(self):
+        # Arrange
+        profiler = gu_common.GenericUpdaterProfiler()
+        profiler.start("replace")
+
+        # Act
+        with self.assertRaises(ValueError):
+            with profiler.phase("verify"):
+                raise ValueError()
+
+        # Assert
+        self.assertEqual(1, profiler.stop()["phases"]["verify"]["count"])
+
+    @patch('generic_config_updater.gu_common.subprocess.Popen')
+    def test_get_config_db_as_text__cfggen_invocation_counted(self, mock_popen):
+        # Arrange
+        mock_proc = MagicMock()
+        mock_proc.communicate = MagicMock(return_value=('{}', None))
+        mock_proc.returncode = 0
+        mock_popen.return_value = mock_proc
+        gu_common.genericUpdaterProfiler.start("apply-patch")
+
+        # Act
+        gu_common.get_config_db_as_text()
+        report = gu_common.genericUpdaterProfiler.stop()
+
+        # Assert
+        self.assertEqual(1, report["counters"]["cfggen_invocations"])
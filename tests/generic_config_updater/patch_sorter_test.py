@@ -1,12 +1,41 @@
 from collections import OrderedDict
+import copy
 import jsonpatch
 import unittest
-from unittest.mock import MagicMock, Mock
+from unittest.mock import MagicMock, Mock, patch
 
 import generic_config_updater.patch_sorter as ps
 from .gutest_helpers import Files, create_side_effect_dict
 from generic_config_updater.gu_common import ConfigWrapper, PatchWrapper, OperationWrapper, \
-                                             GenericConfigUpdaterError, OperationType, JsonChange, PathAddressing
+                                             GenericConfigUpdaterError, OperationType, JsonChange, PathAddressing, \
+                                             IncrementalConfigValidator
+
+class TestConfigHasher(unittest.TestCase):
+    def setUp(self):
+        self.hasher = ps.ConfigHasher()
+
+    def test_hash_config__same_config_different_key_order__same_hash(self):
+        # Arrange
+        config1 = {"PORT": {"Ethernet0": {"mtu": "9100"}, "Ethernet4": {}}, "VLAN": {}}
+        config2 = {"VLAN": {}, "PORT": {"Ethernet4": {}, "Ethernet0": {"mtu": "9100"}}}
+
+        # Act and Assert
+        self.assertEqual(self.hasher.hash_config(config1), self.hasher.hash_config(config2))
+
+    def test_hash_config__empty_table_removed__different_hash(self):
+        # Arrange
+        config1 = {"PORT": {"Ethernet0": {}}, "VLAN": {}}
+        config2 = {"PORT": {"Ethernet0": {}}}
+
+        # Act and Assert
+        self.assertNotEqual(self.hasher.hash_config(config1), self.hasher.hash_config(config2))
+
+    def test_get_scope__returns_table_key_for_nested_paths(self):
+        config = {"PORT": {"Ethernet0": {"lanes": "1,2"}}}
+
+        self.assertEqual([], self.hasher.get_scope(config, []))
+        self.assertEqual(["PORT"], self.hasher.get_scope(config, ["PORT"]))
+        self.assertEqual(["PORT", "Ethernet0"], self.hasher.get_scope(config, ["PORT", "Ethernet0", "lanes"]))
 
 class TestDiff(unittest.TestCase):
     def test_apply_move__updates_current_config(self):
@@ -108,6 +137,69 @@ class TestDiff(unittest.TestCase):
         self.assertEqual(diff, other_diff)
         self.assertTrue(diff == other_diff)
 
+    def test_apply_move_in_place__updates_current_config_in_place(self):
+        # Arrange
+        current_config = Files.CROPPED_CONFIG_DB_AS_JSON
+        diff = ps.Diff(current_config=current_config, target_config=Files.ANY_CONFIG_DB)
+        move = ps.JsonMove.from_patch(Files.SINGLE_OPERATION_CONFIG_DB_PATCH)
+
+        # Act
+        actual = diff.apply_move_in_place(move)
+
+        # Assert
+        self.assertIs(diff, actual)
+        self.assertIs(current_config, actual.current_config)
+        self.assertEqual(Files.CONFIG_DB_AFTER_SINGLE_OPERATION, actual.current_config)
+
+    def test_undo_move__reverts_moves_in_reverse_order(self):
+        # Arrange
+        current_config = {"VLAN": {"Vlan1000": {"vlanid": "1000", "dhcp_servers": ["1.1.1.1", "2.2.2.2"]}}}
+        expected = {"VLAN": {"Vlan1000": {"vlanid": "1000", "dhcp_servers": ["1.1.1.1", "2.2.2.2"]}}}
+        diff = ps.Diff(current_config=current_config, target_config={})
+        operations = [
+            {"op": "add", "path": "/VLAN/Vlan1000/dhcp_servers/1", "value": "3.3.3.3"},
+            {"op": "remove", "path": "/VLAN/Vlan1000/dhcp_servers/0"},
+            {"op": "replace", "path": "/VLAN/Vlan1000/vlanid", "value": "1001"},
+            {"op": "add", "path": "/VLAN/Vlan1001", "value": {"vlanid": "1001"}},
+            {"op": "remove", "path": "/VLAN/Vlan1000/dhcp_servers"},
+            {"op": "replace", "path": "", "value": {"PORT": {"Ethernet0": {}}}},
+        ]
+        moves = [ps.JsonMove.from_operation(operation) for operation in operations]
+
+        # Act and Assert
+        simulated_config = {"VLAN": {"Vlan1000": {"vlanid": "1000", "dhcp_servers": ["1.1.1.1", "2.2.2.2"]}}}
+        for move in moves:
+            simulated_config = move.apply(simulated_config)
+            diff.apply_move_in_place(move)
+            self.assertEqual(simulated_config, diff.current_config)
+
+        for _ in moves:
+            diff.undo_move()
+
+        self.assertEqual(expected, diff.current_config)
+        self.assertEqual([], diff.undo_log)
+
+    def test_hash__moves_applied__same_as_hash_of_new_diff(self):
+        # Arrange
+        diff = ps.Diff(current_config=Files.CROPPED_CONFIG_DB_AS_JSON, target_config=Files.ANY_CONFIG_DB)
+        in_place_diff = ps.Diff(current_config=copy.deepcopy(Files.CROPPED_CONFIG_DB_AS_JSON),
+                                target_config=Files.ANY_CONFIG_DB)
+        initial_hash = hash(diff)
+        hash(in_place_diff)
+        move = ps.JsonMove.from_patch(Files.SINGLE_OPERATION_CONFIG_DB_PATCH)
+        expected = hash(ps.Diff(current_config=Files.CONFIG_DB_AFTER_SINGLE_OPERATION,
+                                target_config=Files.ANY_CONFIG_DB))
+
+        # Act
+        actual = hash(diff.apply_move(move))
+        actual_in_place = hash(in_place_diff.apply_move_in_place(move))
+        actual_undone = hash(in_place_diff.undo_move())
+
+        # Assert
+        self.assertEqual(expected, actual)
+        self.assertEqual(expected, actual_in_place)
+        self.assertEqual(initial_hash, actual_undone)
+
 class TestJsonMove(unittest.TestCase):
     def setUp(self):
         self.operation_wrapper = OperationWrapper()
@@ -933,6 +1025,55 @@ class TestFullConfigMoveValidator(unittest.TestCase):
         # Act and assert
         self.assertTrue(validator.validate(self.any_move, self.any_diff))
 
+    def test_validate__config_validator_given__used_instead_of_config_wrapper(self):
+        # Arrange
+        config_wrapper = Mock()
+        config_validator = Mock()
+        config_validator.validate.return_value = (False, None)
+        validator = ps.FullConfigMoveValidator(config_wrapper, config_validator)
+        diff = ps.Diff({"PORT": {"Ethernet0": {"mtu": "9100"}}}, {})
+        move = ps.JsonMove.from_operation({"op": "replace", "path": "/PORT/Ethernet0/mtu", "value": "1500"})
+
+        # Act and assert
+        self.assertFalse(validator.validate(move, diff))
+        config_validator.validate.assert_called_once_with({"PORT": {"Ethernet0": {"mtu": "1500"}}},
+                                                          diff.config_version, {("PORT", "Ethernet0")})
+        config_wrapper.validate_config_db_config.assert_not_called()
+
+    def test_validate__config_validator_given__changed_keys_of_move(self):
+        # Arrange
+        config_validator = Mock()
+        config_validator.validate.return_value = (True, None)
+        validator = ps.FullConfigMoveValidator(Mock(), config_validator)
+        diff = ps.Diff({"PORT": {"Ethernet0": {}, "Ethernet4": {}}}, {})
+        cases = [({"op": "remove", "path": "/PORT"}, {("PORT", "Ethernet0"), ("PORT", "Ethernet4")}),
+                 ({"op": "add", "path": "/VLAN", "value": {"Vlan1000": {}}}, {("VLAN", "Vlan1000")}),
+                 ({"op": "add", "path": "/PORT/Ethernet8", "value": {}}, {("PORT", "Ethernet8")}),
+                 ({"op": "replace", "path": "", "value": {}}, None)]
+
+        for operation, expected in cases:
+            # Act
+            validator.validate(ps.JsonMove.from_operation(operation), diff)
+
+            # Assert
+            self.assertEqual(expected, config_validator.validate.call_args[0][2])
+
+    def test_diff__config_version_changes_with_current_config(self):
+        # Arrange
+        diff = ps.Diff({"PORT": {"Ethernet0": {}}}, {})
+        version = diff.config_version
+        move = ps.JsonMove.from_operation({"op": "remove", "path": "/PORT/Ethernet0"})
+
+        # Act
+        diff.apply_move_in_place(move)
+        applied_version = diff.config_version
+        diff.undo_move()
+
+        # Assert
+        self.assertNotEqual(version, applied_version)
+        self.assertNotIn(diff.config_version, [version, applied_version])
+        self.assertNotEqual(diff.config_version, diff.apply_move(move).config_version)
+
 class TestCreateOnlyMoveValidator(unittest.TestCase):
     def setUp(self):
         self.validator = ps.CreateOnlyMoveValidator(ps.PathAddressing())
@@ -3255,6 +3396,34 @@ class TestSortAlgorithmFactory(unittest.TestCase):
     def test_memoization_sorter(self):
         self.verify(ps.Algorithm.MEMOIZATION, ps.MemoizationSorter)
 
+    def test_dfs_in_place_sorter(self):
+        self.verify(ps.Algorithm.DFS_IN_PLACE, ps.InPlaceDfsSorter)
+
+    def test_topological_sorter(self):
+        sorter = self.verify(ps.Algorithm.TOPOLOGICAL, ps.TopologicalSorter)
+        self.assertIsInstance(sorter.fallback_sorter, ps.DfsSorter)
+
+    def test_full_config_validation_by_default(self):
+        config_wrapper = ConfigWrapper()
+        factory = ps.SortAlgorithmFactory(OperationWrapper(), config_wrapper, PathAddressing(config_wrapper))
+
+        validator = self.get_full_config_validator(factory.create())
+
+        self.assertIsNone(validator.config_validator)
+
+    def test_incremental_validation(self):
+        config_wrapper = ConfigWrapper()
+        factory = ps.SortAlgorithmFactory(OperationWrapper(), config_wrapper, PathAddressing(config_wrapper),
+                                          incremental_validation=True)
+
+        validator = self.get_full_config_validator(factory.create())
+
+        self.assertIsInstance(validator.config_validator, IncrementalConfigValidator)
+
+    def get_full_config_validator(self, sorter):
+        return next(validator for validator in sorter.move_wrapper.move_validators
+                    if isinstance(validator, ps.FullConfigMoveValidator))
+
     def verify(self, algo, algo_class):
         # Arrange
         config_wrapper = ConfigWrapper()
@@ -3287,6 +3456,136 @@ class TestSortAlgorithmFactory(unittest.TestCase):
         self.assertCountEqual(expected_non_extendable_generators, actual_non_extendable_generators)
         self.assertCountEqual(expected_extenders, actual_extenders)
         self.assertCountEqual(expected_validator, actual_validators)
+        return sorter
+
+class TestTopologicalSorter(unittest.TestCase):
+    def setUp(self):
+        self.path_addressing = PathAddressing()
+        self.refs = {}
+        self.path_addressing.find_ref_paths = MagicMock(
+            side_effect=lambda path, config: [ref for ref in self.refs.get(path, [])
+                                              if self.path_addressing.has_path(config, ref)])
+        self.move_wrapper = Mock()
+        self.move_wrapper.validate.return_value = True
+        self.move_wrapper.simulate.side_effect = lambda move, diff: diff.apply_move(move)
+        self.fallback_sorter = Mock()
+        self.sorter = ps.TopologicalSorter(self.move_wrapper, self.path_addressing, self.fallback_sorter)
+
+    def test_sort__no_diff__empty_moves(self):
+        # Arrange
+        diff = ps.Diff({"PORT": {"Ethernet0": {}}}, {"PORT": {"Ethernet0": {}}})
+
+        # Act
+        moves = self.sorter.sort(diff)
+
+        # Assert
+        self.assertEqual([], moves)
+        self.fallback_sorter.sort.assert_not_called()
+
+    def test_sort__added_keys__referenced_keys_added_first(self):
+        # Arrange
+        current_config = {"PORT": {"Ethernet0": {"mtu": "9100"}}}
+        target_config = {"PORT": {"Ethernet0": {"mtu": "9100"}},
+                         "VLAN": {"Vlan1000": {"vlanid": "1000"}},
+                         "VLAN_MEMBER": {"Vlan1000|Ethernet0": {"tagging_mode": "untagged"}}}
+        self.refs = {"/VLAN/Vlan1000": ["/VLAN_MEMBER/Vlan1000|Ethernet0"]}
+        diff = ps.Diff(current_config, target_config)
+
+        # Act
+        moves = self.sorter.sort(diff)
+
+        # Assert
+        self.assertEqual([{"op": "add", "path": "/VLAN", "value": {"Vlan1000": {"vlanid": "1000"}}},
+                          {"op": "add", "path": "/VLAN_MEMBER",
+                           "value": {"Vlan1000|Ethernet0": {"tagging_mode": "untagged"}}}],
+                         [list(move.patch)[0] for move in moves])
+        self.fallback_sorter.sort.assert_not_called()
+
+    def test_sort__removed_keys__referencing_keys_removed_first(self):
+        # Arrange
+        current_config = {"PORT": {"Ethernet0": {"mtu": "9100"}},
+                          "VLAN": {"Vlan1000": {"vlanid": "1000"}, "Vlan2000": {"vlanid": "2000"}},
+                          "VLAN_MEMBER": {"Vlan1000|Ethernet0": {"tagging_mode": "untagged"}}}
+        target_config = {"PORT": {"Ethernet0": {"mtu": "9100"}},
+                         "VLAN": {"Vlan2000": {"vlanid": "2000"}}}
+        self.refs = {"/VLAN/Vlan1000": ["/VLAN_MEMBER/Vlan1000|Ethernet0"]}
+        diff = ps.Diff(current_config, target_config)
+
+        # Act
+        moves = self.sorter.sort(diff)
+
+        # Assert
+        self.assertEqual([{"op": "remove", "path": "/VLAN_MEMBER"},
+                          {"op": "remove", "path": "/VLAN/Vlan1000"}],
+                         [list(move.patch)[0] for move in moves])
+
+    def test_sort__create_only_field_changed__key_removed_then_added(self):
+        # Arrange
+        current_config = {"LOOPBACK_INTERFACE": {"Loopback0": {"vrf_name": "Vrf01"}},
+                          "PORT": {"Ethernet0": {"mtu": "9100"}}}
+        target_config = {"LOOPBACK_INTERFACE": {"Loopback0": {"vrf_name": "Vrf02"}},
+                         "PORT": {"Ethernet0": {"mtu": "1500"}}}
+        diff = ps.Diff(current_config, target_config)
+
+        # Act
+        moves = self.sorter.sort(diff)
+
+        # Assert
+        self.assertEqual([{"op": "remove", "path": "/LOOPBACK_INTERFACE"},
+                          {"op": "replace", "path": "/PORT/Ethernet0", "value": {"mtu": "1500"}},
+                          {"op": "add", "path": "/LOOPBACK_INTERFACE",
+                           "value": {"Loopback0": {"vrf_name": "Vrf02"}}}],
+                         [list(move.patch)[0] for move in moves])
+
+    def test_sort__cycle__fallback_sorter_used(self):
+        # Arrange
+        current_config = {"PORT": {"Ethernet0": {"mtu": "9100"}}}
+        target_config = {"PORT": {"Ethernet0": {"mtu": "9100"}},
+                         "TABLE1": {"Key1": {"ref": "Key2"}},
+                         "TABLE2": {"Key2": {"ref": "Key1"}}}
+        self.refs = {"/TABLE1/Key1": ["/TABLE2/Key2/ref"], "/TABLE2/Key2": ["/TABLE1/Key1/ref"]}
+        diff = ps.Diff(current_config, target_config)
+        self.fallback_sorter.sort.return_value = ["fallback-move"]
+
+        # Act
+        moves = self.sorter.sort(diff)
+
+        # Assert
+        self.assertEqual(["fallback-move"], moves)
+        self.fallback_sorter.sort.assert_called_once_with(diff)
+        self.move_wrapper.validate.assert_not_called()
+
+    def test_sort__invalid_move__remaining_diff_sorted_by_fallback_sorter(self):
+        # Arrange
+        current_config = {"PORT": {"Ethernet0": {"mtu": "9100"}, "Ethernet4": {"mtu": "9100"}}}
+        target_config = {"PORT": {"Ethernet0": {"mtu": "1500"}, "Ethernet4": {"mtu": "1500"}}}
+        diff = ps.Diff(current_config, target_config)
+        self.move_wrapper.validate.side_effect = lambda move, diff: move.path == "/PORT/Ethernet0"
+        self.fallback_sorter.sort.side_effect = lambda diff: ["fallback-move"]
+
+        # Act
+        moves = self.sorter.sort(diff)
+
+        # Assert
+        self.assertEqual(2, len(moves))
+        self.assertEqual({"op": "replace", "path": "/PORT/Ethernet0", "value": {"mtu": "1500"}},
+                         list(moves[0].patch)[0])
+        self.assertEqual("fallback-move", moves[1])
+        remaining_diff = self.fallback_sorter.sort.call_args[0][0]
+        self.assertEqual({"PORT": {"Ethernet0": {"mtu": "1500"}, "Ethernet4": {"mtu": "9100"}}},
+                         remaining_diff.current_config)
+
+    def test_sort__fallback_sorter_fails__none(self):
+        # Arrange
+        diff = ps.Diff({"PORT": {"Ethernet0": {"mtu": "9100"}}}, {"PORT": {"Ethernet0": {"mtu": "1500"}}})
+        self.move_wrapper.validate.return_value = False
+        self.fallback_sorter.sort.return_value = None
+
+        # Act
+        moves = self.sorter.sort(diff)
+
+        # Assert
+        self.assertIsNone(moves)
 
 class TestPatchSorter(unittest.TestCase):
     def setUp(self):
@@ -3312,16 +3611,59 @@ class TestPatchSorter(unittest.TestCase):
             with self.subTest(name=test_case_name):
                 self.run_single_success_case(data[test_case_name], skip_exact_change_list_match)
 
-    def run_single_success_case(self, data, skip_exact_change_list_match):
+    def test_patch_sorter_success__dfs_in_place(self):
+        data = Files.PATCH_SORTER_TEST_SUCCESS
+        # Backtracking in place can change the order of dict keys, so the sorter can pick another valid order
+        skip_exact_change_list_match = True
+        for test_case_name in data:
+            with self.subTest(name=test_case_name):
+                current_config = copy.deepcopy(data[test_case_name]["current_config"])
+                self.run_single_success_case(data[test_case_name], skip_exact_change_list_match,
+                                             ps.Algorithm.DFS_IN_PLACE)
+                # In-place sorting should not alter the running config
+                self.assertEqual(current_config, data[test_case_name]["current_config"])
+
+    def test_patch_sorter_success__topological(self):
+        data = Files.PATCH_SORTER_TEST_SUCCESS
+        # The topological order can differ from the search order, but still produces valid changes
+        skip_exact_change_list_match = True
+        for test_case_name in data:
+            with self.subTest(name=test_case_name):
+                self.run_single_success_case(data[test_case_name], skip_exact_change_list_match,
+                                             ps.Algorithm.TOPOLOGICAL)
+
+    def test_patch_sorter_success__topological__sorted_without_fallback(self):
+        data = Files.PATCH_SORTER_TEST_SUCCESS
+        # Keys added or removed with their dependencies are ordered by the dependency graph alone
+        test_case_names = ["ADD_2_ITEMS_WITH_DEPENDENCY_FROM_DIFFERENT_TABLES__SUCCESS",
+                           "REMOVE_2_ITEMS_WITH_DEPENDENCY_FROM_DIFFERENT_TABLES__SUCCESS"]
+        skip_exact_change_list_match = False
+        for test_case_name in test_case_names:
+            with self.subTest(name=test_case_name), \
+                 patch.object(ps.DfsSorter, "sort", side_effect=AssertionError("fallback sorter was used")):
+                self.run_single_success_case(data[test_case_name], skip_exact_change_list_match,
+                                             ps.Algorithm.TOPOLOGICAL)
+
+    def test_patch_sorter_success__incremental_validation(self):
+        data = Files.PATCH_SORTER_TEST_SUCCESS
+        # The moves are validated the same way, so the sorter should pick the same changes
+        skip_exact_change_list_match = False
+        for test_case_name in data:
+            with self.subTest(name=test_case_name):
+                self.run_single_success_case(data[test_case_name], skip_exact_change_list_match,
+                                             incremental_validation=True)
+
+    def run_single_success_case(self, data, skip_exact_change_list_match, algorithm=ps.Algorithm.DFS,
+                                incremental_validation=False):
         current_config = data["current_config"]
         patch = jsonpatch.JsonPatch(data["patch"])
         expected_changes = []
         for item in data["expected_changes"]:
             expected_changes.append(JsonChange(jsonpatch.JsonPatch(item)))
 
-        sorter = self.create_patch_sorter(current_config)
+        sorter = self.create_patch_sorter(current_config, incremental_validation=incremental_validation)
 
-        actual_changes = sorter.sort(patch)
+        actual_changes = sorter.sort(patch, algorithm)
 
         if not skip_exact_change_list_match:
             self.assertEqual(expected_changes, actual_changes)
@@ -3388,7 +3730,20 @@ class TestPatchSorter(unittest.TestCase):
         # Assert
         self.assertEqual(expected, actual)
 
-    def create_patch_sorter(self, config=None, sort_algorithm=None):
+    def test_init__incremental_validation__passed_to_sort_algorithm_factory(self):
+        # Act
+        patch_sorter = ps.PatchSorter(self.config_wrapper, PatchWrapper(self.config_wrapper),
+                                      incremental_validation=True)
+        sorter = patch_sorter.sort_algorithm_factory.create()
+
+        # Assert
+        validator = next(validator for validator in sorter.move_wrapper.move_validators
+                         if isinstance(validator, ps.FullConfigMoveValidator))
+        self.assertIsInstance(validator.config_validator, IncrementalConfigValidator)
+        self.assertFalse(ps.PatchSorter(self.config_wrapper, PatchWrapper(self.config_wrapper))
+                         .sort_algorithm_factory.incremental_validation)
+
+    def create_patch_sorter(self, config=None, sort_algorithm=None, incremental_validation=False):
         if config is None:
             config=Files.CROPPED_CONFIG_DB_AS_JSON
         config_wrapper = self.config_wrapper
@@ -3396,7 +3751,8 @@ class TestPatchSorter(unittest.TestCase):
         patch_wrapper = PatchWrapper(config_wrapper)
         operation_wrapper = OperationWrapper()
         path_addressing= ps.PathAddressing(config_wrapper)
-        sort_algorithm_factory = ps.SortAlgorithmFactory(operation_wrapper, config_wrapper, path_addressing)
+        sort_algorithm_factory = ps.SortAlgorithmFactory(operation_wrapper, config_wrapper, path_addressing,
+                                                         incremental_validation=incremental_validation)
         if sort_algorithm:
             sort_algorithm_factory.create = MagicMock(return_value=sort_algorithm)
 
@@ -3614,13 +3970,29 @@ class TestNonStrictPatchSorter(unittest.TestCase):
         # Assert
         self.assertListEqual(expected, actual)
 
+    def test_sort__algorithm_not_specified__calls_inner_patch_sorter_with_default_algorithm(self):
+        # Arrange
+        patch = Mock()
+        non_yang_changes = [Mock()]
+        yang_changes = [Mock(), Mock()]
+        expected = non_yang_changes + yang_changes
+        sorter = self.__create_patch_sorter(patch, ps.Algorithm.DFS_IN_PLACE, non_yang_changes, yang_changes,
+                                            default_algorithm=ps.Algorithm.DFS_IN_PLACE)
+
+        # Act
+        actual = sorter.sort(patch)
+
+        # Assert
+        self.assertListEqual(expected, actual)
+
     def __create_patch_sorter(self,
                               patch=None,
                               any_algorithm=None,
                               any_adjusted_changes_non_yang=None,
                               any_adjusted_changes_yang=None,
                               valid_yang_covered_config=True,
-                              valid_patch_only_tables_with_yang_models=True):
+                              valid_patch_only_tables_with_yang_models=True,
+                              default_algorithm=ps.Algorithm.DFS):
         ignore_paths_list = Mock()
         config_wrapper = Mock()
         patch_wrapper = Mock()
@@ -3675,7 +4047,8 @@ class TestNonStrictPatchSorter(unittest.TestCase):
                 {(str(any_changes_non_yang), str(any_current_config_non_yang), str(any_current_config_yang)): any_adjusted_changes_non_yang,
                  (str(any_changes_yang), str(any_current_config_yang), str(any_target_config_non_yang)): any_adjusted_changes_yang})
 
-        return ps.NonStrictPatchSorter(config_wrapper, patch_wrapper, config_splitter, change_wrapper, inner_patch_sorter)
+        return ps.NonStrictPatchSorter(config_wrapper, patch_wrapper, config_splitter, change_wrapper, inner_patch_sorter,
+                                       algorithm=default_algorithm)
 
 class TestStrictPatchSorter(unittest.TestCase):
     def test_sort__patch_updating_tables_without_yang__failure(self):
@@ -3719,12 +4092,26 @@ class TestStrictPatchSorter(unittest.TestCase):
         # Assert
         self.assertListEqual(changes, actual)
 
+    def test_sort__algorithm_not_specified__calls_inner_patch_sorter_with_default_algorithm(self):
+        # Arrange
+        patch = Mock()
+        changes = [Mock(), Mock(), Mock()]
+        sorter = self.__create_patch_sorter(patch, ps.Algorithm.DFS_IN_PLACE, changes,
+                                            default_algorithm=ps.Algorithm.DFS_IN_PLACE)
+
+        # Act
+        actual = sorter.sort(patch)
+
+        # Assert
+        self.assertListEqual(changes, actual)
+
     def __create_patch_sorter(self,
                               patch=None,
                               algorithm=None,
                               changes=None,
                               valid_patch_only_tables_with_yang_models=True,
-                              valid_config_db=True):
+                              valid_config_db=True,
+                              default_algorithm=ps.Algorithm.DFS):
         config_wrapper = Mock()
         patch_wrapper = Mock()
         inner_patch_sorter = Mock()
@@ -3755,4 +4142,4 @@ class TestStrictPatchSorter(unittest.TestCase):
             create_side_effect_dict(
                 {(str(patch), str(algorithm)): changes})
 
-        return ps.StrictPatchSorter(config_wrapper, patch_wrapper, inner_patch_sorter)
+        return ps.StrictPatchSorter(config_wrapper, patch_wrapper, inner_patch_sorter, algorithm=default_algorithm)
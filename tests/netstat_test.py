@@ -0,0 +1,32 @@
+from utilities_common import netstat
+from utilities_common.netstat import STATUS_NA
+
+
+class TestNetstatBatch(object):
+    def test_ns_diff_batch__same_as_ns_diff(self):
+        new_values = ['100', '5', STATUS_NA, '7', '1000000']
+        old_values = ['40', '10', '3', STATUS_NA, 0]
+
+        for raw in (False, True):
+            diffs = netstat.format_number_batch(netstat.ns_diff_batch(new_values, old_values, raw=raw))
+            assert diffs == [netstat.ns_diff(new, old, raw=raw) for new, old in zip(new_values, old_values)]
+
+    def test_format_rate_batch__same_as_single_value(self):
+        rates = ['1250000', '20.5', STATUS_NA, '0']
+
+        assert netstat.format_brate_batch(rates) == [netstat.format_brate(rate) for rate in rates]
+        assert netstat.format_prate_batch(rates) == [netstat.format_prate(rate) for rate in rates]
+
+    def test_format_util_batch__util_not_available__calculated_from_byte_rate(self):
+        utils = ['12.5', STATUS_NA, STATUS_NA]
+        brates = [1250000.0, 125000000.0, STATUS_NA]
+        port_rates = [STATUS_NA, 100000, 100000]
+
+        assert netstat.format_util_batch(utils, brates, port_rates) == ['12.50%', '1.00%', STATUS_NA]
+
+    def test_counter_column__missing_objects_have_default(self):
+        cnstat_dict = {'time': '2024-01-01', 'Ethernet0': {'rx_ok': '1'}, 'Ethernet4': {'rx_ok': '2'}}
+
+        assert netstat.counter_column(cnstat_dict, ['Ethernet4', 'Ethernet8', 'Ethernet0'], 'rx_ok') == \
+            ['2', STATUS_NA, '1']
+        assert netstat.counter_column(cnstat_dict, ['Ethernet8'], 'rx_ok', default=0) == [0]
@@ -1,12 +1,14 @@
 import pytest
 import logging
 import os
+from unittest import mock
 
 import clear.main as clear
 import show.main as show
 
 from click.testing import CliRunner
 from utilities_common.cli import UserCache
+from utilities_common.portstat import Portstat
 
 from .utils import get_result_and_return_code
 from .portstat_input import assert_show_output
@@ -1125,3 +1127,26 @@ class TestMultiAsicPortStat(object):
         os.environ["UTILITIES_UNIT_TESTING"] = "0"
         os.environ["UTILITIES_UNIT_TESTING_TOPOLOGY"] = ""
         remove_tmp_cnstat_file()
+
+
+class TestPortstatGearbox(object):
+    def create_portstat(self, scan_results):
+        portstat = Portstat(None, "all")
+        portstat.db = mock.MagicMock()
+        portstat.db.get_redis_client.return_value.scan.side_effect = scan_results
+        return portstat
+
+    def test_has_gearbox_ports__scan_stops_at_first_gearbox_port(self):
+        portstat = self.create_portstat([(5, []), (9, ["_GEARBOX_TABLE:interface:0"]), (0, [])])
+
+        assert portstat.has_gearbox_ports()
+        assert portstat.has_gearbox_ports()
+
+        client = portstat.db.get_redis_client.return_value
+        assert client.scan.call_count == 2
+        client.keys.assert_not_called()
+
+    def test_has_gearbox_ports__no_gearbox_ports(self):
+        portstat = self.create_portstat([(5, []), (0, [])])
+
+        assert not portstat.has_gearbox_ports()
@@ -2,6 +2,7 @@ import copy
 from io import StringIO
 import json
 import logging
+import socket
 import syslog
 import sys
 import time
@@ -155,6 +156,23 @@ class MockSubscriber:
 
         return (k, op, v)
 
+class MockPopen:
+    def __init__(self, output):
+        self.stdout = StringIO(output)
+        self.returncode = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+    def wait(self):
+        return self.returncode
+
+    def kill(self):
+        pass
+
 def subscriber_side_effect(db, tbl):
     global subscribers_returned
     key = "db_{}_{}_tbl_{}".format(db["namespace"], db["name"], tbl)
@@ -243,7 +261,7 @@ class TestRouteCheck(object):
         with patch('sys.argv', ct_data[ARGS].split()), \
             patch('sonic_py_common.multi_asic.get_namespace_list', return_value= ct_data[NAMESPACE]), \
             patch('sonic_py_common.multi_asic.is_multi_asic', return_value= ct_data[MULTI_ASIC]), \
-            patch('route_check.subprocess.check_output', side_effect=lambda *args, **kwargs: self.mock_check_output(ct_data, *args, **kwargs)), \
+            patch('utilities_common.frr_json.subprocess.Popen', side_effect=lambda *args, **kwargs: MockPopen(self.mock_check_output(ct_data, *args, **kwargs))), \
             patch('route_check.mitigate_installed_not_offloaded_frr_routes', side_effect=lambda *args, **kwargs: None), \
             patch('route_check.load_db_config', side_effect=lambda: init_db_conns(ct_data[NAMESPACE])):
 
@@ -301,9 +319,122 @@ class TestRouteCheck(object):
     def test_mitigate_routes(self, mock_dbs):
         namespace = DEFAULTNS
         missed_frr_rt = [ { 'prefix': '192.168.0.1', 'protocol': 'bgp' } ]
-        rt_appl = [ '192.168.0.1' ]
+        rt_appl = {route_check.pack_prefix('192.168.0.1')}
         init_db_conns([namespace])
         with patch('sys.stdout', new_callable=StringIO) as mock_stdout:
             route_check.mitigate_installed_not_offloaded_frr_routes(namespace, missed_frr_rt, rt_appl)
         # Verify that the stdout are suppressed in this function
         assert not mock_stdout.getvalue()
+
+    @pytest.mark.parametrize("test_num", TEST_DATA.keys())
+    def test_route_check_daemon(self, mock_dbs, test_num):
+        # With no grace period, the daemon reports the same as a single run
+        self.init()
+        ct_data = copy.deepcopy(TEST_DATA[test_num])
+        ct_data[ARGS] += " -d -g 0 --stats-socket="
+        set_test_case_data(ct_data)
+        self.run_test(ct_data)
+
+    def test_route_check_daemon_grace(self, mock_dbs):
+        # Route misses within the grace period are not reported
+        self.init()
+        ct_data = copy.deepcopy(TEST_DATA['2'])
+        ct_data[ARGS] += " -d -g 1000 --stats-socket="
+        ct_data[RESULT] = {DEFAULTNS: {k: v for k, v in ct_data[RESULT][DEFAULTNS].items()
+                                       if k == "missed_INTF_TABLE_entries"}}
+        set_test_case_data(ct_data)
+        self.run_test(ct_data)
+
+    def test_route_set(self):
+        rt_set = route_check.RouteSet()
+        rt_set.add("10.1.0.0/24", "10.1.0.0/24")
+        rt_set.add("Vrf1:10.1.0.0/24", "10.1.0.0/24")
+        rt_set.add("Vrf1:10.1.0.0/24", "10.1.0.0/24")
+        assert len(rt_set) == 1
+
+        assert rt_set.remove("10.1.0.0/24") == "10.1.0.0/24"
+        assert "10.1.0.0/24" in rt_set
+        assert rt_set.remove("Vrf1:10.1.0.0/24") == "10.1.0.0/24"
+        assert "10.1.0.0/24" not in rt_set
+        assert rt_set.remove("Vrf1:10.1.0.0/24") is None
+
+    def test_route_tracker_divergence(self, mock_dbs):
+        ct_data = TEST_DATA['0']
+        set_test_case_data(ct_data)
+        init_db_conns(ct_data[NAMESPACE])
+        tracker = route_check.RouteTracker(DEFAULTNS)
+        tracker.sync()
+        synced = dict(tracker.diverged)
+        route = route_check.pack_prefix("10.10.196.12/31")
+        assert route not in synced
+
+        asic_key = next(k for k in tracker.rt_asic.keys if tracker.rt_asic.keys[k] == route)
+        tracker.asic_subs.del_keys.append(asic_key)
+        tracker.updates += tracker.process_updates(100)
+        assert tracker.diverged == {**synced, route: 100}
+
+        tracker.asic_subs.set_keys.append(asic_key)
+        tracker.updates += tracker.process_updates(101)
+        assert tracker.diverged == synced
+        assert tracker.get_stats()["updates"] == 2
+
+    def test_stats_server(self, tmp_path):
+        path = str(tmp_path / "route_check.sock")
+        server = route_check.start_stats_server(path, lambda: {"uptime": 5})
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.connect(path)
+                data = sock.makefile().read()
+        finally:
+            server.shutdown()
+            server.server_close()
+        assert json.loads(data) == {"uptime": 5}
+
+    def test_pack_prefix(self):
+        assert route_check.pack_prefix("10.1.0.0/16") == (4, 16, 0x0a010000)
+        assert route_check.pack_prefix("10.1.2.3") == (4, 32, 0x0a010203)
+        assert route_check.pack_prefix("2603:10B0::1/64") == route_check.pack_prefix("2603:10b0::/64")
+        assert route_check.unpack_prefix(route_check.pack_prefix("2603:10b0:503:df4::5d/128")) == \
+            "2603:10b0:503:df4::5d/128"
+        assert route_check.pack_route("fe80::1/64") is None
+        assert route_check.pack_route("169.254.0.1/32") is None
+        with pytest.raises(ValueError):
+            route_check.pack_prefix("10.1.0.0/33")
+        assert route_check.pack_prefixes(["10.1.0.0/16", "bad"]) == {(4, 16, 0x0a010000)}
+
+    def test_diff_prefix_sets(self):
+        s1 = route_check.pack_prefixes(["10.2.0.0/16", "10.1.0.0/16", "2603:10b0::/64"])
+        s2 = route_check.pack_prefixes(["10.1.0.0/16", "10.3.0.0/16"])
+        assert route_check.diff_prefix_sets(s1, s2) == (["10.2.0.0/16", "2603:10b0::/64"], ["10.3.0.0/16"])
+
+    def test_get_frr_routes_parallel__debug_dump_has_entries(self):
+        routes = {"10.1.0.0/16": [{"prefix": "10.1.0.0/16", "protocol": "bgp"}]}
+        with patch.object(route_check, "fetch_routes", side_effect=lambda cmd, route_filter: dict(routes)), \
+             patch.object(route_check, "print_message") as mock_print_message:
+            assert route_check.get_frr_routes_parallel("") == routes
+
+        dump = mock_print_message.call_args[0][-1]
+        assert json.loads(str(dump)) == {"FRR": [["10.1.0.0/16", routes["10.1.0.0/16"]]]}
+
+    def test_table_dump(self):
+        dump = route_check.TableDump("ROUTE_TABLE", {(4, 24, 3), (4, 24, 1), (4, 24, 2)},
+                                     lambda e: "{}/{}".format(e[2], e[1]))
+        with patch.object(route_check, "DEBUG_DUMP_MAX", 2):
+            assert json.loads(str(dump)) == {"ROUTE_TABLE": ["1/24", "2/24"], "count": 3}
+        assert json.loads(str(route_check.TableDump("sids", ["b", "a"]))) == {"sids": ["a", "b"]}
+
+        # Not formatted unless the level is enabled
+        route_check.set_level(route_check.Level.ERR, False)
+        dump = MagicMock()
+        route_check.print_message(syslog.LOG_DEBUG, "routes: ", dump)
+        dump.__str__.assert_not_called()
+
+    def test_timed(self):
+        timings = route_check.Timings()
+        with route_check.timed(timings, "appl_db"):
+            pass
+        with pytest.raises(ValueError):
+            with route_check.timed(timings, "asic_db"):
+                raise ValueError()
+        assert list(timings.keys()) == ["appl_db", "asic_db"]
+        assert str(timings).startswith("appl_db=0.")
@@ -542,6 +542,9 @@ TEST_DATA = {
                         "vrfName": "default",
                         "protocol": "bgp",
                         "selected": True,
+                        "nexthops": [
+                            {"ip": "10.0.0.1", "interfaceName": "PortChannel1013", "active": True}
+                        ],
                     },
                 ],
                 "1.1.1.0/24": [
@@ -563,7 +566,8 @@ TEST_DATA = {
         RESULT: {
             DEFAULTNS: {
                 "missed_FRR_routes": [
-                    {"prefix": "10.10.196.12/31", "vrfName": "default", "protocol": "bgp", "selected": True}
+                    {"prefix": "10.10.196.12/31", "vrfName": "default", "protocol": "bgp", "selected": True,
+                     "nexthops": [{"ip": "10.0.0.1", "interfaceName": "PortChannel1013", "active": True}]}
                 ],
             },
         },
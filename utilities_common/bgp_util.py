@@ -1,3 +1,4 @@
+import io
 import ipaddress
 import json
 import re
@@ -9,7 +10,7 @@ import utilities_common.multi_asic as multi_asic_util
 from natsort import natsorted
 from sonic_py_common import multi_asic, device_info
 from tabulate import tabulate
-from utilities_common import constants
+from utilities_common import constants, frr_json
 
 
 def get_namespace_for_bgp_neighbor(neighbor_ip):
@@ -247,21 +248,29 @@ def run_bgp_show_command(vtysh_cmd, bgp_namespace=multi_asic.DEFAULT_NAMESPACE,
     if output is not None:
         if clicommon.get_interface_naming_mode() == "alias" and re.search("show ip|ipv6 route", vtysh_cmd):
             iface_alias_converter = clicommon.InterfaceAliasConverter()
-            route_info =json.loads(output)
-            for route, info in route_info.items():
-                for i in range(0, len(info)):
-                    if 'nexthops' in info[i]:
-                        for j in range(0, len(info[i]['nexthops'])):
-                            intf_name = ""
-                            if 'interfaceName' in info[i]['nexthops'][j]:
-                                intf_name  = info[i]['nexthops'][j]['interfaceName']
-                                alias = iface_alias_converter.name_to_alias(intf_name)
-                                if alias is not None:
-                                    info[i]['nexthops'][j]['interfaceName'] = alias 
-            output= json.dumps(route_info)
+            output = frr_json.dumps_prefix_routes(
+                convert_route_nexthop_alias(frr_json.iter_prefix_routes(io.StringIO(output)), iface_alias_converter))
     return output
 
 
+def convert_route_nexthop_alias(prefix_routes, iface_alias_converter):
+    """
+    Converts the nexthop interface names of the (prefix, route entries) pairs of
+    FRR route JSON to their aliases, one prefix at a time.
+    """
+    for route, info in prefix_routes:
+        for i in range(0, len(info)):
+            if 'nexthops' in info[i]:
+                for j in range(0, len(info[i]['nexthops'])):
+                    intf_name = ""
+                    if 'interfaceName' in info[i]['nexthops'][j]:
+                        intf_name  = info[i]['nexthops'][j]['interfaceName']
+                        alias = iface_alias_converter.name_to_alias(intf_name)
+                        if alias is not None:
+                            info[i]['nexthops'][j]['interfaceName'] = alias
+        yield route, info
+
+
 def get_bgp_summary_from_all_bgp_instances(af, namespace, display, vrf):
 
     device = multi_asic_util.MultiAsic(display, namespace)
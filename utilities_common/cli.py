@@ -1,16 +1,20 @@
+import array
 import configparser
 import datetime
 import os
 import re
+import struct
 import subprocess
 import sys
 import shutil
+import tempfile
 
 import click
 import json
 import lazy_object_proxy
 import netaddr
 
+from collections import OrderedDict
 from natsort import natsorted
 from sonic_py_common import multi_asic
 from utilities_common.db import Db
@@ -743,7 +747,8 @@ def run_command(command, display_cmd=False, ignore_error=False, return_cmd=False
     Args:
         display_cmd: Boolean; If True, will print the command being run to stdout before executing the command
         ignore_error: Boolean; If true, do not exit if command returns a non-zero return code
-        return_cmd: Boolean; If true, the function will return the output, ignoring any non-zero return code
+        return_cmd: Boolean; If true, the function will return the output and the return code of the command,
+                    ignoring any non-zero return code. The output is returned as is, also in alias mode
         interactive_mode: Boolean; If true, it will treat the process as a long-running process which may generate
                           multiple lines of output over time
         shell: Boolean; If true, the command will be run in a shell
@@ -759,8 +764,9 @@ def run_command(command, display_cmd=False, ignore_error=False, return_cmd=False
     # both SONiC interface name and alias name for all interfaces.
     # IP route table cannot be handled in function run_command_in_alias_mode since it is in JSON format
     # with a list for next hops
-    if (get_interface_naming_mode() == "alias" and not command_str.startswith("intfutil") and not re.search(
-            "show ip|ipv6 route", command_str)):
+    # The output of commands run with return_cmd is returned to the caller, not printed in alias mode
+    if (not return_cmd and get_interface_naming_mode() == "alias" and not command_str.startswith("intfutil") and
+            not re.search("show ip|ipv6 route", command_str)):
         return run_command_in_alias_mode(command, shell=shell)
 
     proc = subprocess.Popen(command, shell=shell, text=True, stdout=subprocess.PIPE)
@@ -949,3 +955,213 @@ class UserCache:
     def remove_all(self):
         """ Remove the content of the cache for all users """
         shutil.rmtree(self.cache_directory_app)
+
+    @staticmethod
+    def write_checkpoint(path, data):
+        """ Save a counter checkpoint, a dict of object -> dict of counters, in the binary format
+
+        Args:
+            path (str): Path of the checkpoint file, usually in the cache directory.
+            data (dict): The counters to save. The 'time' key holds the time of the checkpoint.
+        """
+        CounterCheckpoint.from_dict(data).dump(path)
+
+    @staticmethod
+    def read_checkpoint(path):
+        """ Load a counter checkpoint saved by write_checkpoint
+
+        Checkpoints saved with json.dump by previous releases are still read, as they were saved.
+        """
+        with open(path, 'rb') as fp:
+            raw = fp.read()
+        if not raw.startswith(CounterCheckpoint.MAGIC):
+            return json.loads(raw)
+        return CounterCheckpoint.from_bytes(raw).to_dict()
+
+
+class CounterCheckpoint:
+    """ Compact checkpoint of the counters of many objects, e.g. the counters of all the ports
+
+    The checkpoint is kept as columns: one array of uint64 per counter, with a value per object in the
+    order of the object keys. Values which are not counters, like N/A, are kept apart as exceptions.
+
+    The file starts with MAGIC, the format version and the length of a JSON header holding the time,
+    the object keys, the layout of the columns and the exceptions. The columns follow as little
+    endian uint64 arrays.
+    """
+
+    MAGIC = b"SCKP"
+    VERSION = 1
+    PREAMBLE = struct.Struct("<4sHI")
+    MAX_VALUE = 2 ** 64 - 1
+
+    # Column kinds: counters kept as decimal strings, as ints, or a column without any counter
+    KIND_DECIMAL = "dec"
+    KIND_INT = "int"
+    KIND_JSON = "json"
+
+    def __init__(self, time, objects, fields, columns, exceptions, absent):
+        self.time = time
+        self.objects = objects
+        self.fields = fields
+        self.columns = columns
+        self.exceptions = exceptions
+        self.absent = absent
+        self.index = {key: i for i, key in enumerate(objects)}
+
+    @classmethod
+    def _is_counter(cls, kind, value):
+        if kind == cls.KIND_DECIMAL:
+            return (isinstance(value, str) and value.isascii() and value.isdigit() and
+                    (value == "0" or value[0] != "0") and int(value) <= cls.MAX_VALUE)
+        return type(value) is int and 0 <= value <= cls.MAX_VALUE
+
+    @classmethod
+    def from_dict(cls, data):
+        """ Build the checkpoint of a dict of object -> dict of counters """
+        time = data.get('time')
+        if isinstance(time, (datetime.datetime, datetime.date)):
+            time = json_serial(time)
+        objects = [key for key in data if key != 'time']
+        rows = [data[key] for key in objects]
+
+        fields = {}
+        for row in rows:
+            fields.update(dict.fromkeys(row, None))
+
+        not_set = object()
+        columns, exceptions, absent = {}, {}, {}
+        for field in fields:
+            values = [row.get(field, not_set) for row in rows]
+            missing = [i for i, value in enumerate(values) if value is not_set]
+            if missing:
+                absent[field] = missing
+
+            kind = cls.KIND_JSON
+            for candidate in (cls.KIND_DECIMAL, cls.KIND_INT):
+                if any(cls._is_counter(candidate, value) for value in values):
+                    kind = candidate
+                    break
+            fields[field] = kind
+
+            if kind == cls.KIND_JSON:
+                exceptions[field] = {i: value for i, value in enumerate(values) if value is not not_set}
+                continue
+            counters = [cls._is_counter(kind, value) for value in values]
+            columns[field] = array.array('Q', (int(value) if counter else 0
+                                               for value, counter in zip(values, counters)))
+            others = {i: value for i, (value, counter) in enumerate(zip(values, counters))
+                      if not counter and value is not not_set}
+            if others:
+                exceptions[field] = others
+
+        return cls(time, objects, fields, columns, exceptions, absent)
+
+    def to_dict(self):
+        """ Return the checkpoint as the dict of object -> dict of counters it was built from """
+        rows = [OrderedDict() for _ in self.objects]
+        for field, kind in self.fields.items():
+            if kind == self.KIND_DECIMAL:
+                values = list(map(str, self.columns[field]))
+            elif kind == self.KIND_INT:
+                values = self.columns[field].tolist()
+            else:
+                values = [None] * len(self.objects)
+            for i, value in self.exceptions.get(field, {}).items():
+                values[i] = value
+
+            missing = self.absent.get(field)
+            if missing:
+                missing = set(missing)
+                for i, (row, value) in enumerate(zip(rows, values)):
+                    if i not in missing:
+                        row[field] = value
+            else:
+                for row, value in zip(rows, values):
+                    row[field] = value
+
+        data = OrderedDict()
+        if self.time is not None:
+            data['time'] = self.time
+        data.update(zip(self.objects, rows))
+        return data
+
+    def column(self, field):
+        """ Return the uint64 array of a counter, with a value per object in the order of the objects.
+
+        Exceptions, e.g. N/A, read as 0 in the array; they are kept in self.exceptions.
+        """
+        return self.columns[field]
+
+    def to_bytes(self):
+        """ Return the checkpoint in the binary format """
+        header = {
+            'time': self.time,
+            'objects': self.objects,
+            'fields': list(self.fields.items()),
+            'exceptions': {field: list(values.items()) for field, values in self.exceptions.items()},
+            'absent': self.absent,
+        }
+        header = json.dumps(header, separators=(',', ':')).encode()
+        chunks = [self.PREAMBLE.pack(self.MAGIC, self.VERSION, len(header)), header]
+        for field, kind in self.fields.items():
+            if kind == self.KIND_JSON:
+                continue
+            column = self.columns[field]
+            if sys.byteorder != 'little':
+                column = array.array('Q', column)
+                column.byteswap()
+            chunks.append(column.tobytes())
+        return b"".join(chunks)
+
+    @classmethod
+    def from_bytes(cls, raw):
+        """ Build the checkpoint from its binary format """
+        magic, version, header_length = cls.PREAMBLE.unpack_from(raw)
+        if magic != cls.MAGIC:
+            raise ValueError("Not a counter checkpoint")
+        if version != cls.VERSION:
+            raise ValueError("Unsupported counter checkpoint version {}".format(version))
+
+        offset = cls.PREAMBLE.size
+        header = json.loads(raw[offset:offset + header_length])
+        offset += header_length
+
+        # Keys which are tuples, e.g. (table, rule), are saved as JSON lists
+        objects = [tuple(key) if isinstance(key, list) else key for key in header['objects']]
+        fields = OrderedDict((field, kind) for field, kind in header['fields'])
+        column_size = len(objects) * 8
+
+        columns = {}
+        for field, kind in fields.items():
+            if kind == cls.KIND_JSON:
+                continue
+            column = array.array('Q')
+            column.frombytes(raw[offset:offset + column_size])
+            if sys.byteorder != 'little':
+                column.byteswap()
+            columns[field] = column
+            offset += column_size
+
+        exceptions = {field: dict((i, value) for i, value in values)
+                      for field, values in header['exceptions'].items()}
+        return cls(header['time'], objects, fields, columns, exceptions, header['absent'])
+
+    def dump(self, path):
+        """ Save the checkpoint to path, atomically so readers never see a partial checkpoint """
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".checkpoint-")
+        try:
+            with os.fdopen(fd, 'wb') as fp:
+                fp.write(self.to_bytes())
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        """ Load the checkpoint saved in path """
+        with open(path, 'rb') as fp:
+            return cls.from_bytes(fp.read())
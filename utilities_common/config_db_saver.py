@@ -0,0 +1,134 @@
+"""
+In-process saver of CONFIG_DB into a config_db.json file.
+
+`sonic-cfggen -d --print-data > file` serializes the whole CONFIG_DB in a forked process, which
+`config save` then parses again to sort it and writes a second time, in place. The helpers here
+read CONFIG_DB with pipelined SCANs and HGETALLs, a table at a time, and stream it as naturally
+sorted JSON into a temporary file which is then renamed over the config file. The config file is
+thus either the previous one or the complete new one, even if the save is interrupted.
+"""
+import json
+import os
+import tempfile
+
+from natsort import natsorted
+
+from utilities_common.config_db_writer import CONFIG_DB_SEPARATOR
+from utilities_common.counter_snapshot import PIPELINE_BATCH_SIZE, hgetall_pipelined, scan_keys
+
+# Mode of a new config file, as created by a shell redirection under the usual umask
+DEFAULT_FILE_MODE = 0o644
+
+
+def deserialize_fields(raw):
+    """
+    Returns the fields of an entry stored in CONFIG_DB as ConfigDBConnector returns them.
+    """
+    fields = {}
+    for name, value in raw.items():
+        if name == "NULL":
+            continue
+        if name.endswith('@'):
+            fields[name[:-1]] = value.split(',')
+        else:
+            fields[name] = value
+    return fields
+
+
+def get_table_keys(client, separator=CONFIG_DB_SEPARATOR, batch_size=PIPELINE_BATCH_SIZE):
+    """
+    Returns a dict of table -> list of the CONFIG_DB keys of its entries.
+    """
+    tables = {}
+    for keys in scan_keys(client, '*' + separator + '*', batch_size):
+        for key in keys:
+            tables.setdefault(key.split(separator, 1)[0], []).append(key)
+    return tables
+
+
+def iter_config_tables(client, separator=CONFIG_DB_SEPARATOR, batch_size=PIPELINE_BATCH_SIZE):
+    """
+    Yields (table, dict of key -> fields) for the tables of CONFIG_DB, as `config save` sorts them:
+    the tables and the keys of each table in natural order, the fields of each entry in order.
+    The entries of a table are read when it is yielded.
+    """
+    tables = get_table_keys(client, separator, batch_size)
+    for table in natsorted(tables):
+        keys = tables[table]
+        entries = {}
+        for key, raw in zip(keys, hgetall_pipelined(client, keys, batch_size)):
+            # A key deleted since the scan has no fields
+            if raw:
+                fields = deserialize_fields(raw)
+                entries[key.split(separator, 1)[1]] = {name: fields[name] for name in sorted(fields)}
+        if entries:
+            yield table, {key: entries[key] for key in natsorted(entries)}
+
+
+def dump_config_tables(tables, stream):
+    """
+    Writes the config made of the (table, entries) of tables to stream as json.dump(config, stream,
+    indent=4) would, while only one table is held in memory at a time. Returns the number of entries.
+    """
+    count = 0
+    separator = "\n"
+    stream.write("{")
+    for table, entries in tables:
+        stream.write(separator)
+        stream.write("    {}: {}".format(json.dumps(table), json.dumps(entries, indent=4).replace("\n", "\n    ")))
+        separator = ",\n"
+        count += len(entries)
+    stream.write("}" if separator == "\n" else "\n}")
+    return count
+
+
+def write_file_atomic(filename, write):
+    """
+    Calls write(stream) to write the new content of filename to a temporary file of the same
+    directory, syncs it to disk and renames it over filename. The mode of filename is kept.
+    Returns what write returns.
+
+    A filename which exists and is not a regular file, e.g. /dev/stdout, is written directly, as
+    it cannot be replaced by a rename.
+    """
+    if os.path.exists(filename) and not os.path.isfile(filename):
+        with open(filename, 'w') as stream:
+            return write(stream)
+
+    filename = os.path.realpath(filename)
+    dirname = os.path.dirname(filename)
+    fd, tmpname = tempfile.mkstemp(dir=dirname, prefix='.' + os.path.basename(filename) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'w') as stream:
+            result = write(stream)
+            stream.flush()
+            os.fsync(stream.fileno())
+        try:
+            mode = os.stat(filename).st_mode & 0o7777
+        except FileNotFoundError:
+            mode = DEFAULT_FILE_MODE
+        os.chmod(tmpname, mode)
+        os.replace(tmpname, filename)
+    except BaseException:
+        try:
+            os.unlink(tmpname)
+        except OSError:
+            pass
+        raise
+
+    # Persist the rename
+    dir_fd = os.open(dirname, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+    return result
+
+
+def save_config(client, filename, separator=CONFIG_DB_SEPARATOR, batch_size=PIPELINE_BATCH_SIZE):
+    """
+    Saves the content of CONFIG_DB, read with the redis client, to filename as sorted JSON.
+    Returns the number of entries saved.
+    """
+    return write_file_atomic(filename, lambda stream: dump_config_tables(
+        iter_config_tables(client, separator, batch_size), stream))
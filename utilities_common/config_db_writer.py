@@ -0,0 +1,149 @@
+"""
+In-process bulk writer of config files into CONFIG_DB.
+
+`sonic-cfggen -j <file> --write-to-db` parses the file again in a forked process before writing it.
+The helpers here write a config which is already parsed, with pipelined HMSETs sent in MULTI
+batches. They can also diff the config against the current content of CONFIG_DB and write only the
+entries which changed, so loading a config which is already in CONFIG_DB writes nothing.
+"""
+from utilities_common.counter_snapshot import PIPELINE_BATCH_SIZE, hgetall_pipelined, scan_keys
+
+CONFIG_DB_SEPARATOR = '|'
+
+
+def merge_config(dst, src):
+    """
+    Merges the config src into dst as sonic-cfggen merges the files given with -j: the entries of
+    the tables of src are added to the ones of dst, and the fields of an entry of both are updated
+    with the ones of src. Returns dst.
+    """
+    for key, value in src.items():
+        if isinstance(value, dict):
+            node = dst.setdefault(key, {})
+            merge_config(node, value)
+        else:
+            dst[key] = value
+    return dst
+
+
+def is_config_table(table):
+    """
+    Returns True for the tables which sonic-cfggen writes to CONFIG_DB, the ones starting in upper case.
+    """
+    return bool(table) and table[0].isupper()
+
+
+def serialize_fields(fields):
+    """
+    Returns the fields of an entry as they are stored in CONFIG_DB, as ConfigDBConnector stores them.
+    """
+    if not fields:
+        return {"NULL": "NULL"}
+    raw = {}
+    for name, value in fields.items():
+        if isinstance(value, list):
+            raw[name + '@'] = ','.join(value)
+        else:
+            raw[name] = str(value)
+    return raw
+
+
+def get_config_entries(config, separator=CONFIG_DB_SEPARATOR):
+    """
+    Returns a dict of CONFIG_DB key -> fields for all the entries of the config tables of config.
+    The table names are upper-cased, as ConfigDBConnector.mod_config does.
+    """
+    entries = {}
+    for table, table_data in config.items():
+        if not is_config_table(table) or not isinstance(table_data, dict):
+            continue
+        for key, fields in table_data.items():
+            if isinstance(key, tuple):
+                key = separator.join(key)
+            entries[table.upper() + separator + key] = serialize_fields(fields)
+    return entries
+
+
+def get_deleted_tables(config):
+    """
+    Returns the config tables of config which are null. ConfigDBConnector.mod_config deletes them
+    from CONFIG_DB, so sonic-cfggen --write-to-db does too.
+    """
+    return [table.upper() for table, table_data in config.items()
+            if is_config_table(table) and table_data is None]
+
+
+def get_db_entries(client, separator=CONFIG_DB_SEPARATOR, batch_size=PIPELINE_BATCH_SIZE):
+    """
+    Returns a dict of key -> fields for all the entries of the config tables in CONFIG_DB.
+    Keys which are not entries of a config table, e.g. CONFIG_DB_INITIALIZED, are skipped.
+    """
+    entries = {}
+    for keys in scan_keys(client, '*' + separator + '*', batch_size):
+        keys = [key for key in keys if is_config_table(key.split(separator, 1)[0])]
+        entries.update(zip(keys, hgetall_pipelined(client, keys, batch_size)))
+    return entries
+
+
+def diff_entries(current, entries, merge=False, deleted_tables=(), separator=CONFIG_DB_SEPARATOR):
+    """
+    Returns (changed, removed): the dict of key -> fields of entries which differ from current and
+    the list of keys of current which are not in entries.
+
+    With merge, as when a config is loaded on top of CONFIG_DB, an entry changed only if it has a
+    field which differs from current, and only the keys of the deleted tables are removed.
+    """
+    if merge:
+        changed = {key: fields for key, fields in entries.items()
+                   if any(current.get(key, {}).get(name) != value for name, value in fields.items())}
+        removed = [key for key in current if key.split(separator, 1)[0] in deleted_tables]
+        return changed, removed
+
+    changed = {key: fields for key, fields in entries.items() if current.get(key) != fields}
+    removed = [key for key in current if key not in entries]
+    return changed, removed
+
+
+def write_entries(client, entries, removed=(), replace=False, batch_size=PIPELINE_BATCH_SIZE):
+    """
+    Deletes the removed keys and writes entries, a dict of key -> fields, to CONFIG_DB in MULTI
+    batches of pipelined commands. The fields of an entry are merged with the ones in CONFIG_DB,
+    unless replace is set, in which case the entry is deleted first.
+    """
+    # The commands of a key are always sent in the same batch
+    keys = [(key, None) for key in removed] + list(entries.items())
+    for start in range(0, len(keys), batch_size):
+        pipe = client.pipeline(transaction=True)
+        for key, fields in keys[start:start + batch_size]:
+            if fields is None or replace:
+                pipe.delete(key)
+            if fields is not None:
+                pipe.hmset(key, fields)
+        pipe.execute()
+
+
+def load_config(client, config, diff=False, merge=False, separator=CONFIG_DB_SEPARATOR,
+                batch_size=PIPELINE_BATCH_SIZE):
+    """
+    Writes the config tables of config, a parsed config_db.json, to CONFIG_DB with the redis client.
+
+    Without diff all the entries are written, merged with the ones in CONFIG_DB: the caller flushes
+    CONFIG_DB first to replace its content. With diff only the entries which differ from CONFIG_DB
+    are written, and unless merge is set the entries which are not in config are removed, so that
+    CONFIG_DB ends up with the same content as if it was flushed first. The entries of the tables
+    which are null in config are removed in both cases.
+
+    Returns (number of entries written, number of entries removed).
+    """
+    entries = get_config_entries(config, separator)
+    deleted_tables = get_deleted_tables(config)
+    if not diff:
+        removed = [key for table in deleted_tables
+                   for keys in scan_keys(client, table + separator + '*', batch_size) for key in keys]
+        write_entries(client, entries, removed, batch_size=batch_size)
+        return len(entries), len(removed)
+
+    current = get_db_entries(client, separator, batch_size)
+    changed, removed = diff_entries(current, entries, merge, deleted_tables, separator)
+    write_entries(client, changed, removed, replace=not merge, batch_size=batch_size)
+    return len(changed), len(removed)
@@ -0,0 +1,159 @@
+"""
+Bulk readers for the counter hashes kept in COUNTERS_DB and the other SONiC databases.
+
+Reading the counters of every port with a `get` per field, or a `get_all` per port, costs a redis
+round trip each. The helpers here read all the hashes with pipelined HGETALLs instead, so the time
+it takes is bounded by the size of the counters rather than by the number of round trips.
+"""
+import redis
+
+from sonic_py_common import multi_asic
+from swsscommon.swsscommon import SonicDBConfig
+
+# Number of HGETALLs sent to redis in a single pipeline
+PIPELINE_BATCH_SIZE = 1024
+
+# (namespace, db name, use unix socket) -> redis-py client, so repeated reads reuse the connection
+_pipeline_clients = {}
+
+
+def get_pipeline_client(db, db_name, namespace=multi_asic.DEFAULT_NAMESPACE, use_unix_socket_path=True):
+    """
+    Returns a redis client of the given database which supports pipelines.
+
+    The client of the connector is used if it supports pipelines. The swsscommon DBConnector does not,
+    in which case a redis-py connection to the same database is opened.
+    """
+    client = db.get_redis_client(db_name)
+    if hasattr(client, "pipeline"):
+        return client
+
+    namespace = namespace if namespace else multi_asic.DEFAULT_NAMESPACE
+    key = (namespace, db_name, use_unix_socket_path)
+    if key not in _pipeline_clients:
+        db_id = SonicDBConfig.getDbId(db_name, namespace)
+        if use_unix_socket_path:
+            _pipeline_clients[key] = redis.Redis(unix_socket_path=SonicDBConfig.getDbSock(db_name, namespace),
+                                                 db=db_id, decode_responses=True)
+        else:
+            _pipeline_clients[key] = redis.Redis(host=SonicDBConfig.getDbHostname(db_name, namespace),
+                                                 port=SonicDBConfig.getDbPort(db_name, namespace),
+                                                 db=db_id, decode_responses=True)
+    return _pipeline_clients[key]
+
+
+def hgetall_pipelined(client, keys, batch_size=PIPELINE_BATCH_SIZE):
+    """
+    Returns the fields of each of the keys as a list of dicts, in the order of the keys.
+    A key which does not exist has an empty dict.
+    """
+    keys = list(keys)
+    results = []
+    for start in range(0, len(keys), batch_size):
+        pipe = client.pipeline(transaction=False)
+        for key in keys[start:start + batch_size]:
+            pipe.hgetall(key)
+        results.extend(pipe.execute())
+    return [result if result else {} for result in results]
+
+
+def get_all_pipelined(db, db_name, keys, namespace=multi_asic.DEFAULT_NAMESPACE, use_unix_socket_path=True):
+    """
+    Returns a dict of key -> fields for all the keys of db_name, read with pipelined HGETALLs.
+    """
+    keys = list(keys)
+    client = get_pipeline_client(db, db_name, namespace, use_unix_socket_path)
+    return dict(zip(keys, hgetall_pipelined(client, keys)))
+
+
+class CounterSnapshot(object):
+    """
+    A snapshot of the counter tables of one database in one namespace.
+
+    The name, index and type maps are read once and the counter hashes are read with pipelined
+    HGETALLs, so a tool can look up every object it shows without further round trips. Counters are
+    exposed per object, or as columns of values in the order of the objects.
+    """
+
+    def __init__(self, db, namespace=multi_asic.DEFAULT_NAMESPACE, db_name=None, use_unix_socket_path=True):
+        self.db = db
+        self.namespace = namespace
+        self.db_name = db_name if db_name else db.COUNTERS_DB
+        self.use_unix_socket_path = use_unix_socket_path
+        self.maps = {}
+        self.tables = {}
+
+    def get_map(self, map_name):
+        """
+        Returns the fields of the hash map_name, e.g. COUNTERS_PORT_NAME_MAP, read once per snapshot.
+        """
+        if map_name not in self.maps:
+            self.maps[map_name] = self.db.get_all(self.db_name, map_name) or {}
+        return self.maps[map_name]
+
+    def load(self, keys):
+        """
+        Reads the hashes of the keys which are not in the snapshot yet with pipelined HGETALLs.
+        """
+        missing = [key for key in dict.fromkeys(keys) if key not in self.tables]
+        if missing:
+            self.tables.update(get_all_pipelined(self.db, self.db_name, missing, self.namespace,
+                                                 self.use_unix_socket_path))
+
+    def get_table(self, key):
+        """
+        Returns the fields of the hash key, an empty dict if it does not exist.
+        """
+        self.load([key])
+        return self.tables[key]
+
+    def get_counters(self, oids, table_prefix="COUNTERS:"):
+        """
+        Returns the fields of the counter table of each of the oids, in the order of the oids.
+        """
+        keys = [table_prefix + oid for oid in oids]
+        self.load(keys)
+        return [self.tables[key] for key in keys]
+
+    def get_columns(self, oids, counter_names, table_prefix="COUNTERS:"):
+        """
+        Returns a dict of counter name -> list of the values of the counter for each of the oids.
+        The value of a counter which is not in the table of an oid is None.
+        """
+        counters = self.get_counters(oids, table_prefix)
+        return {name: [fields.get(name) for fields in counters] for name in counter_names}
+
+
+def scan_keys(client, pattern, count=PIPELINE_BATCH_SIZE):
+    """
+    Yields the keys matching pattern in batches, read with cursor based SCANs.
+
+    Unlike KEYS, SCAN does not block redis while the whole keyspace is walked. A key which SCAN
+    returns more than once, as it may while redis rehashes, is yielded once.
+    """
+    seen = set()
+    cursor = 0
+    while True:
+        cursor, keys = client.scan(cursor, pattern, count)
+        batch = [key for key in keys if key not in seen]
+        seen.update(batch)
+        if batch:
+            yield batch
+        if int(cursor) == 0:
+            break
+
+
+def scan_all_pipelined(db, db_name, pattern, namespace=multi_asic.DEFAULT_NAMESPACE, use_unix_socket_path=True,
+                       key_filter=None, batch_size=PIPELINE_BATCH_SIZE):
+    """
+    Yields (key, fields) for all the keys of db_name matching pattern.
+
+    The keys are streamed with SCAN and the fields of each batch of keys are read with pipelined
+    HGETALLs, so the entries can be processed without holding all of them at once. Keys for which
+    key_filter returns False are skipped before their fields are read.
+    """
+    client = get_pipeline_client(db, db_name, namespace, use_unix_socket_path)
+    for keys in scan_keys(client, pattern, batch_size):
+        if key_filter is not None:
+            keys = [key for key in keys if key_filter(key)]
+        yield from zip(keys, hgetall_pipelined(client, keys, batch_size))
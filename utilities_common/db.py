@@ -1,41 +1,175 @@
+from collections.abc import MutableMapping
+
 from sonic_py_common import multi_asic, device_info
 from swsscommon.swsscommon import ConfigDBConnector, ConfigDBPipeConnector, SonicV2Connector
 from utilities_common import constants
 from utilities_common.multi_asic import multi_asic_ns_choices
 
 
+class LazyDBConnector(object):
+    """
+    Wraps a SonicV2Connector to connect to each DB on its first use, rather
+    than to all the DBs of db_list up front. Any other attribute is the one of
+    the wrapped connector.
+    """
+
+    # Methods which take a DB name but need no connection to it
+    NO_CONNECT = frozenset(['connect', 'close', 'get_db_list', 'get_db_separator', 'get_dbid'])
+
+    def __init__(self, connector, db_list):
+        self._connector = connector
+        self._db_list = frozenset(db_list)
+        self._connected = set()
+
+    def connect(self, db_name, *args, **kwargs):
+        self._connector.connect(db_name, *args, **kwargs)
+        self._connected.add(db_name)
+
+    def close(self, *args, **kwargs):
+        if args:
+            self._connected.discard(args[0])
+        else:
+            self._connected.clear()
+        return self._connector.close(*args, **kwargs)
+
+    def __getattr__(self, name):
+        attr = getattr(self._connector, name)
+        if not callable(attr) or name in self.NO_CONNECT:
+            return attr
+
+        def connect_and_call(*args, **kwargs):
+            db_name = args[0] if args else kwargs.get('db_name')
+            if isinstance(db_name, str) and db_name in self._db_list and db_name not in self._connected:
+                self.connect(db_name)
+            return attr(*args, **kwargs)
+        return connect_and_call
+
+
+class LazyNamespaceClients(MutableMapping):
+    """
+    Dict of namespace -> DB client, which creates the client of a namespace
+    with connect(namespace) on its first access.
+    """
+
+    def __init__(self, namespaces, connect):
+        self._namespaces = list(namespaces)
+        self._connect = connect
+        self._clients = {}
+
+    def __getitem__(self, namespace):
+        if namespace not in self._clients:
+            if namespace not in self._namespaces:
+                raise KeyError(namespace)
+            self._clients[namespace] = self._connect(namespace)
+        return self._clients[namespace]
+
+    def __setitem__(self, namespace, client):
+        if namespace not in self._namespaces:
+            self._namespaces.append(namespace)
+        self._clients[namespace] = client
+
+    def __delitem__(self, namespace):
+        self._namespaces.remove(namespace)
+        self._clients.pop(namespace, None)
+
+    def __iter__(self):
+        return iter(list(self._namespaces))
+
+    def __len__(self):
+        return len(self._namespaces)
+
+    def __contains__(self, namespace):
+        return namespace in self._namespaces
+
+
 class Db(object):
+    """
+    The DB clients of the CLI. Nothing is connected up front: each client is
+    created on its first use, and each DB of a SonicV2Connector is connected
+    on the first access to it, so a command pays only for the DBs it reads.
+    """
+
     def __init__(self):
-        self.cfgdb_clients = {}
-        self.db_clients = {}
-        self.cfgdb = ConfigDBConnector()
-        self.cfgdb.connect()
-        self.cfgdb_pipe = ConfigDBPipeConnector()
-        self.cfgdb_pipe.connect()
-        self.db = SonicV2Connector(host="127.0.0.1")
+        self._cfgdb = None
+        self._cfgdb_pipe = None
+        self._db = None
+        self._db_list = None
+
+        namespaces = [constants.DEFAULT_NAMESPACE]
+        if multi_asic.is_multi_asic():
+            self.ns_list = multi_asic_ns_choices()
+            namespaces += self.ns_list
+
+        self.cfgdb_clients = LazyNamespaceClients(namespaces, self._connect_config_db_for_ns)
+        self.db_clients = LazyNamespaceClients(namespaces, self._connect_to_all_dbs_for_ns)
+
+    @property
+    def cfgdb(self):
+        if self._cfgdb is None:
+            self._cfgdb = ConfigDBConnector()
+            self._cfgdb.connect()
+        return self._cfgdb
+
+    @cfgdb.setter
+    def cfgdb(self, cfgdb):
+        self._cfgdb = cfgdb
+
+    @property
+    def cfgdb_pipe(self):
+        if self._cfgdb_pipe is None:
+            self._cfgdb_pipe = ConfigDBPipeConnector()
+            self._cfgdb_pipe.connect()
+        return self._cfgdb_pipe
 
+    @cfgdb_pipe.setter
+    def cfgdb_pipe(self, cfgdb_pipe):
+        self._cfgdb_pipe = cfgdb_pipe
+
+    @property
+    def db(self):
+        if self._db is None:
+            db = SonicV2Connector(host="127.0.0.1")
+            if self._db_list is None:
+                self._db_list = self._get_db_list(db)
+            self._db = LazyDBConnector(db, self._db_list)
+        return self._db
+
+    @db.setter
+    def db(self, db):
+        self._db = db
+
+    @property
+    def db_list(self):
+        if self._db_list is None:
+            self._db_list = self._get_db_list(self.db)
+        return self._db_list
+
+    @db_list.setter
+    def db_list(self, db_list):
+        self._db_list = db_list
+
+    @staticmethod
+    def _get_db_list(db):
+        db_list = list(db.get_db_list())
         # Skip connecting to chassis databases in line cards
-        self.db_list = list(self.db.get_db_list())
         if not device_info.is_supervisor():
             try:
-                self.db_list.remove('CHASSIS_APP_DB')
-                self.db_list.remove('CHASSIS_STATE_DB')
+                db_list.remove('CHASSIS_APP_DB')
+                db_list.remove('CHASSIS_STATE_DB')
             except Exception:
                 pass
+        return db_list
 
-        for db_id in self.db_list:
-            self.db.connect(db_id)
-
-        self.cfgdb_clients[constants.DEFAULT_NAMESPACE] = self.cfgdb
-        self.db_clients[constants.DEFAULT_NAMESPACE] = self.db
+    def _connect_config_db_for_ns(self, namespace):
+        if namespace == constants.DEFAULT_NAMESPACE:
+            return self.cfgdb
+        return multi_asic.connect_config_db_for_ns(namespace)
 
-        if multi_asic.is_multi_asic():
-            self.ns_list = multi_asic_ns_choices()
-            for ns in self.ns_list:
-                self.cfgdb_clients[ns] = (
-                    multi_asic.connect_config_db_for_ns(ns)
-                )
-                self.db_clients[ns] = multi_asic.connect_to_all_dbs_for_ns(ns)
+    def _connect_to_all_dbs_for_ns(self, namespace):
+        if namespace == constants.DEFAULT_NAMESPACE:
+            return self.db
+        db = SonicV2Connector(use_unix_socket_path=True, namespace=namespace)
+        return LazyDBConnector(db, db.get_db_list())
 
     def get_data(self, table, key):
         data = self.cfgdb.get_table(table)
@@ -0,0 +1,133 @@
+"""
+Incremental parser for the JSON route tables printed by FRR, e.g. `show ip route json`.
+
+The output is an object of prefix -> list of route entries. On a full table it is hundreds of MB
+once loaded with json.loads, while most callers look at a few fields of each entry. The helpers
+here read the output in chunks and yield the entries of one prefix at a time, so memory use is
+bounded by the largest prefix rather than by the size of the table.
+"""
+import json
+import re
+import subprocess
+
+# Number of characters read from the stream at a time
+CHUNK_SIZE = 64 * 1024
+
+_WHITESPACE = re.compile(r"\s*")
+_decoder = json.JSONDecoder()
+
+
+class _JsonReader(object):
+    """
+    Reads JSON values from a text stream, buffering only what is not parsed yet.
+    """
+
+    def __init__(self, stream, chunk_size):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buf = ""
+        self.pos = 0
+
+    def _fill(self):
+        """
+        Appends the next chunk of the stream to the buffer, dropping what is parsed.
+        Returns False at the end of the stream.
+        """
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            return False
+        self.buf = self.buf[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def peek(self):
+        """
+        Returns the next character which is not whitespace, an empty string at the end of the stream.
+        """
+        while True:
+            self.pos = _WHITESPACE.match(self.buf, self.pos).end()
+            if self.pos < len(self.buf):
+                return self.buf[self.pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError("Expecting '{}' in FRR JSON output, found '{}'".format(
+                char, self.buf[self.pos:self.pos + 16]))
+        self.pos += 1
+
+    def value(self):
+        """
+        Returns the next JSON value.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buf, self.pos)
+            except json.JSONDecodeError:
+                # The value may continue in the next chunk
+                if self._fill():
+                    continue
+                raise
+            # So may a number which ends the buffer
+            if end == len(self.buf) and self._fill():
+                continue
+            self.pos = end
+            return value
+
+
+def iter_prefix_routes(stream, chunk_size=CHUNK_SIZE):
+    """
+    Yields (prefix, list of route entries) for each prefix of the FRR route table JSON read from
+    stream, as the stream is read.
+
+    Raises ValueError if the stream is not a JSON object.
+    """
+    reader = _JsonReader(stream, chunk_size)
+    reader.expect("{")
+    if reader.peek() == "}":
+        return
+    while True:
+        prefix = reader.value()
+        if not isinstance(prefix, str):
+            raise ValueError("Expecting a prefix in FRR JSON output, found {}".format(prefix))
+        reader.expect(":")
+        yield prefix, reader.value()
+        if reader.peek() != ",":
+            break
+        reader.pos += 1
+    reader.expect("}")
+
+
+def stream_command_routes(cmd, chunk_size=CHUNK_SIZE):
+    """
+    Runs cmd and yields (prefix, list of route entries) of the FRR route table JSON it prints, as
+    the output streams in.
+
+    Raises subprocess.CalledProcessError if cmd fails, as subprocess.check_output does.
+    """
+    with subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True) as proc:
+        try:
+            yield from iter_prefix_routes(proc.stdout, chunk_size)
+            proc.stdout.read()
+        except ValueError as e:
+            # A failing command prints an error rather than JSON
+            proc.stdout.read()
+            if proc.wait():
+                raise subprocess.CalledProcessError(proc.returncode, cmd) from e
+            raise
+        except BaseException:
+            proc.kill()
+            raise
+    if proc.returncode:
+        raise subprocess.CalledProcessError(proc.returncode, cmd)
+
+
+def dumps_prefix_routes(prefix_routes):
+    """
+    Returns the JSON of the (prefix, list of route entries) pairs as one object, as json.dumps of
+    the whole table would, while only one prefix is held in memory at a time.
+    """
+    return "{" + ", ".join("{}: {}".format(json.dumps(prefix), json.dumps(entries))
+                           for prefix, entries in prefix_routes) + "}"
@@ -130,22 +130,27 @@ def run_on_multi_asic(func):
     This decorator is used on the CLI functions which needs to be
     run on all the namespaces in the multi ASIC platform
     The decorator loops through all the required namespaces,
-    for every iteration, it connects to all the DBs and provides an handle
-    to the wrapped function.
+    for every iteration, it provides the DB handles of the namespace
+    to the wrapped function. The handles come from a utilities_common.db.Db,
+    so only the DBs the function uses get connected.
 
     '''
     @functools.wraps(func)
     def wrapped_run_on_all_asics(self, *args, **kwargs):
         ns_list = self.multi_asic.get_ns_list_based_on_options()
+        if not self.multi_asic.db:
+            # Imported here as utilities_common.db imports this module
+            from utilities_common.db import Db
+            self.multi_asic.db = Db()
         for ns in ns_list:
             self.multi_asic.current_namespace = ns
             # if object instance already has db connections, use them
-            if self.multi_asic.db and self.multi_asic.db.cfgdb_clients.get(ns):
+            if ns in self.multi_asic.db.cfgdb_clients:
                 self.config_db = self.multi_asic.db.cfgdb_clients[ns]
             else:
                 self.config_db = multi_asic.connect_config_db_for_ns(ns)
 
-            if self.multi_asic.db and self.multi_asic.db.db_clients.get(ns):
+            if ns in self.multi_asic.db.db_clients:
                 self.db = self.multi_asic.db.db_clients[ns]
             else:
                 self.db = multi_asic.connect_to_all_dbs_for_ns(ns)
@@ -58,6 +58,58 @@ def ns_util(newstr, oldstr, delta, port_rate=PORT_RATE):
         util = rate/(port_rate*1000*1000*1000/8.0)*100
         return "{:.2f}%".format(util)
 
+def counter_column(cnstat_dict, keys, field, default=STATUS_NA):
+    """
+        Get the values of a counter for the given objects of a cnstat dict, in the order of the keys.
+        Objects which are not in the dict have the default value.
+    """
+    missing = {field: default}
+    return [cnstat_dict.get(key, missing).get(field, default) for key in keys]
+
+
+def ns_diff_batch(new_values, old_values, raw=False):
+    """
+        Calculate the diffs of a counter column, as ns_diff does for a single value.
+        Returns a list of ints, with N/A where the new value is N/A. Use
+        format_number_batch to display them.
+    """
+    diffs = [STATUS_NA if new == STATUS_NA else int(new) - (0 if old == STATUS_NA else int(old))
+             for new, old in zip(new_values, old_values)]
+    if raw:
+        return diffs
+    return [diff if diff == STATUS_NA else max(0, diff) for diff in diffs]
+
+
+def format_number_batch(values):
+    """
+        Format a column of diffs with comma.
+    """
+    return [value if value == STATUS_NA else '{:,}'.format(value) for value in values]
+
+
+def format_brate_batch(rates):
+    """
+        Show a column of byte rates.
+    """
+    return [format_brate(rate) for rate in rates]
+
+
+def format_prate_batch(rates):
+    """
+        Show a column of packet rates.
+    """
+    return [format_prate(rate) for rate in rates]
+
+
+def format_util_batch(utils, brates, port_rates):
+    """
+        Show a column of utils. Where the util is N/A, calculate it from the
+        byte rate and the port rate, as format_util does.
+    """
+    return [format_util(brate, port_rate) if util == STATUS_NA else format_util_directly(util)
+            for util, brate, port_rate in zip(utils, brates, port_rates)]
+
+
 def table_as_json(table, header):
     """
         Print table as json format.
@@ -9,10 +9,11 @@ from sonic_py_common import device_info
 from swsscommon.swsscommon import SonicV2Connector, CounterTable, PortCounter
 
 from utilities_common import constants
+from utilities_common import counter_snapshot
 import utilities_common.multi_asic as multi_asic_util
-from utilities_common.netstat import ns_diff, table_as_json, format_brate, format_prate, \
-                                     format_util, format_number_with_comma, format_util_directly, \
-                                     format_fec_ber
+from utilities_common.netstat import ns_diff, table_as_json, format_number_with_comma, \
+                                     format_fec_ber, counter_column, ns_diff_batch, format_number_batch, \
+                                     format_brate_batch, format_prate_batch, format_util_batch
 
 """
 The order and count of statistics mentioned below needs to be in sync with the values in portstat script
@@ -45,6 +46,8 @@ rates_key_list = ['RX_BPS', 'RX_PPS', 'RX_UTIL', 'TX_BPS', 'TX_PPS', 'TX_UTIL',
 ratestat_fields = ("rx_bps",  "rx_pps", "rx_util", "tx_bps", "tx_pps", "tx_util", "fec_pre_ber", "fec_post_ber",
                    "fec_pre_ber_max")
 RateStats = namedtuple("RateStats", ratestat_fields)
+# Counters published by the linecards to CHASSIS_STATE_DB, in the order of the first fields of NStats
+linecard_cnstat_fields = ("rx_ok", "rx_err", "rx_drop", "rx_ovr", "tx_ok", "tx_err", "tx_drop", "tx_ovr")
 
 """
 The order and count of statistics mentioned below needs to be in sync with the values in portstat script
@@ -129,6 +132,8 @@ PORT_STATUS_VALUE_UP = 'UP'
 PORT_STATUS_VALUE_DOWN = 'DOWN'
 PORT_SPEED_FIELD = "speed"
 
+GEARBOX_TABLE_INTERFACE_PREFIX = "_GEARBOX_TABLE:interface:"
+
 PORT_STATE_UP = 'U'
 PORT_STATE_DOWN = 'D'
 PORT_STATE_DISABLED = 'X'
@@ -166,6 +171,8 @@ class Portstat(object):
         self.namespace = namespace
         self.display_option = display_option
         self.multi_asic = multi_asic_util.MultiAsic(display_option, namespace)
+        # namespace -> whether it has gearbox ports, detected once per run
+        self.gearbox_ports = {}
         if device_info.is_supervisor():
             self.db = SonicV2Connector(use_unix_socket_path=False)
             self.db.connect(self.db.CHASSIS_STATE_DB, False)
@@ -229,30 +236,15 @@ class Portstat(object):
         cnstat_dict['time'] = datetime.datetime.now()
         ratestat_dict = OrderedDict()
 
-        # Get the counter values from CHASSIS_STATE_DB
+        # Get the counter values of all the linecard ports from CHASSIS_STATE_DB in one pipelined pass
+        linecard_port_stats = counter_snapshot.get_all_pipelined(self.db, self.db.CHASSIS_STATE_DB,
+                                                                 linecard_port_aliases, use_unix_socket_path=False)
         for key in linecard_port_aliases:
-            rx_ok = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_ok")
-            rx_bps = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_bps")
-            rx_pps = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_pps")
-            rx_util = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_util")
-            rx_err = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_err")
-            rx_drop = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_drop")
-            rx_ovr = self.db.get(self.db.CHASSIS_STATE_DB, key, "rx_ovr")
-            tx_ok = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_ok")
-            tx_bps = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_bps")
-            tx_pps = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_pps")
-            tx_util = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_util")
-            tx_err = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_err")
-            tx_drop = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_drop")
-            tx_ovr = self.db.get(self.db.CHASSIS_STATE_DB, key, "tx_ovr")
-            fec_pre_ber = self.db.get(self.db.CHASSIS_STATE_DB, key, "fec_pre_ber")
-            fec_post_ber = self.db.get(self.db.CHASSIS_STATE_DB, key, "fec_post_ber")
-            fec_pre_ber_max = self.db.get(self.db.CHASSIS_STATE_DB, key, "fec_pre_ber_max")
+            stats = linecard_port_stats[key]
             port_alias = key.split("|")[-1]
-            cnstat_dict[port_alias] = NStats._make([rx_ok, rx_err, rx_drop, rx_ovr, tx_ok, tx_err, tx_drop, tx_ovr] +
+            cnstat_dict[port_alias] = NStats._make([stats.get(field) for field in linecard_cnstat_fields] +
                                                    [STATUS_NA] * (len(NStats._fields) - 8))._asdict()
-            ratestat_dict[port_alias] = RateStats._make([rx_bps, rx_pps, rx_util, tx_bps,
-                                                        tx_pps, tx_util, fec_pre_ber, fec_post_ber, fec_pre_ber_max])
+            ratestat_dict[port_alias] = RateStats._make([stats.get(field) for field in ratestat_fields])
         self.cnstat_dict.update(cnstat_dict)
         self.ratestat_dict.update(ratestat_dict)
 
@@ -311,14 +303,12 @@ class Portstat(object):
         """
             Get the counters info from database.
         """
-        def get_counters(port):
+        def get_counters(fvs):
             """
-                Get the counters from specific table.
+                Get the counters from the fields of the port counters table.
             """
             fields = ["0"] * len(counter_bucket_dict)
 
-            _, fvs = counter_table.get(PortCounter(), port)
-            fvs = dict(fvs)
             for pos, cntr_list in counter_bucket_dict.items():
                 for counter_name in cntr_list:
                     if counter_name not in fvs:
@@ -329,14 +319,13 @@ class Portstat(object):
             cntr = NStats._make(fields)._asdict()
             return cntr
 
-        def get_rates(table_id):
+        def get_rates(fvs):
             """
-                Get the rates from specific table.
+                Get the rates from the fields of the port rates table.
             """
             fields = ["0", "0", "0", "0", "0", "0", "0", "0", "0"]
             for pos, name in enumerate(rates_key_list):
-                full_table_id = RATES_TABLE_PREFIX + table_id
-                counter_data = self.db.get(self.db.COUNTERS_DB, full_table_id, name)
+                counter_data = fvs.get(name)
                 if counter_data is None:
                     fields[pos] = STATUS_NA
                 elif fields[pos] != STATUS_NA:
@@ -350,17 +339,47 @@ class Portstat(object):
         cnstat_dict = OrderedDict()
         cnstat_dict['time'] = datetime.datetime.now()
         ratestat_dict = OrderedDict()
-        counter_table = CounterTable(self.db.get_redis_client(self.db.COUNTERS_DB))
         if counter_port_name_map is None:
             return cnstat_dict, ratestat_dict
-        for port in self.sorted(counter_port_name_map):
-            port_name = port.split(":")[0]
-            if self.multi_asic.skip_display(constants.PORT_OBJ, port_name):
-                continue
-            cnstat_dict[port] = get_counters(port)
-            ratestat_dict[port] = get_rates(counter_port_name_map[port])
+
+        ports = [port for port in self.sorted(counter_port_name_map)
+                 if not self.multi_asic.skip_display(constants.PORT_OBJ, port.split(":")[0])]
+
+        # The counters of gearbox ports are combined with the gearbox counters by CounterTable,
+        # otherwise the counters and the rates of all the ports are read in one pipelined pass
+        counter_table = None
+        if self.has_gearbox_ports():
+            counter_table = CounterTable(self.db.get_redis_client(self.db.COUNTERS_DB))
+
+        table_ids = [counter_port_name_map[port] for port in ports]
+        keys = [RATES_TABLE_PREFIX + table_id for table_id in table_ids]
+        if counter_table is None:
+            keys += [COUNTER_TABLE_PREFIX + table_id for table_id in table_ids]
+        port_stats = counter_snapshot.get_all_pipelined(self.db, self.db.COUNTERS_DB, keys,
+                                                        self.multi_asic.current_namespace)
+
+        for port, table_id in zip(ports, table_ids):
+            if counter_table is not None:
+                _, fvs = counter_table.get(PortCounter(), port)
+                fvs = dict(fvs)
+            else:
+                fvs = port_stats[COUNTER_TABLE_PREFIX + table_id]
+            cnstat_dict[port] = get_counters(fvs)
+            ratestat_dict[port] = get_rates(port_stats[RATES_TABLE_PREFIX + table_id])
         return cnstat_dict, ratestat_dict
 
+    def has_gearbox_ports(self):
+        """
+            Check if there are gearbox ports in the current namespace
+        """
+        namespace = self.multi_asic.current_namespace
+        if namespace not in self.gearbox_ports:
+            # SCAN until the first gearbox port instead of a blocking KEYS over the whole APPL_DB
+            client = counter_snapshot.get_pipeline_client(self.db, self.db.APPL_DB, namespace)
+            batches = counter_snapshot.scan_keys(client, GEARBOX_TABLE_INTERFACE_PREFIX + "*")
+            self.gearbox_ports[namespace] = next(batches, None) is not None
+        return self.gearbox_ports[namespace]
+
     def get_port_speed(self, port_name):
         """
             Get the port speed
@@ -559,137 +578,63 @@ class Portstat(object):
             self.cnstat_intf_diff_print(cnstat_new_dict, cnstat_old_dict, intf_list)
             return None
 
-        table = []
-        header = None
-
-        for key in self.sorted(cnstat_new_dict.keys()):
-            cntr = cnstat_new_dict.get(key)
-            if key == 'time':
-                continue
-            old_cntr = None
-            if key in cnstat_old_dict:
-                old_cntr = cnstat_old_dict.get(key)
-            else:
-                old_cntr = NStats._make([0] * len(counter_bucket_dict))._asdict()
-
-            rates = ratestat_dict.get(key, RateStats._make([STATUS_NA] * len(ratestat_fields)))
+        if print_all:
+            header = header_all
+            columns = ["rx_ok", "rx_bps", "rx_pps", "rx_util", "rx_err", "rx_drop", "rx_ovr",
+                       "tx_ok", "tx_bps", "tx_pps", "tx_util", "tx_err", "tx_drop", "tx_ovr",
+                       "trim", "trim_sent", "trim_drop"]
+            nonzero_fields = ["rx_ok", "tx_ok", "rx_err", "tx_err", "rx_drop", "tx_drop", "rx_ovr", "tx_ovr"]
+        elif errors_only:
+            header = header_errors_only
+            columns = nonzero_fields = ["rx_err", "rx_drop", "rx_ovr", "tx_err", "tx_drop", "tx_ovr"]
+        elif fec_stats_only:
+            header = header_fec_only
+            columns = ["fec_corr", "fec_uncorr", "fec_symbol_err", "fec_pre_ber", "fec_post_ber", "fec_pre_ber_max"]
+            nonzero_fields = ["fec_corr", "fec_uncorr", "fec_symbol_err"]
+        elif rates_only:
+            header = header_rates_only
+            columns = ["rx_ok", "rx_bps", "rx_pps", "rx_util", "tx_ok", "tx_bps", "tx_pps", "tx_util"]
+            nonzero_fields = ["rx_ok", "tx_ok"]
+        elif trim_stats_only:  # Packet Trimming related statistics
+            header = header_trim_only
+            columns = ["trim", "trim_sent", "trim_drop"]
+            nonzero_fields = ["trim"]
+        else:
+            header = header_std
+            columns = ["rx_ok", "rx_bps", "rx_util", "rx_err", "rx_drop", "rx_ovr",
+                       "tx_ok", "tx_bps", "tx_util", "tx_err", "tx_drop", "tx_ovr"]
+            nonzero_fields = ["rx_ok", "rx_err", "rx_drop", "rx_ovr", "tx_ok", "tx_err", "tx_drop", "tx_ovr"]
+        diff_fields = [field for field in columns if field not in ratestat_fields]
+
+        # Diff the counter columns of all the ports at once, then format them
+        keys = [key for key in self.sorted(cnstat_new_dict.keys())
+                if key != 'time' and not (intf_list and key not in intf_list)]
+        diffs = {field: ns_diff_batch(counter_column(cnstat_new_dict, keys, field),
+                                      counter_column(cnstat_old_dict, keys, field, default=0),
+                                      raw=(field == "trim_drop"))
+                 for field in diff_fields}
+        text = {field: format_number_batch(diffs[field]) for field in diff_fields}
+
+        # Format the rate columns of all the ports at once as well
+        na_rates = RateStats._make([STATUS_NA] * len(ratestat_fields))
+        rates = [ratestat_dict.get(key, na_rates) for key in keys]
+        rate_columns = {field: [getattr(rate, field) for rate in rates] for field in ratestat_fields}
+        port_speeds = [self.get_port_speed(key) for key in keys] if "rx_util" in columns else []
+        for field in columns:
+            if field.endswith("_bps"):
+                text[field] = format_brate_batch(rate_columns[field])
+            elif field.endswith("_pps"):
+                text[field] = format_prate_batch(rate_columns[field])
+            elif field.endswith("_util"):
+                text[field] = format_util_batch(rate_columns[field], rate_columns[field[:2] + "_bps"], port_speeds)
+            elif field in ratestat_fields:
+                text[field] = [format_fec_ber(value) for value in rate_columns[field]]
 
-            if intf_list and key not in intf_list:
+        table = []
+        for i, key in enumerate(keys):
+            if nonzero and not any(is_non_zero(diffs[field][i]) for field in nonzero_fields):
                 continue
-            port_speed = self.get_port_speed(key)
-
-            if print_all:
-                header = header_all
-
-                if not nonzero or is_non_zero(ns_diff(cntr["rx_ok"], old_cntr["rx_ok"])) or \
-                   is_non_zero(ns_diff(cntr["tx_ok"], old_cntr["tx_ok"])) or \
-                   is_non_zero(ns_diff(cntr["rx_err"], old_cntr["rx_err"])) or \
-                   is_non_zero(ns_diff(cntr["tx_err"], old_cntr["tx_err"])) or \
-                   is_non_zero(ns_diff(cntr["rx_drop"], old_cntr["rx_drop"])) or \
-                   is_non_zero(ns_diff(cntr["tx_drop"], old_cntr["tx_drop"])) or \
-                   is_non_zero(ns_diff(cntr["rx_ovr"], old_cntr["rx_ovr"])) or \
-                   is_non_zero(ns_diff(cntr["tx_ovr"], old_cntr["tx_ovr"])):
-                    table.append((key, self.get_port_state(key),
-                                  ns_diff(cntr["rx_ok"], old_cntr["rx_ok"]),
-                                  format_brate(rates.rx_bps),
-                                  format_prate(rates.rx_pps),
-                                  format_util(rates.rx_bps, port_speed)
-                                  if rates.rx_util == STATUS_NA else format_util_directly(rates.rx_util),
-                                  ns_diff(cntr["rx_err"], old_cntr["rx_err"]),
-                                  ns_diff(cntr["rx_drop"], old_cntr["rx_drop"]),
-                                  ns_diff(cntr["rx_ovr"], old_cntr["rx_ovr"]),
-                                  ns_diff(cntr["tx_ok"], old_cntr["tx_ok"]),
-                                  format_brate(rates.tx_bps),
-                                  format_prate(rates.tx_pps),
-                                  format_util(rates.tx_bps, port_speed)
-                                  if rates.tx_util == STATUS_NA else format_util_directly(rates.tx_util),
-                                  ns_diff(cntr["tx_err"], old_cntr["tx_err"]),
-                                  ns_diff(cntr["tx_drop"], old_cntr["tx_drop"]),
-                                  ns_diff(cntr["tx_ovr"], old_cntr["tx_ovr"]),
-                                  ns_diff(cntr["trim"], old_cntr["trim"]),
-                                  ns_diff(cntr["trim_sent"], old_cntr["trim_sent"]),
-                                  ns_diff(cntr["trim_drop"], old_cntr["trim_drop"], raw=True)))
-            elif errors_only:
-                header = header_errors_only
-
-                if not nonzero or is_non_zero(ns_diff(cntr["rx_err"], old_cntr["rx_err"])) or \
-                   is_non_zero(ns_diff(cntr["tx_err"], old_cntr["tx_err"])) or \
-                   is_non_zero(ns_diff(cntr["rx_drop"], old_cntr["rx_drop"])) or \
-                   is_non_zero(ns_diff(cntr["tx_drop"], old_cntr["tx_drop"])) or \
-                   is_non_zero(ns_diff(cntr["rx_ovr"], old_cntr["rx_ovr"])) or \
-                   is_non_zero(ns_diff(cntr["tx_ovr"], old_cntr["tx_ovr"])):
-                    table.append((key, self.get_port_state(key),
-                                  ns_diff(cntr["rx_err"], old_cntr["rx_err"]),
-                                  ns_diff(cntr["rx_drop"], old_cntr["rx_drop"]),
-                                  ns_diff(cntr["rx_ovr"], old_cntr["rx_ovr"]),
-                                  ns_diff(cntr["tx_err"], old_cntr["tx_err"]),
-                                  ns_diff(cntr["tx_drop"], old_cntr["tx_drop"]),
-                                  ns_diff(cntr["tx_ovr"], old_cntr["tx_ovr"])))
-            elif fec_stats_only:
-                header = header_fec_only
-
-                if not nonzero or is_non_zero(ns_diff(cntr['fec_corr'], old_cntr['fec_corr'])) or \
-                   is_non_zero(ns_diff(cntr['fec_uncorr'], old_cntr['fec_uncorr'])) or \
-                   is_non_zero(ns_diff(cntr['fec_symbol_err'], old_cntr['fec_symbol_err'])):
-                    table.append((key, self.get_port_state(key),
-                                  ns_diff(cntr['fec_corr'], old_cntr['fec_corr']),
-                                  ns_diff(cntr['fec_uncorr'], old_cntr['fec_uncorr']),
-                                  ns_diff(cntr['fec_symbol_err'], old_cntr['fec_symbol_err']),
-                                  format_fec_ber(rates.fec_pre_ber),
-                                  format_fec_ber(rates.fec_post_ber),
-                                  format_fec_ber(rates.fec_pre_ber_max)))
-            elif rates_only:
-                header = header_rates_only
-
-                if not nonzero or is_non_zero(ns_diff(cntr["rx_ok"], old_cntr["rx_ok"])) or \
-                   is_non_zero(ns_diff(cntr["tx_ok"], old_cntr["tx_ok"])):
-                    table.append((key,
-                                  self.get_port_state(key),
-                                  ns_diff(cntr["rx_ok"], old_cntr["rx_ok"]),
-                                  format_brate(rates.rx_bps),
-                                  format_prate(rates.rx_pps),
-                                  format_util(rates.rx_bps, port_speed)
-                                  if rates.rx_util == STATUS_NA else format_util_directly(rates.rx_util),
-                                  ns_diff(cntr["tx_ok"], old_cntr["tx_ok"]),
-                                  format_brate(rates.tx_bps),
-                                  format_prate(rates.tx_pps),
-                                  format_util(rates.tx_bps, port_speed)
-                                  if rates.tx_util == STATUS_NA else format_util_directly(rates.tx_util)))
-            elif trim_stats_only:  # Packet Trimming related statistics
-                header = header_trim_only
-
-                if not nonzero or is_non_zero(ns_diff(cntr['trim'], old_cntr['trim'])):
-                    table.append((key, self.get_port_state(key),
-                                  ns_diff(cntr["trim"], old_cntr["trim"]),
-                                  ns_diff(cntr["trim_sent"], old_cntr["trim_sent"]),
-                                  ns_diff(cntr["trim_drop"], old_cntr["trim_drop"], raw=True)))
-            else:
-                header = header_std
-
-                if not nonzero or is_non_zero(ns_diff(cntr["rx_ok"], old_cntr["rx_ok"])) or \
-                   is_non_zero(ns_diff(cntr["tx_ok"], old_cntr["tx_ok"])) or \
-                   is_non_zero(ns_diff(cntr["rx_err"], old_cntr["rx_err"])) or \
-                   is_non_zero(ns_diff(cntr["tx_err"], old_cntr["tx_err"])) or \
-                   is_non_zero(ns_diff(cntr["rx_drop"], old_cntr["rx_drop"])) or \
-                   is_non_zero(ns_diff(cntr["tx_drop"], old_cntr["tx_drop"])) or \
-                   is_non_zero(ns_diff(cntr["rx_ovr"], old_cntr["rx_ovr"])) or \
-                   is_non_zero(ns_diff(cntr["tx_ovr"], old_cntr["tx_ovr"])):
-                    table.append((key,
-                                  self.get_port_state(key),
-                                  ns_diff(cntr["rx_ok"], old_cntr["rx_ok"]),
-                                  format_brate(rates.rx_bps),
-                                  format_util(rates.rx_bps, port_speed)
-                                  if rates.rx_util == STATUS_NA else format_util_directly(rates.rx_util),
-                                  ns_diff(cntr["rx_err"], old_cntr["rx_err"]),
-                                  ns_diff(cntr["rx_drop"], old_cntr["rx_drop"]),
-                                  ns_diff(cntr["rx_ovr"], old_cntr["rx_ovr"]),
-                                  ns_diff(cntr["tx_ok"], old_cntr["tx_ok"]),
-                                  format_brate(rates.tx_bps),
-                                  format_util(rates.tx_bps, port_speed)
-                                  if rates.tx_util == STATUS_NA else format_util_directly(rates.tx_util),
-                                  ns_diff(cntr["tx_err"], old_cntr["tx_err"]),
-                                  ns_diff(cntr["tx_drop"], old_cntr["tx_drop"]),
-                                  ns_diff(cntr["tx_ovr"], old_cntr["tx_ovr"])))
+            table.append((key, self.get_port_state(key)) + tuple(text[field][i] for field in columns))
 
         if table:
             if use_json: